@@ -0,0 +1,180 @@
+"""
+Variante async de la API (API_MODE=async).
+
+Los endpoints son `async def` y usan una AsyncSession (driver asyncpg /
+aiosqlite). La lógica no se duplica: AsyncSession.run_sync entrega una
+Session sync montada sobre la conexión async, así que el facade, los
+repositorios SQL (los mismos que cumplen los Protocols de interfaces.py) y
+los handlers de routes.py corren tal cual, pero esperando I/O en el event
+loop en lugar de ocupar un hilo del threadpool.
+"""
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application import routes
+from app.application.idempotency import (
+    IdempotencyStore,
+    get_idempotency_store,
+    request_fingerprint,
+    run_idempotent_async,
+)
+from app.application.single_flight import READS
+from app.application.dtos import (
+    CustomerCreate,
+    CustomerResponse,
+    AccountCreate,
+    AccountResponse,
+    AccountDeposit,
+    AccountWithdraw,
+    TransferRequest,
+    BatchRequest,
+    BatchResponse,
+    TransactionResponse,
+    TransactionHistoryResponse,
+)
+from app.domain.enums import TransactionStatus, TransactionType
+from app.repositories.async_database import get_async_db, get_async_session_factory
+from app.repositories.database import get_session_factory
+
+router = APIRouter()
+
+
+def _run(db: AsyncSession, handler, *args, **kwargs):
+    return db.run_sync(
+        lambda session: handler(*args, facade=routes.get_facade(session), **kwargs)
+    )
+
+
+def _shared_read(session_factory, handler, *args, **kwargs):
+    # La lectura que comparte single-flight abre y cierra su propia sesión:
+    # la del request que la inició puede cancelarse o cerrarse antes de que
+    # los demás terminen de esperarla.
+    async def read():
+        async with session_factory() as db:
+            return await _run(db, handler, *args, **kwargs)
+    return read
+
+
+def _run_idempotent(db, handler, dto, operation, key, store, **kwargs):
+    # La espera por duplicados concurrentes ocurre acá, fuera de run_sync;
+    # el handler sync se ejecuta sin clave.
+    return run_idempotent_async(
+        store, key, request_fingerprint(operation, dto),
+        lambda: _run(db, handler, dto, idempotency_key=None, store=None, **kwargs),
+    )
+
+
+@router.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@router.post("/customers", response_model=CustomerResponse)
+async def create_customer(dto: CustomerCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, routes.create_customer, dto)
+
+
+@router.post("/accounts", response_model=AccountResponse)
+async def create_account(dto: AccountCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, routes.create_account, dto)
+
+
+@router.get("/accounts/{account_id}", response_model=AccountResponse)
+async def get_account(account_id: str, session_factory=Depends(get_async_session_factory)):
+    return await READS.run_async(
+        "get_account", account_id,
+        _shared_read(session_factory, routes.read_account, account_id),
+    )
+
+
+@router.post("/accounts/{account_id}/freeze", response_model=AccountResponse)
+async def freeze_account(account_id: str, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, routes.freeze_account, account_id)
+
+
+@router.post("/accounts/{account_id}/close", response_model=AccountResponse)
+async def close_account(account_id: str, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, routes.close_account, account_id)
+
+
+# Los movimientos no usan group commit en modo async: esperar el lote
+# dentro de run_sync bloquearía el event loop.
+@router.post("/transactions/deposit", response_model=TransactionResponse)
+async def deposit(
+    dto: AccountDeposit,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+):
+    return await _run_idempotent(
+        db, routes.deposit, dto, "deposit", idempotency_key, store, committer=None
+    )
+
+
+@router.post("/transactions/withdraw", response_model=TransactionResponse)
+async def withdraw(
+    dto: AccountWithdraw,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+):
+    return await _run_idempotent(
+        db, routes.withdraw, dto, "withdraw", idempotency_key, store, committer=None
+    )
+
+
+@router.post("/transactions/transfer", response_model=TransactionResponse)
+async def transfer(
+    dto: TransferRequest,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+):
+    return await _run_idempotent(
+        db, routes.transfer, dto, "transfer", idempotency_key, store, committer=None
+    )
+
+
+@router.post("/transactions/batch", response_model=BatchResponse)
+async def submit_batch(
+    dto: BatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+):
+    return await _run_idempotent(db, routes.submit_batch, dto, "batch", idempotency_key, store)
+
+
+@router.get("/accounts/{account_id}/transactions", response_model=TransactionHistoryResponse)
+async def list_transactions(
+    account_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    type: Optional[TransactionType] = None,
+    status: Optional[TransactionStatus] = None,
+    session_factory=Depends(get_async_session_factory),
+):
+    return await READS.run_async(
+        "list_transactions", (account_id, limit, before, after, type, status),
+        _shared_read(
+            session_factory, routes.read_transactions, account_id,
+            limit=limit, before=before, after=after, type=type, status=status,
+        ),
+    )
+
+
+@router.get("/accounts/{account_id}/ledger/export")
+async def export_ledger(
+    account_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = Depends(get_async_db),
+    session_factory=Depends(get_session_factory),
+):
+    # El cuerpo se sigue leyendo con la sesión sync del export: Starlette
+    # itera ese generador en el threadpool, fuera del event loop.
+    return await _run(
+        db, routes.export_ledger, account_id,
+        format=format, session_factory=session_factory,
+    )
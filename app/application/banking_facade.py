@@ -1,41 +1,77 @@
-import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Mapping, Optional
 from app.domain.entities.account import Account
 from app.domain.entities.customer import Customer
 from app.domain.entities.transaction import Transaction
 from app.domain.enums import AccountStatus, Direction, TransactionType, TransactionStatus
-from app.domain.exceptions import AccountNotFound, CustomerNotFound
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.application.retry import RetryPolicy
+from app.domain.exceptions import AccountNotFound, CustomerNotFound, DomainError
 from app.domain.factories.ledger_entry_factory import LedgerEntryFactory
+from app.domain.ids import new_id
+from app.domain.money import AmountInput, Money
 from app.domain.factories.transaction_factory import TransactionFactory
 from app.domain.strategies.fee_strategy import FeeStrategy
-from app.domain.strategies.risk_strategy import RiskStrategy
-from app.repositories.implementations import (
-    SqlAccountRepository,
-    SqlCustomerRepository,
-    SqlLedgerRepository,
-    SqlTransactionRepository,
+from app.domain.strategies.risk_strategy import (
+    RiskContext,
+    RiskStrategy,
+    account_risk_context,
+    order_by_cost,
+    required_keys,
 )
+from app.instrumentation import timed
+from app.repositories.cache import CachedAccountRepository
+from app.repositories.interfaces import CacheBackend
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+@dataclass
+class BatchOperation:
+    type: TransactionType
+    amount: AmountInput
+    # Cuenta que se acredita (depósito) o se debita (retiro, transferencia).
+    account_id: str
+    to_account_id: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    transaction: Optional[Transaction] = None
+    error: Optional[DomainError] = None
 
 
 class BankingFacade:
     def __init__(
         self,
-        customer_repository: SqlCustomerRepository,
-        account_repository: SqlAccountRepository,
-        transaction_repository: SqlTransactionRepository,
-        ledger_repository: SqlLedgerRepository,
+        unit_of_work: SqlUnitOfWork,
         fee_strategy: FeeStrategy,
         risk_rules: list[RiskStrategy],
+        retry_policy: Optional[RetryPolicy] = None,
+        account_cache: Optional[CacheBackend] = None,
     ):
-        self.customer_repo = customer_repository
-        self.account_repo = account_repository
-        self.transaction_repo = transaction_repository
-        self.ledger_repo = ledger_repository
+        self.uow = unit_of_work
+        self.customer_repo = unit_of_work.customers
+        # Movimientos y cambios de estado leen el saldo real (_load_account);
+        # solo get_account puede responder desde el cache.
+        self._accounts = unit_of_work.accounts
+        self.account_repo = unit_of_work.accounts
+        if account_cache is not None:
+            self.account_repo = CachedAccountRepository(
+                unit_of_work.accounts, account_cache, unit_of_work.on_commit
+            )
+        self.transaction_repo = unit_of_work.transactions
+        self.ledger_repo = unit_of_work.ledger
+        self.risk_counter_repo = unit_of_work.risk_counters
         self.fee_strategy = fee_strategy
-        self.risk_rules = risk_rules
+        self.risk_rules = order_by_cost(risk_rules)
+        self.retry_policy = retry_policy or RetryPolicy()
 
     def create_customer(self, name: str, email: str) -> Customer:
-        customer = Customer(id=str(uuid.uuid4()), name=name, email=email)
-        self.customer_repo.save(customer)
+        customer = Customer(id=new_id(), name=name, email=email)
+        with self.uow:
+            self.customer_repo.save(customer)
+            self.uow.commit()
         return customer
 
     def create_account(self, customer_id: str, currency: str = "USD") -> Account:
@@ -43,11 +79,14 @@ class BankingFacade:
         if customer is None:
             raise CustomerNotFound(f"Customer {customer_id} not found")
         account = Account(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             customer_id=customer_id,
             currency=currency,
         )
-        self.account_repo.save(account)
+        with self.uow:
+            self.account_repo.save(account)
+            self.risk_counter_repo.create_for_account(account.id)
+            self.uow.commit()
         return account
 
     def get_account(self, account_id: str) -> Account:
@@ -56,103 +95,285 @@ class BankingFacade:
             raise AccountNotFound(f"Account {account_id} not found")
         return account
 
+    def _load_account(self, account_id: str) -> Account:
+        account = self._accounts.get_by_id(account_id)
+        if account is None:
+            raise AccountNotFound(f"Account {account_id} not found")
+        return account
+
+    def freeze_account(self, account_id: str) -> Account:
+        return self.retry_policy.run("freeze_account", lambda: self._change_status(account_id, Account.freeze))
+
+    def close_account(self, account_id: str) -> Account:
+        return self.retry_policy.run("close_account", lambda: self._change_status(account_id, Account.close))
+
+    def _change_status(self, account_id: str, change) -> Account:
+        # Lectura + CAS por versión: si un movimiento concurrente cambió la
+        # cuenta, update() falla y la política reintenta con una lectura nueva.
+        with self.uow:
+            account = self._load_account(account_id)
+            change(account)
+            self.account_repo.update(account)
+            self.uow.commit()
+        return account
+
     def list_transactions(self, account_id: str) -> list[Transaction]:
         return self.transaction_repo.get_by_account_id(account_id)
 
-    def _build_risk_context(self, account_id: str) -> dict:
-        return {
-            "recent_transactions": self.transaction_repo.count_recent_by_account(account_id, minutes=10),
-            "daily_total": self.transaction_repo.sum_daily_by_account(account_id),
-        }
+    def list_transactions_page(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        return self.transaction_repo.get_page_by_account_id(
+            account_id, limit, before=before, after=after,
+            tx_type=tx_type, status=status,
+        )
 
-    def _run_risk_checks(self, amount: float, account_id: str):
-        context = self._build_risk_context(account_id)
-        for rule in self.risk_rules:
-            rule.validate(amount, context)
+    def _build_risk_context(self, account_id: str) -> RiskContext:
+        return account_risk_context(
+            lambda: self.risk_counter_repo.risk_totals_by_account(account_id, minutes=10)
+        )
 
-    def deposit(self, account_id: str, amount: float) -> Transaction:
-        account = self.get_account(account_id)
-        self._run_risk_checks(amount, account_id)
+    def _run_risk_checks(self, amount: Money, account_id: str, context: Optional[Mapping] = None):
+        with timed("risk"):
+            if context is None:
+                context = self._build_risk_context(account_id)
+            for rule in self.risk_rules:
+                rule.validate(amount, context)
 
-        fee = self.fee_strategy.calculate(amount)
-        net_amount = amount - fee
+    def _calculate_fee(self, amount: Money) -> int:
+        # En unidades menores: el fee solo se suma o resta al monto.
+        with timed("fee"):
+            return self.fee_strategy.calculate_minor(amount.minor, amount.currency)
 
-        transaction = TransactionFactory.create(
-            TransactionType.DEPOSIT, amount, account.currency
-        )
+    def _record_risk_counters(self, transaction: Transaction, account_ids: list[str]):
+        self.risk_counter_repo.record_many([
+            (account_id, transaction.amount.minor, transaction.created_at)
+            for account_id in set(account_ids)
+        ])
 
-        account.deposit(net_amount)
-        transaction.status = TransactionStatus.APPROVED
+    def deposit(self, account_id: str, amount: AmountInput) -> Transaction:
+        with self.uow:
+            account = self._load_account(account_id)
+            amount = Money.of(amount, account.currency)
+            self._run_risk_checks(amount, account_id)
+
+            fee = self._calculate_fee(amount)
+            net_amount = Money(amount.minor - fee, amount.currency)
 
-        self.transaction_repo.save(transaction)
-        self.account_repo.update(account)
+            transaction = TransactionFactory.create(
+                TransactionType.DEPOSIT, amount, account.currency
+            )
 
-        self.ledger_repo.save(LedgerEntryFactory.create(
-            account_id=account.id,
-            transaction_id=transaction.id,
-            direction=Direction.CREDIT,
-            amount=net_amount,
-        ))
+            # Validación de dominio sobre lo leído; el saldo lo cambia la BD
+            # con un delta condicional, que es la verificación definitiva.
+            account.deposit(net_amount)
+            transaction.status = TransactionStatus.APPROVED
 
+            self.transaction_repo.save(transaction)
+            self.account_repo.credit(account.id, net_amount)
+
+            self.ledger_repo.save(LedgerEntryFactory.create(
+                account_id=account.id,
+                transaction_id=transaction.id,
+                direction=Direction.CREDIT,
+                amount=net_amount,
+                created_at=transaction.created_at,
+            ))
+            self._record_risk_counters(transaction, [account.id])
+
+            self.uow.commit()
         return transaction
 
-    def withdraw(self, account_id: str, amount: float) -> Transaction:
-        account = self.get_account(account_id)
-        self._run_risk_checks(amount, account_id)
+    def withdraw(self, account_id: str, amount: AmountInput) -> Transaction:
+        with self.uow:
+            account = self._load_account(account_id)
+            amount = Money.of(amount, account.currency)
+            self._run_risk_checks(amount, account_id)
 
-        fee = self.fee_strategy.calculate(amount)
-        total_debit = amount + fee
+            fee = self._calculate_fee(amount)
+            total_debit = Money(amount.minor + fee, amount.currency)
 
-        transaction = TransactionFactory.create(
-            TransactionType.WITHDRAW, amount, account.currency
-        )
+            transaction = TransactionFactory.create(
+                TransactionType.WITHDRAW, amount, account.currency
+            )
 
-        account.withdraw(total_debit)
-        transaction.status = TransactionStatus.APPROVED
+            account.withdraw(total_debit)
+            transaction.status = TransactionStatus.APPROVED
 
-        self.transaction_repo.save(transaction)
-        self.account_repo.update(account)
+            self.transaction_repo.save(transaction)
+            self.account_repo.debit(account.id, total_debit)
 
-        self.ledger_repo.save(LedgerEntryFactory.create(
-            account_id=account.id,
-            transaction_id=transaction.id,
-            direction=Direction.DEBIT,
-            amount=total_debit,
-        ))
+            self.ledger_repo.save(LedgerEntryFactory.create(
+                account_id=account.id,
+                transaction_id=transaction.id,
+                direction=Direction.DEBIT,
+                amount=total_debit,
+                created_at=transaction.created_at,
+            ))
+            self._record_risk_counters(transaction, [account.id])
 
+            self.uow.commit()
         return transaction
 
-    def transfer(self, from_account_id: str, to_account_id: str, amount: float) -> Transaction:
-        from_account = self.get_account(from_account_id)
-        to_account = self.get_account(to_account_id)
-        self._run_risk_checks(amount, from_account_id)
+    def transfer(self, from_account_id: str, to_account_id: str, amount: AmountInput) -> Transaction:
+        with self.uow:
+            from_account = self._load_account(from_account_id)
+            to_account = self._load_account(to_account_id)
+            # El monto está en la moneda de origen; si el destino usa otra,
+            # to_account.deposit rechaza la transferencia.
+            amount = Money.of(amount, from_account.currency)
+            self._run_risk_checks(amount, from_account_id)
+
+            fee = self._calculate_fee(amount)
+            total_debit = Money(amount.minor + fee, amount.currency)
 
-        fee = self.fee_strategy.calculate(amount)
-        total_debit = amount + fee
+            transaction = TransactionFactory.create(
+                TransactionType.TRANSFER, amount, from_account.currency
+            )
 
-        transaction = TransactionFactory.create(
-            TransactionType.TRANSFER, amount, from_account.currency
+            from_account.withdraw(total_debit)
+            to_account.deposit(amount)
+            transaction.status = TransactionStatus.APPROVED
+
+            self.transaction_repo.save(transaction)
+            # Las filas se bloquean en orden de id para que dos transferencias
+            # cruzadas (A→B y B→A) no se esperen mutuamente.
+            if from_account.id <= to_account.id:
+                self.account_repo.debit(from_account.id, total_debit)
+                self.account_repo.credit(to_account.id, amount)
+            else:
+                self.account_repo.credit(to_account.id, amount)
+                self.account_repo.debit(from_account.id, total_debit)
+
+            self.ledger_repo.save(LedgerEntryFactory.create(
+                account_id=from_account.id,
+                transaction_id=transaction.id,
+                direction=Direction.DEBIT,
+                amount=total_debit,
+                created_at=transaction.created_at,
+            ))
+            self.ledger_repo.save(LedgerEntryFactory.create(
+                account_id=to_account.id,
+                transaction_id=transaction.id,
+                direction=Direction.CREDIT,
+                amount=amount,
+                created_at=transaction.created_at,
+            ))
+            self._record_risk_counters(transaction, [from_account.id, to_account.id])
+
+            self.uow.commit()
+        return transaction
+
+    def submit_batch(self, operations: list[BatchOperation]) -> list[BatchResult]:
+        """
+        Ejecuta varias operaciones en un solo commit. Las cuentas y sus
+        contextos de riesgo se cargan con una consulta cada uno, las
+        operaciones se aplican en orden sobre esas copias en memoria y las
+        escrituras se hacen con inserts/updates masivos. Un error de dominio
+        rechaza solo su operación. Si otra transacción cambia una cuenta
+        del lote entre la lectura y la escritura, el lote se reintenta
+        completo con lecturas frescas según la política de reintentos.
+        """
+        return self.retry_policy.run("submit_batch", lambda: self._submit_batch_once(operations))
+
+    def _submit_batch_once(self, operations: list[BatchOperation]) -> list[BatchResult]:
+        account_ids = sorted(
+            {op.account_id for op in operations}
+            | {op.to_account_id for op in operations if op.to_account_id}
         )
+        with self.uow:
+            accounts = self.account_repo.get_by_ids(account_ids)
+            # Si ninguna regla lee el historial, el lote no consulta los contadores.
+            totals = (
+                self.risk_counter_repo.risk_totals_for_accounts(list(accounts), minutes=10)
+                if required_keys(self.risk_rules) else {}
+            )
+            contexts = {}
+            for account_id in accounts:
+                recent, daily_total = totals.get(account_id, (0, 0))
+                contexts[account_id] = {"recent_transactions": recent, "daily_total": daily_total}
+
+            results, transactions, entries, counter_records = [], [], [], []
+            for op in operations:
+                try:
+                    transaction, op_entries, changed = self._apply_batch_operation(op, accounts, contexts)
+                except DomainError as e:
+                    results.append(BatchResult(error=e))
+                    continue
+                accounts.update(changed)
+                transactions.append(transaction)
+                entries.extend(op_entries)
+                # Las operaciones siguientes del lote ven esta en su contexto de riesgo.
+                for account_id in {entry.account_id for entry in op_entries}:
+                    contexts[account_id]["recent_transactions"] += 1
+                    contexts[account_id]["daily_total"] += transaction.amount.minor
+                    counter_records.append((account_id, transaction.amount.minor, transaction.created_at))
+                results.append(BatchResult(transaction=transaction))
+
+            self.transaction_repo.save_all(transactions)
+            self.ledger_repo.save_all(entries)
+            # Deltas netos por cuenta en unidades menores.
+            deltas = {}
+            for entry in entries:
+                sign = 1 if entry.direction == Direction.CREDIT else -1
+                deltas[entry.account_id] = deltas.get(entry.account_id, 0) + sign * entry.amount.minor
+            self.account_repo.apply_deltas(deltas)
+            self.risk_counter_repo.record_many(counter_records)
+            self.uow.commit()
+        return results
 
-        from_account.withdraw(total_debit)
-        to_account.deposit(amount)
+    def _apply_batch_operation(
+        self, op: BatchOperation, accounts: dict[str, Account], contexts: dict[str, dict]
+    ) -> tuple[Transaction, list[LedgerEntry], dict[str, Account]]:
+        # Se trabaja sobre copias: si la operación falla a mitad de camino
+        # (ej. destino congelado) las cuentas del lote quedan intactas.
+        source = self._batch_account(accounts, op.account_id)
+        amount = Money.of(op.amount, source.currency)
+        self._run_risk_checks(amount, source.id, contexts[source.id])
+        fee = self._calculate_fee(amount)
+
+        transaction = TransactionFactory.create(op.type, amount, source.currency)
+        changed = {source.id: source}
+        if op.type == TransactionType.DEPOSIT:
+            net_amount = Money(amount.minor - fee, amount.currency)
+            movements = [(source, Direction.CREDIT, net_amount)]
+            source.deposit(net_amount)
+        elif op.type == TransactionType.WITHDRAW:
+            total_debit = Money(amount.minor + fee, amount.currency)
+            movements = [(source, Direction.DEBIT, total_debit)]
+            source.withdraw(total_debit)
+        else:
+            target = source if op.to_account_id == source.id else self._batch_account(accounts, op.to_account_id)
+            changed[target.id] = target
+            total_debit = Money(amount.minor + fee, amount.currency)
+            movements = [
+                (source, Direction.DEBIT, total_debit),
+                (target, Direction.CREDIT, amount),
+            ]
+            source.withdraw(total_debit)
+            target.deposit(amount)
         transaction.status = TransactionStatus.APPROVED
 
-        self.transaction_repo.save(transaction)
-        self.account_repo.update(from_account)
-        self.account_repo.update(to_account)
-
-        self.ledger_repo.save(LedgerEntryFactory.create(
-            account_id=from_account.id,
-            transaction_id=transaction.id,
-            direction=Direction.DEBIT,
-            amount=total_debit,
-        ))
-        self.ledger_repo.save(LedgerEntryFactory.create(
-            account_id=to_account.id,
-            transaction_id=transaction.id,
-            direction=Direction.CREDIT,
-            amount=amount,
-        ))
-
-        return transaction
\ No newline at end of file
+        entries = [
+            LedgerEntryFactory.create(
+                account_id=account.id,
+                transaction_id=transaction.id,
+                direction=direction,
+                amount=amount,
+                created_at=transaction.created_at,
+            )
+            for account, direction, amount in movements
+        ]
+        return transaction, entries, changed
+
+    def _batch_account(self, accounts: dict[str, Account], account_id: Optional[str]) -> Account:
+        account = accounts.get(account_id)
+        if account is None:
+            raise AccountNotFound(f"Account {account_id} not found")
+        return replace(account)
@@ -0,0 +1,178 @@
+"""
+Contenedor de la aplicación: lo que se comparte entre requests (strategies
+de fee y riesgo, política de reintentos, cache de cuentas) se construye una
+vez por proceso. Por request solo se crean el unit of work y sus
+repositorios, atados a la sesión.
+
+El fee y los límites de riesgo salen de un archivo JSON (BANK_CONFIG_FILE);
+sin archivo se usan los valores por defecto. Si el archivo cambia se
+recarga en caliente: se construye un juego nuevo de strategies y se
+reemplaza de una sola vez, así cada request usa fee y reglas de la misma
+versión. Una configuración inválida no reemplaza a la vigente.
+
+    {"fee_percent": 0.015, "max_amount": 10000, "velocity_max_transactions": 10,
+     "daily_limit": 50000}
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.application.banking_facade import BankingFacade
+from app.application.retry import RetryPolicy
+from app.domain.strategies.fee_strategy import FeeStrategy, PercentFeeStrategy
+from app.domain.strategies.risk_strategy import (
+    DailyLimitRule,
+    MaxAmountRule,
+    RiskStrategy,
+    VelocityRule,
+    order_by_cost,
+)
+from app.metrics import REGISTRY
+from app.repositories.cache import get_account_cache
+from app.repositories.interfaces import CacheBackend, UnitOfWork
+
+BANK_CONFIG_FILE = os.getenv("BANK_CONFIG_FILE")
+# Cada cuántos segundos, como mucho, se mira si el archivo cambió.
+BANK_CONFIG_CHECK_SECONDS = float(os.getenv("BANK_CONFIG_CHECK_SECONDS", "5"))
+
+CONFIG_RELOADS = REGISTRY.counter(
+    "bank_config_reloads_total", "Recargas de la configuración de fee y límites", ("result",)
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidBankSettings(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class BankSettings:
+    fee_percent: float = 0.015
+    max_amount: float = 10000
+    velocity_max_transactions: int = 10
+    daily_limit: float = 50000
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BankSettings":
+        known = {f.name: f.type for f in fields(cls)}
+        unknown = set(data) - set(known)
+        if unknown:
+            raise InvalidBankSettings(f"Unknown settings: {sorted(unknown)}")
+        try:
+            settings = cls(**{name: known[name](value) for name, value in data.items()})
+        except (TypeError, ValueError) as e:
+            raise InvalidBankSettings(str(e)) from e
+        if not 0 <= settings.fee_percent < 1:
+            raise InvalidBankSettings("fee_percent must be in [0, 1)")
+        if min(settings.max_amount, settings.velocity_max_transactions, settings.daily_limit) <= 0:
+            raise InvalidBankSettings("Limits must be greater than zero")
+        return settings
+
+    @classmethod
+    def from_file(cls, path: str) -> "BankSettings":
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise InvalidBankSettings(f"Cannot read {path}: {e}") from e
+        if not isinstance(data, dict):
+            raise InvalidBankSettings(f"{path} must contain a JSON object")
+        return cls.from_dict(data)
+
+
+@dataclass(frozen=True)
+class Strategies:
+    """Fee y reglas de una misma versión de la configuración."""
+    settings: BankSettings
+    fee_strategy: FeeStrategy
+    risk_rules: tuple[RiskStrategy, ...]
+
+    @classmethod
+    def from_settings(cls, settings: BankSettings) -> "Strategies":
+        return cls(
+            settings=settings,
+            fee_strategy=PercentFeeStrategy(settings.fee_percent),
+            risk_rules=tuple(order_by_cost([
+                MaxAmountRule(max_amount=settings.max_amount),
+                VelocityRule(max_transactions=settings.velocity_max_transactions),
+                DailyLimitRule(daily_limit=settings.daily_limit),
+            ])),
+        )
+
+
+class AppContainer:
+    def __init__(
+        self,
+        config_file: Optional[str] = BANK_CONFIG_FILE,
+        retry_policy: Optional[RetryPolicy] = None,
+        account_cache: Optional[CacheBackend] = None,
+        check_interval: float = BANK_CONFIG_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config_file = config_file
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.account_cache = account_cache
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._config_mtime: Optional[float] = None
+        self._next_check = clock() + check_interval
+        # Al arrancar una configuración inválida es un error; en una recarga no.
+        self.strategies = Strategies.from_settings(self._read_settings())
+
+    def facade(self, unit_of_work: UnitOfWork) -> BankingFacade:
+        self.reload_if_changed()
+        strategies = self.strategies
+        return BankingFacade(
+            unit_of_work=unit_of_work,
+            fee_strategy=strategies.fee_strategy,
+            risk_rules=list(strategies.risk_rules),
+            retry_policy=self.retry_policy,
+            account_cache=self.account_cache,
+        )
+
+    def reload(self) -> bool:
+        """Relee la configuración; retorna False (y conserva la vigente) si es inválida."""
+        with self._lock:
+            try:
+                settings = self._read_settings()
+            except InvalidBankSettings:
+                CONFIG_RELOADS.inc(result="error")
+                logger.exception("Invalid bank settings in %s; keeping the current ones", self.config_file)
+                return False
+            if settings != self.strategies.settings:
+                self.strategies = Strategies.from_settings(settings)
+            CONFIG_RELOADS.inc(result="ok")
+            return True
+
+    def reload_if_changed(self) -> None:
+        if self.config_file is None or self._clock() < self._next_check:
+            return
+        self._next_check = self._clock() + self.check_interval
+        try:
+            mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            return
+        if mtime != self._config_mtime:
+            self.reload()
+
+    def _read_settings(self) -> BankSettings:
+        if self.config_file is None:
+            return BankSettings()
+        try:
+            self._config_mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            pass
+        return BankSettings.from_file(self.config_file)
+
+
+@lru_cache
+def get_container() -> AppContainer:
+    """Contenedor del proceso; main lo construye al arrancar."""
+    return AppContainer(account_cache=get_account_cache())
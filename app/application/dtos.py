@@ -1,7 +1,25 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer, model_validator
 from datetime import datetime
-from typing import List, Optional
+from decimal import Decimal
+from typing import Annotated, List, Optional
 from app.domain.enums import AccountStatus, Direction, TransactionStatus, TransactionType
+from app.domain.money import Money
+
+
+def _money_to_decimal(value):
+    return value.to_decimal() if isinstance(value, Money) else value
+
+
+# Monto en unidades mayores (10.5 = 10,50 USD). Entra como Decimal, sin pasar
+# por float (los decimales se validan contra la moneda de la cuenta con
+# Money.of); acepta Money al armar respuestas y en JSON sale como string
+# decimal exacto con los decimales de la moneda ("10.50"): un número JSON se
+# lee como float y pierde centavos en montos grandes.
+Amount = Annotated[
+    Decimal,
+    BeforeValidator(_money_to_decimal),
+    PlainSerializer(str, return_type=str, when_used="json"),
+]
 
 
 class CustomerCreate(BaseModel):
@@ -23,31 +41,32 @@ class AccountResponse(BaseModel):
     id: str
     customer_id: str
     currency: str
-    balance: float
+    balance: Amount
     status: AccountStatus
 
 
 class AccountDeposit(BaseModel):
     account_id: str
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
 
 class AccountWithdraw(BaseModel):
     account_id: str
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
 
 
 class TransferRequest(BaseModel):
     from_account_id: str
     to_account_id: str
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
 
 
 class TransactionResponse(BaseModel):
     id: str
     type: TransactionType
-    amount: float
+    amount: Amount
     currency: str
     status: TransactionStatus
+    created_at: Optional[datetime] = None
 
 
 class LedgerEntryResponse(BaseModel):
@@ -55,13 +74,50 @@ class LedgerEntryResponse(BaseModel):
     account_id: str
     transaction_id: str
     direction: Direction
-    amount: float
+    amount: Amount
+
+
+class BatchItem(BaseModel):
+    type: TransactionType
+    amount: Amount = Field(..., gt=0)
+    # Depósito y retiro usan account_id; transferencia usa from/to.
+    account_id: Optional[str] = None
+    from_account_id: Optional[str] = None
+    to_account_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_accounts(self):
+        if self.type == TransactionType.TRANSFER:
+            if not self.from_account_id or not self.to_account_id:
+                raise ValueError("TRANSFER items require from_account_id and to_account_id")
+        elif not self.account_id:
+            raise ValueError(f"{self.type.value} items require account_id")
+        return self
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1, max_length=5000)
+
+class BatchItemResult(BaseModel):
+    index: int
+    success: bool
+    transaction: Optional[TransactionResponse] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+    approved_count: int
+    rejected_count: int
 
 
 class TransactionHistoryResponse(BaseModel):
     account_id: str
     transactions: List[TransactionResponse]
+    # Cantidad de transacciones en esta página (no del historial completo).
     total_count: int
+    # Cursores opacos para pedir la página siguiente (más antigua, `before`)
+    # o la anterior (más reciente, `after`). None si no hay más.
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.transaction import Transaction
+
+LEDGER_EXPORT_FIELDS = [
+    "entry_id",
+    "transaction_id",
+    "created_at",
+    "type",
+    "status",
+    "direction",
+    "amount",
+    "currency",
+]
+
+# Filas por chunk HTTP: suficiente para no mandar un chunk por fila y
+# acotado para que la memoria no dependa del tamaño del ledger.
+ROWS_PER_CHUNK = 500
+
+
+def _row(entry: LedgerEntry, transaction: Transaction) -> dict:
+    return {
+        "entry_id": entry.id,
+        "transaction_id": entry.transaction_id,
+        "created_at": entry.created_at.isoformat(),
+        "type": transaction.type.value,
+        "status": transaction.status.value,
+        "direction": entry.direction.value,
+        # String decimal exacto ("10.50"), igual que en la API.
+        "amount": str(entry.amount.to_decimal()),
+        "currency": transaction.currency,
+    }
+
+
+def ledger_ndjson(rows: Iterable[tuple[LedgerEntry, Transaction]]) -> Iterator[str]:
+    chunk = []
+    for entry, transaction in rows:
+        chunk.append(json.dumps(_row(entry, transaction)) + "\n")
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def ledger_csv(rows: Iterable[tuple[LedgerEntry, Transaction]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=LEDGER_EXPORT_FIELDS)
+    writer.writeheader()
+    pending = 0
+    for entry, transaction in rows:
+        writer.writerow(_row(entry, transaction))
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
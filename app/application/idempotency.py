@@ -0,0 +1,325 @@
+"""
+Idempotencia de los endpoints de movimientos: la primera petición con un
+`Idempotency-Key` se ejecuta y su respuesta se guarda; las repeticiones
+(reintentos del cliente) reciben esa misma respuesta sin volver a mover
+dinero.
+
+La fuente de verdad es la tabla idempotency_keys (clave única, con TTL);
+delante hay un LRU en memoria para que los reintentos frecuentes no toquen
+la BD. Los duplicados concurrentes esperan a la primera petición: en el
+mismo proceso con un Event por clave, entre procesos encuestando la fila
+que la primera reservó.
+
+Mientras la primera petición corre, la fila vence con un lease corto
+(IDEMPOTENCY_LEASE_SECONDS) y no con el TTL: si el proceso muere antes de
+guardar la respuesta, un reintento toma la clave pasado el lease en lugar
+de recibir 409 durante un día. El lease tiene que superar lo que tarda una
+operación. La respuesta se guarda en una transacción aparte de la del
+movimiento (que puede confirmar el hilo de group commit o el engine async),
+así que finish() reintenta ante errores de BD.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.domain.entities.idempotency_record import IdempotencyRecord
+from app.metrics import REGISTRY
+from app.repositories.database import get_session_factory
+from app.repositories.unit_of_work import unit_of_work_scope
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+REPLAYS = REGISTRY.counter(
+    "idempotency_replays_total",
+    "Respuestas repetidas por Idempotency-Key, según de dónde se leyeron", ("source",)
+)
+FINISH_FAILURES = REGISTRY.counter(
+    "idempotency_finish_failures_total",
+    "Respuestas que no se pudieron guardar tras los reintentos (la clave vence con el lease)",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyError(Exception):
+    pass
+
+
+class KeyReusedError(IdempotencyError):
+    """La clave ya se usó con un cuerpo distinto."""
+
+
+class RequestInProgressError(IdempotencyError):
+    """La petición original sigue en curso y no terminó dentro de la espera."""
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        session_factory,
+        ttl: timedelta = timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        lease: timedelta = timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS),
+        cache_size: int = IDEMPOTENCY_CACHE_SIZE,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+        finish_attempts: int = 3,
+    ):
+        self._unit_of_work = unit_of_work_scope(session_factory)
+        self.ttl = ttl
+        self.lease = lease
+        self.finish_attempts = finish_attempts
+        self.cache_size = cache_size
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        # Solo respuestas completas; se descartan al vencer su TTL.
+        self._cache: OrderedDict[str, IdempotencyRecord] = OrderedDict()
+        self._inflight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        """
+        Retorna la respuesta guardada si la clave ya se completó. Si no, la
+        reserva para esta petición y retorna None: el llamador debe ejecutar
+        y luego llamar a finish() o abort().
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                record = self._cached(key)
+                if record is not None:
+                    REPLAYS.inc(source="memory")
+                    return self._check(record, request_hash)
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                raise RequestInProgressError(f"Request with key {key} is still in progress")
+
+        try:
+            record = self._claim(key, request_hash, deadline)
+        except BaseException:
+            self._release(key)
+            raise
+        if record is not None:
+            # Completada por otro proceso (o antes de un reinicio).
+            self._remember(record)
+            self._release(key)
+            REPLAYS.inc(source="database")
+            return self._check(record, request_hash)
+        return None
+
+    def finish(self, key: str, status_code: int, response_body) -> None:
+        """
+        Guarda la respuesta con el TTL completo. El movimiento ya se
+        confirmó: si la BD falla se reintenta con backoff, y si no hay caso
+        se registra y la petición responde igual; la clave vence con el lease.
+        """
+        try:
+            for attempt in range(1, self.finish_attempts + 1):
+                try:
+                    with self._unit_of_work() as uow:
+                        uow.idempotency.complete(
+                            key, status_code, response_body, datetime.utcnow() + self.ttl,
+                        )
+                        record = uow.idempotency.get(key)
+                        uow.commit()
+                    break
+                except SQLAlchemyError:
+                    if attempt == self.finish_attempts:
+                        FINISH_FAILURES.inc()
+                        logger.exception("Could not store the response for key %s", key)
+                        return
+                    time.sleep(self.poll_interval * 2 ** (attempt - 1))
+            if record is not None:
+                self._remember(record)
+        finally:
+            self._release(key)
+
+    def abort(self, key: str) -> None:
+        """Libera la clave sin guardar respuesta: un reintento vuelve a ejecutar."""
+        try:
+            with self._unit_of_work() as uow:
+                uow.idempotency.delete(key)
+                uow.commit()
+        finally:
+            self._release(key)
+
+    def _claim(self, key: str, request_hash: str, deadline: float) -> Optional[IdempotencyRecord]:
+        while True:
+            with self._unit_of_work() as uow:
+                now = datetime.utcnow()
+                record = uow.idempotency.get(key)
+                # Vencida: una respuesta pasado el TTL o una reserva pasado
+                # el lease (la petición original no terminó).
+                if record is not None and record.expires_at <= now:
+                    uow.idempotency.delete(key)
+                    record = None
+                if record is None:
+                    uow.idempotency.add(IdempotencyRecord(
+                        key=key, request_hash=request_hash, expires_at=now + self.lease,
+                    ))
+                    try:
+                        uow.commit()
+                        return None
+                    except IntegrityError:
+                        # Otro proceso la reservó entre la lectura y el insert.
+                        uow.rollback()
+                        continue
+            if record.completed:
+                return record
+            self._check(record, request_hash)
+            if time.monotonic() >= deadline:
+                raise RequestInProgressError(f"Request with key {key} is still in progress")
+            time.sleep(self.poll_interval)
+
+    def _check(self, record: IdempotencyRecord, request_hash: str) -> IdempotencyRecord:
+        if record.request_hash != request_hash:
+            raise KeyReusedError("Idempotency-Key was already used with a different request")
+        return record
+
+    def _cached(self, key: str) -> Optional[IdempotencyRecord]:
+        record = self._cache.get(key)
+        if record is None:
+            return None
+        if record.expires_at <= datetime.utcnow():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return record
+
+    def _remember(self, record: IdempotencyRecord):
+        with self._lock:
+            self._cache[record.key] = record
+            self._cache.move_to_end(record.key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _release(self, key: str):
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+@lru_cache(maxsize=None)
+def _store_for(session_factory) -> IdempotencyStore:
+    return IdempotencyStore(session_factory)
+
+
+def get_idempotency_store(session_factory=Depends(get_session_factory)) -> IdempotencyStore:
+    # Un store (y su LRU) por proceso y BD.
+    return _store_for(session_factory)
+
+
+def request_fingerprint(operation: str, dto: BaseModel) -> str:
+    # Los montos se normalizan ("10", "10.0" y "10.00" son la misma petición):
+    # Money.of rechaza decimales de más, así que dos montos válidos mueven lo
+    # mismo solo si son iguales como número.
+    body = jsonable_encoder(_normalize_amounts(dto.model_dump()))
+    payload = json.dumps({"operation": operation, "body": body}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _normalize_amounts(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f")
+    if isinstance(value, dict):
+        return {k: _normalize_amounts(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize_amounts(v) for v in value]
+    return value
+
+
+def _stored_response(record: IdempotencyRecord) -> JSONResponse:
+    return JSONResponse(
+        record.response_body,
+        status_code=record.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _begin(store: IdempotencyStore, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+    try:
+        return store.begin(key, request_hash)
+    except KeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RequestInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+def _is_final(error: HTTPException) -> bool:
+    # Los rechazos de negocio (saldo, riesgo, cuenta inexistente) se guardan y
+    # se repiten; los conflictos (409) y errores del servidor se pueden reintentar.
+    return 400 <= error.status_code < 500 and error.status_code != 409
+
+
+def run_idempotent(
+    store: IdempotencyStore,
+    key: Optional[str],
+    request_hash: str,
+    execute: Callable[[], BaseModel],
+):
+    if key is None:
+        return execute()
+    record = _begin(store, key, request_hash)
+    if record is not None:
+        return _stored_response(record)
+    try:
+        result = execute()
+    except HTTPException as e:
+        if _is_final(e):
+            store.finish(key, e.status_code, {"detail": e.detail})
+        else:
+            store.abort(key)
+        raise
+    except BaseException:
+        store.abort(key)
+        raise
+    store.finish(key, 200, jsonable_encoder(result))
+    return result
+
+
+async def run_idempotent_async(
+    store: IdempotencyStore,
+    key: Optional[str],
+    request_hash: str,
+    execute: Callable[[], Awaitable[BaseModel]],
+):
+    # Igual que run_idempotent; el store es sync (y puede esperar), así que
+    # se llama desde el threadpool para no bloquear el event loop.
+    if key is None:
+        return await execute()
+    record = await run_in_threadpool(_begin, store, key, request_hash)
+    if record is not None:
+        return _stored_response(record)
+    try:
+        result = await execute()
+    except HTTPException as e:
+        if _is_final(e):
+            await run_in_threadpool(store.finish, key, e.status_code, {"detail": e.detail})
+        else:
+            await run_in_threadpool(store.abort, key)
+        raise
+    except BaseException:
+        await run_in_threadpool(store.abort, key)
+        raise
+    await run_in_threadpool(store.finish, key, 200, jsonable_encoder(result))
+    return result
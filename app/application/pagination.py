@@ -0,0 +1,31 @@
+import base64
+from datetime import datetime
+from typing import Optional
+
+from app.domain.entities.transaction import Transaction
+from app.domain.ids import is_valid_id
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# El cursor es opaco para el cliente: base64 de "created_at|id".
+def encode_cursor(transaction: Transaction) -> str:
+    raw = f"{transaction.created_at.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, str]]:
+    if cursor is None:
+        return None
+    try:
+        created_at, transaction_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        )
+        key = datetime.fromisoformat(created_at), transaction_id
+    except ValueError as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if not is_valid_id(transaction_id):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+    return key
@@ -0,0 +1,64 @@
+import asyncio
+import random
+import time
+from typing import Callable, TypeVar
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.domain.exceptions import ConcurrentUpdateError
+from app.metrics import REGISTRY
+
+T = TypeVar("T")
+
+RETRIES = REGISTRY.counter(
+    "banking_concurrent_retries_total",
+    "Reintentos por conflicto de versión o delta concurrente", ("operation",)
+)
+RETRIES_EXHAUSTED = REGISTRY.counter(
+    "banking_concurrent_retries_exhausted_total",
+    "Operaciones que agotaron los reintentos por conflicto", ("operation",)
+)
+
+
+def backoff_sleep(seconds: float) -> None:
+    """
+    time.sleep, salvo dentro de AsyncSession.run_sync (API_MODE=async): ahí
+    el facade corre en el hilo del event loop y la espera es asyncio.sleep,
+    así el backoff no frena los demás requests.
+    """
+    if in_greenlet():
+        await_only(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
+
+class RetryPolicy:
+    """
+    Reintenta una operación cuando falla por ConcurrentUpdateError, con
+    backoff exponencial y jitter completo para que los perdedores de la
+    carrera no vuelvan a chocar en el mismo instante.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.005,
+        max_delay: float = 0.1,
+        sleep: Callable[[float], None] = backoff_sleep,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+
+    def run(self, operation: str, fn: Callable[[], T]) -> T:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return fn()
+            except ConcurrentUpdateError:
+                if attempt == self.max_attempts:
+                    RETRIES_EXHAUSTED.inc(operation=operation)
+                    raise
+                RETRIES.inc(operation=operation)
+                cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                self._sleep(random.uniform(0, cap))
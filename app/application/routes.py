@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.repositories.database import get_db
-from app.repositories.implementations import (
-    SqlCustomerRepository,
-    SqlAccountRepository,
-    SqlTransactionRepository,
-    SqlLedgerRepository,
+from app.repositories.database import get_db, get_session_factory
+from app.repositories.unit_of_work import make_unit_of_work
+from app.application.banking_facade import BankingFacade, BatchOperation
+from app.application.container import get_container
+from app.application.group_commit import GroupCommitter, get_group_committer
+from app.application.exports import ledger_csv, ledger_ndjson
+from app.application.idempotency import (
+    IdempotencyStore,
+    get_idempotency_store,
+    request_fingerprint,
+    run_idempotent,
 )
-from app.application.banking_facade import BankingFacade
+from app.application.single_flight import READS
+from app.application.pagination import InvalidCursor, decode_cursor, encode_cursor
 from app.application.dtos import (
     CustomerCreate,
     CustomerResponse,
@@ -16,14 +24,17 @@ from app.application.dtos import (
     AccountDeposit,
     AccountWithdraw,
     TransferRequest,
+    BatchRequest,
+    BatchItemResult,
+    BatchResponse,
     TransactionResponse,
     TransactionHistoryResponse,
 )
-from app.domain.strategies.fee_strategy import PercentFeeStrategy
-from app.domain.strategies.risk_strategy import MaxAmountRule, VelocityRule, DailyLimitRule
+from app.domain.enums import TransactionStatus, TransactionType
 from app.domain.exceptions import (
     DomainError,
     AccountNotFound,
+    ConcurrentUpdateError,
     CustomerNotFound,
     InsufficientFundsError,
     RiskRejectedError,
@@ -33,18 +44,9 @@ router = APIRouter()
 
 
 def get_facade(db: Session = Depends(get_db)) -> BankingFacade:
-    return BankingFacade(
-        customer_repository=SqlCustomerRepository(db),
-        account_repository=SqlAccountRepository(db),
-        transaction_repository=SqlTransactionRepository(db),
-        ledger_repository=SqlLedgerRepository(db),
-        fee_strategy=PercentFeeStrategy(0.015),
-        risk_rules=[
-            MaxAmountRule(max_amount=10000),
-            VelocityRule(max_transactions=10),
-            DailyLimitRule(daily_limit=50000),
-        ],
-    )
+    # Strategies, reintentos y cache vienen del contenedor del proceso;
+    # por request solo se crea el unit of work sobre la sesión.
+    return get_container().facade(make_unit_of_work(db))
 
 
 @router.get("/health")
@@ -83,78 +85,287 @@ def create_account(dto: AccountCreate, facade: BankingFacade = Depends(get_facad
 
 @router.get("/accounts/{account_id}", response_model=AccountResponse)
 def get_account(account_id: str, facade: BankingFacade = Depends(get_facade)):
+    return READS.run("get_account", account_id, lambda: read_account(account_id, facade=facade))
+
+
+def read_account(account_id: str, facade: BankingFacade) -> AccountResponse:
     try:
-        account = facade.get_account(account_id)
-        return AccountResponse(
-            id=account.id, customer_id=account.customer_id,
-            currency=account.currency, balance=account.balance,
-            status=account.status,
-        )
+        return _account_response(facade.get_account(account_id))
     except AccountNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.post("/transactions/deposit", response_model=TransactionResponse)
-def deposit(dto: AccountDeposit, facade: BankingFacade = Depends(get_facade)):
+def _account_response(account) -> AccountResponse:
+    return AccountResponse(
+        id=account.id, customer_id=account.customer_id,
+        currency=account.currency, balance=account.balance,
+        status=account.status,
+    )
+
+
+@router.post("/accounts/{account_id}/freeze", response_model=AccountResponse)
+def freeze_account(account_id: str, facade: BankingFacade = Depends(get_facade)):
     try:
-        tx = facade.deposit(account_id=dto.account_id, amount=dto.amount)
-        return TransactionResponse(
-            id=tx.id, type=tx.type, amount=tx.amount,
-            currency=tx.currency, status=tx.status,
-        )
-    except (AccountNotFound,) as e:
+        return _account_response(facade.freeze_account(account_id))
+    except AccountNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
-@router.post("/transactions/withdraw", response_model=TransactionResponse)
-def withdraw(dto: AccountWithdraw, facade: BankingFacade = Depends(get_facade)):
+@router.post("/accounts/{account_id}/close", response_model=AccountResponse)
+def close_account(account_id: str, facade: BankingFacade = Depends(get_facade)):
     try:
-        tx = facade.withdraw(account_id=dto.account_id, amount=dto.amount)
-        return TransactionResponse(
-            id=tx.id, type=tx.type, amount=tx.amount,
-            currency=tx.currency, status=tx.status,
-        )
-    except (AccountNotFound,) as e:
+        return _account_response(facade.close_account(account_id))
+    except AccountNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/transactions/deposit", response_model=TransactionResponse)
+def deposit(
+    dto: AccountDeposit,
+    facade: BankingFacade = Depends(get_facade),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+):
+    def execute():
+        try:
+            if committer is not None:
+                tx = committer.submit(BatchOperation(TransactionType.DEPOSIT, dto.amount, dto.account_id))
+            else:
+                tx = facade.deposit(account_id=dto.account_id, amount=dto.amount)
+            return TransactionResponse(
+                id=tx.id, type=tx.type, amount=tx.amount,
+                currency=tx.currency, status=tx.status,
+                created_at=tx.created_at,
+            )
+        except (AccountNotFound,) as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ConcurrentUpdateError as e:
+            # Conflicto que agotó los reintentos (vía group commit).
+            raise HTTPException(status_code=409, detail=str(e))
+        except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(store, idempotency_key, request_fingerprint("deposit", dto), execute)
+
+
+@router.post("/transactions/withdraw", response_model=TransactionResponse)
+def withdraw(
+    dto: AccountWithdraw,
+    facade: BankingFacade = Depends(get_facade),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+):
+    def execute():
+        try:
+            if committer is not None:
+                tx = committer.submit(BatchOperation(TransactionType.WITHDRAW, dto.amount, dto.account_id))
+            else:
+                tx = facade.withdraw(account_id=dto.account_id, amount=dto.amount)
+            return TransactionResponse(
+                id=tx.id, type=tx.type, amount=tx.amount,
+                currency=tx.currency, status=tx.status,
+                created_at=tx.created_at,
+            )
+        except (AccountNotFound,) as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ConcurrentUpdateError as e:
+            # Conflicto que agotó los reintentos (vía group commit).
+            raise HTTPException(status_code=409, detail=str(e))
+        except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(store, idempotency_key, request_fingerprint("withdraw", dto), execute)
 
 
 @router.post("/transactions/transfer", response_model=TransactionResponse)
-def transfer(dto: TransferRequest, facade: BankingFacade = Depends(get_facade)):
-    try:
-        tx = facade.transfer(
-            from_account_id=dto.from_account_id,
-            to_account_id=dto.to_account_id,
-            amount=dto.amount,
-        )
-        return TransactionResponse(
-            id=tx.id, type=tx.type, amount=tx.amount,
-            currency=tx.currency, status=tx.status,
+def transfer(
+    dto: TransferRequest,
+    facade: BankingFacade = Depends(get_facade),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+):
+    def execute():
+        try:
+            if committer is not None:
+                tx = committer.submit(BatchOperation(
+                    TransactionType.TRANSFER, dto.amount, dto.from_account_id, dto.to_account_id
+                ))
+            else:
+                tx = facade.transfer(
+                    from_account_id=dto.from_account_id,
+                    to_account_id=dto.to_account_id,
+                    amount=dto.amount,
+                )
+            return TransactionResponse(
+                id=tx.id, type=tx.type, amount=tx.amount,
+                currency=tx.currency, status=tx.status,
+                created_at=tx.created_at,
+            )
+        except (AccountNotFound,) as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ConcurrentUpdateError as e:
+            # Conflicto que agotó los reintentos (vía group commit).
+            raise HTTPException(status_code=409, detail=str(e))
+        except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(store, idempotency_key, request_fingerprint("transfer", dto), execute)
+
+
+@router.post("/transactions/batch", response_model=BatchResponse)
+def submit_batch(
+    dto: BatchRequest,
+    facade: BankingFacade = Depends(get_facade),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+):
+    def execute():
+        operations = [
+            BatchOperation(
+                type=item.type,
+                amount=item.amount,
+                account_id=item.from_account_id if item.type == TransactionType.TRANSFER else item.account_id,
+                to_account_id=item.to_account_id if item.type == TransactionType.TRANSFER else None,
+            )
+            for item in dto.items
+        ]
+        try:
+            results = facade.submit_batch(operations)
+        except ConcurrentUpdateError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        items = [
+            BatchItemResult(
+                index=index,
+                success=result.transaction is not None,
+                transaction=TransactionResponse(
+                    id=result.transaction.id, type=result.transaction.type,
+                    amount=result.transaction.amount, currency=result.transaction.currency,
+                    status=result.transaction.status, created_at=result.transaction.created_at,
+                ) if result.transaction is not None else None,
+                error=str(result.error) if result.error is not None else None,
+            )
+            for index, result in enumerate(results)
+        ]
+        approved = sum(1 for item in items if item.success)
+        return BatchResponse(
+            results=items,
+            approved_count=approved,
+            rejected_count=len(items) - approved,
         )
-    except (AccountNotFound,) as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except (RiskRejectedError, InsufficientFundsError, DomainError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(store, idempotency_key, request_fingerprint("batch", dto), execute)
 
 
 @router.get("/accounts/{account_id}/transactions", response_model=TransactionHistoryResponse)
-def list_transactions(account_id: str, facade: BankingFacade = Depends(get_facade)):
+def list_transactions(
+    account_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    type: Optional[TransactionType] = None,
+    status: Optional[TransactionStatus] = None,
+    facade: BankingFacade = Depends(get_facade),
+):
+    return READS.run(
+        "list_transactions", (account_id, limit, before, after, type, status),
+        lambda: read_transactions(
+            account_id, limit=limit, before=before, after=after,
+            type=type, status=status, facade=facade,
+        ),
+    )
+
+
+def read_transactions(
+    account_id: str,
+    limit: int,
+    before: Optional[str],
+    after: Optional[str],
+    type: Optional[TransactionType],
+    status: Optional[TransactionStatus],
+    facade: BankingFacade,
+) -> TransactionHistoryResponse:
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both")
+    try:
+        before_key, after_key = decode_cursor(before), decode_cursor(after)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         facade.get_account(account_id)
-        transactions = facade.list_transactions(account_id)
-        return TransactionHistoryResponse(
-            account_id=account_id,
-            transactions=[
-                TransactionResponse(
-                    id=tx.id, type=tx.type, amount=tx.amount,
-                    currency=tx.currency, status=tx.status,
-                )
-                for tx in transactions
-            ],
-            total_count=len(transactions),
+        # Se pide una fila extra para saber si hay otra página en esa dirección.
+        transactions = facade.list_transactions_page(
+            account_id, limit + 1, before=before_key, after=after_key,
+            tx_type=type, status=status,
         )
     except AccountNotFound as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+    has_more = len(transactions) > limit
+    if after_key is not None:
+        transactions = transactions[-limit:] if has_more else transactions
+        has_newer, has_older = has_more, True
+    else:
+        transactions = transactions[:limit]
+        has_newer, has_older = before_key is not None, has_more
+
+    return TransactionHistoryResponse(
+        account_id=account_id,
+        transactions=[
+            TransactionResponse(
+                id=tx.id, type=tx.type, amount=tx.amount,
+                currency=tx.currency, status=tx.status,
+                created_at=tx.created_at,
+            )
+            for tx in transactions
+        ],
+        total_count=len(transactions),
+        next_cursor=encode_cursor(transactions[-1]) if transactions and has_older else None,
+        prev_cursor=encode_cursor(transactions[0]) if transactions and has_newer else None,
+    )
+
+
+
+EXPORT_FORMATS = {
+    "ndjson": (ledger_ndjson, "application/x-ndjson"),
+    "csv": (ledger_csv, "text/csv"),
+}
+
+
+def _stream_ledger(session_factory, account_id: str, serializer):
+    # Sesión propia: el generador se consume después de que termina el request.
+    # Es solo lectura, así que no abre el unit of work (en memoria tomaría su
+    # lock mientras dure el streaming).
+    db = session_factory()
+    try:
+        yield from serializer(make_unit_of_work(db).ledger.iter_by_account_id(account_id))
+    finally:
+        db.close()
+
+
+@router.get("/accounts/{account_id}/ledger/export")
+def export_ledger(
+    account_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    facade: BankingFacade = Depends(get_facade),
+    session_factory=Depends(get_session_factory),
+):
+    try:
+        facade.get_account(account_id)
+    except AccountNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    serializer, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        _stream_ledger(session_factory, account_id, serializer),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="ledger-{account_id}.{format}"',
+        },
+    )
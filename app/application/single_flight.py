@@ -0,0 +1,90 @@
+"""
+Single-flight: lecturas idénticas que llegan mientras una ya está en curso
+en el mismo proceso esperan a esa y comparten su resultado (o su error), en
+lugar de abrir cada una su consulta.
+
+Solo se unen a una lectura ya en vuelo: el resultado puede ser anterior a
+una escritura que confirmó mientras esa lectura corría, como si el request
+hubiera llegado un instante antes.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from app.metrics import REGISTRY
+
+T = TypeVar("T")
+
+COALESCED = REGISTRY.counter(
+    "single_flight_requests_total",
+    "Lecturas por operación, según si ejecutaron (leader) o esperaron a otra (follower)",
+    ("operation", "role"),
+)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: dict[tuple, _Call] = {}
+        self._tasks: dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def run(self, operation: str, key: Hashable, fn: Callable[[], T]) -> T:
+        """Para handlers sync (threadpool): los followers esperan en un Event."""
+        flight = (operation, key)
+        with self._lock:
+            call = self._calls.get(flight)
+            leader = call is None
+            if leader:
+                call = self._calls[flight] = _Call()
+
+        if not leader:
+            COALESCED.inc(operation=operation, role="follower")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        COALESCED.inc(operation=operation, role="leader")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight]
+            call.done.set()
+
+    async def run_async(self, operation: str, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Para handlers async: la lectura corre en una Task que todos esperan
+        con shield, así un cliente que se desconecta no cancela a los demás.
+        """
+        flight = (operation, key)
+        task = self._tasks.get(flight)
+        if task is None:
+            COALESCED.inc(operation=operation, role="leader")
+            task = self._tasks[flight] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._finish(flight, t))
+        else:
+            COALESCED.inc(operation=operation, role="follower")
+        return await asyncio.shield(task)
+
+    def _finish(self, flight: tuple, task: asyncio.Task):
+        if self._tasks.get(flight) is task:
+            del self._tasks[flight]
+        # Si todos los que esperaban se cancelaron, nadie lee el error.
+        if not task.cancelled():
+            task.exception()
+
+
+# Lecturas calientes de la API (GET /accounts/{id} y su historial).
+READS = SingleFlight()
@@ -0,0 +1,65 @@
+"""
+Middleware de timing: por request mide tiempo total, tiempo en BD,
+sentencias SQL y fases del facade. Los devuelve en el header Server-Timing
+y los acumula como histogramas por ruta en /metrics.
+"""
+import time
+
+from fastapi import Request
+
+from app.instrumentation import RequestStats, end_request, start_request
+from app.metrics import REGISTRY
+
+LABELS = ("method", "route")
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Tiempo total del request", LABELS
+)
+REQUEST_DB_DURATION = REGISTRY.histogram(
+    "http_request_db_seconds", "Tiempo ejecutando sentencias SQL por request", LABELS
+)
+REQUEST_STATEMENTS = REGISTRY.histogram(
+    "http_request_db_statements", "Sentencias SQL por request", LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_PHASE_DURATION = REGISTRY.histogram(
+    "http_request_phase_seconds",
+    "Tiempo por fase del facade (risk, fee, commit) por request", LABELS + ("phase",)
+)
+
+
+def _route_label(request: Request) -> str:
+    # La plantilla de la ruta, no la URL: /accounts/{account_id} es una sola serie.
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def server_timing(total_seconds: float, stats: RequestStats) -> str:
+    parts = [
+        f"total;dur={total_seconds * 1000:.2f}",
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries"',
+    ]
+    parts += [
+        f"{phase};dur={seconds * 1000:.2f}"
+        for phase, seconds in sorted(stats.phases.items())
+    ]
+    return ", ".join(parts)
+
+
+async def timing_middleware(request: Request, call_next):
+    stats, token = start_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+    total = time.perf_counter() - start
+
+    labels = {"method": request.method, "route": _route_label(request)}
+    REQUEST_DURATION.observe(total, **labels)
+    REQUEST_DB_DURATION.observe(stats.db_seconds, **labels)
+    REQUEST_STATEMENTS.observe(stats.statements, **labels)
+    for phase, seconds in stats.phases.items():
+        REQUEST_PHASE_DURATION.observe(seconds, phase=phase, **labels)
+    response.headers["Server-Timing"] = server_timing(total, stats)
+    return response
@@ -0,0 +1,109 @@
+"""
+Comandos de mantenimiento. Uso:
+
+    python -m app.cli rebuild-risk-counters [--account-id ID]
+    python -m app.cli purge-idempotency-keys
+    python -m app.cli create-partitions [--months-ahead N]
+    python -m app.cli archive-ledger --keep-months N
+    python -m app.cli detach-old-partitions --keep-months N
+"""
+import argparse
+from datetime import datetime
+
+from app.repositories import archive, partitions
+from app.repositories.database import SessionLocal
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+def rebuild_risk_counters(args: argparse.Namespace):
+    with SqlUnitOfWork(SessionLocal()) as uow:
+        rebuilt = uow.risk_counters.rebuild(account_id=args.account_id)
+        uow.commit()
+    print(f"Contadores de riesgo reconstruidos: {rebuilt} cuenta(s)")
+
+
+def purge_idempotency_keys(args: argparse.Namespace):
+    # Pensado para un cron: las claves vencidas ya no se repiten.
+    with SqlUnitOfWork(SessionLocal()) as uow:
+        purged = uow.idempotency.delete_expired(datetime.utcnow())
+        uow.commit()
+    print(f"Claves de idempotencia vencidas borradas: {purged}")
+
+
+def create_partitions(args: argparse.Namespace):
+    # La API ya lo corre cada PARTITIONS_CHECK_SECONDS; esto queda para
+    # correrlo a mano o desde un cron si está apagado.
+    with SessionLocal() as db:
+        created = partitions.ensure_partitions(db, months_ahead=args.months_ahead)
+        db.commit()
+    print(f"Particiones creadas: {', '.join(created) or 'ninguna'}")
+
+
+def archive_ledger(args: argparse.Namespace):
+    # Antes de detach-old-partitions y con el mismo --keep-months.
+    ledger_archive = archive.get_ledger_archive()
+    if ledger_archive is None:
+        raise SystemExit("archive-ledger requires LEDGER_ARCHIVE_DIR")
+    with SessionLocal() as db:
+        months = archive.archive_expired_months(db, ledger_archive, keep_months=args.keep_months)
+    print(f"Meses archivados: {', '.join(f'{m:%Y-%m}' for m in months) or 'ninguno'}")
+
+
+def detach_old_partitions(args: argparse.Namespace):
+    # Con LEDGER_ARCHIVE_DIR, después de archive-ledger: solo se desprenden
+    # meses ya archivados. Sin archivo, los meses viejos dejan de verse.
+    with SessionLocal() as db:
+        try:
+            detached = partitions.detach_expired_partitions(
+                db, keep_months=args.keep_months, archive=archive.get_ledger_archive(),
+            )
+        except partitions.UnarchivedPartitions as e:
+            raise SystemExit(f"{e}; run archive-ledger first")
+        db.commit()
+    print(f"Particiones desprendidas: {', '.join(detached) or 'ninguna'}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-risk-counters",
+        help="Recalcula account_risk_counters desde el ledger",
+    )
+    rebuild.add_argument("--account-id", default=None)
+    rebuild.set_defaults(handler=rebuild_risk_counters)
+
+    purge = commands.add_parser(
+        "purge-idempotency-keys",
+        help="Borra las claves de idempotencia con el TTL vencido",
+    )
+    purge.set_defaults(handler=purge_idempotency_keys)
+
+    create = commands.add_parser(
+        "create-partitions",
+        help="Crea las particiones mensuales del mes actual y los siguientes",
+    )
+    create.add_argument("--months-ahead", type=int, default=partitions.PARTITIONS_MONTHS_AHEAD)
+    create.set_defaults(handler=create_partitions)
+
+    archive_cmd = commands.add_parser(
+        "archive-ledger",
+        help="Exporta a Parquet los meses más viejos que --keep-months meses",
+    )
+    archive_cmd.add_argument("--keep-months", type=int, required=True)
+    archive_cmd.set_defaults(handler=archive_ledger)
+
+    detach = commands.add_parser(
+        "detach-old-partitions",
+        help="Desprende las particiones más viejas que --keep-months meses",
+    )
+    detach.add_argument("--keep-months", type=int, required=True)
+    detach.set_defaults(handler=detach_old_partitions)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
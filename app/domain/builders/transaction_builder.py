@@ -1,13 +1,14 @@
-import uuid
 from datetime import datetime
 from app.domain.entities.transaction import Transaction
 from app.domain.enums import TransactionStatus, TransactionType
 from app.domain.exceptions import InvalidTransactionAmountError
+from app.domain.ids import new_id
+from app.domain.money import Money
 
 
 class TransactionBuilder:
     def __init__(self):
-        self._id = str(uuid.uuid4())
+        self._id = new_id()
         self._type = None
         self._amount = None
         self._currency = "USD"
@@ -18,7 +19,7 @@ class TransactionBuilder:
         self._type = tx_type
         return self
 
-    def with_amount(self, amount: float):
+    def with_amount(self, amount: Money):
         self._amount = amount
         return self
 
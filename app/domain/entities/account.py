@@ -1,11 +1,14 @@
 from dataclasses import dataclass
+from typing import Optional
 import uuid
 from app.domain.enums import AccountStatus
 from app.domain.exceptions import (
     InsufficientFundsError,
     AccountFrozenError,
     AccountClosedError,
+    CurrencyMismatchError,
 )
+from app.domain.money import Money
 
 
 @dataclass
@@ -13,27 +16,32 @@ class Account:
     id: str
     customer_id: str
     currency: str
-    balance: float = 0.0
+    # None: saldo cero en la moneda de la cuenta.
+    balance: Optional[Money] = None
     status: AccountStatus = AccountStatus.ACTIVE
+    # Versión leída de la BD; las escrituras la comparan para detectar conflictos.
+    version: int = 0
 
-    def deposit(self, amount: float):
-        self._validate_active()
-        self._validate_amount(amount)
-        self.balance += amount
+    def __post_init__(self):
+        if self.balance is None:
+            self.balance = Money.zero(self.currency)
 
-    def withdraw(self, amount: float):
+    # Saldo y monto se operan como enteros (ya en la misma moneda) y se crea
+    # un solo Money, el del saldo nuevo.
+    def deposit(self, amount: Money):
         self._validate_active()
         self._validate_amount(amount)
-        if self.balance < amount:
-            raise InsufficientFundsError("Insufficient balance")
-        self.balance -= amount
+        self.balance = Money(self.balance.minor + amount.minor, self.currency)
 
-    def transfer(self, amount: float, to_account: 'Account'):
+    def withdraw(self, amount: Money):
         self._validate_active()
         self._validate_amount(amount)
-        if self.balance < amount:
+        if self.balance.minor < amount.minor:
             raise InsufficientFundsError("Insufficient balance")
-        self.balance -= amount
+        self.balance = Money(self.balance.minor - amount.minor, self.currency)
+
+    def transfer(self, amount: Money, to_account: 'Account'):
+        self.withdraw(amount)
         to_account.deposit(amount)
 
     def freeze(self):
@@ -48,6 +56,8 @@ class Account:
         if self.status == AccountStatus.CLOSED:
             raise AccountClosedError("Account is closed")
 
-    def _validate_amount(self, amount: float):
-        if amount <= 0:
+    def _validate_amount(self, amount: Money):
+        if amount.currency != self.currency:
+            raise CurrencyMismatchError(f"Cannot combine {self.currency} and {amount.currency}")
+        if amount.minor <= 0:
             raise ValueError("Amount must be greater than zero")
\ No newline at end of file
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass
+class IdempotencyRecord:
+    key: str
+    # Huella de la petición original: la misma clave con otro cuerpo es un error.
+    request_hash: str
+    # En curso vence con el lease; completa, con el TTL.
+    expires_at: datetime
+    # Ambos en None mientras la primera petición con la clave se está ejecutando.
+    status_code: Optional[int] = None
+    response_body: Optional[Any] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
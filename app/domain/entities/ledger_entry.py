@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from app.domain.enums import Direction
+from app.domain.money import Money
 
 
 @dataclass
@@ -8,4 +10,5 @@ class LedgerEntry:
     account_id: str
     transaction_id: str
     direction: Direction
-    amount: float
\ No newline at end of file
+    amount: Money
+    created_at: datetime = field(default_factory=datetime.utcnow)
\ No newline at end of file
@@ -24,9 +24,19 @@ class InvalidTransactionAmountError(DomainError):
 
 
 
+class ConcurrentUpdateError(DomainError):
+    """Otra transacción modificó los mismos datos; la operación se puede reintentar."""
+    pass
+
+
 class CustomerNotFound(DomainError):
     pass
 
 
 class AccountNotFound(DomainError):
     pass
+
+
+class CurrencyMismatchError(DomainError):
+    """Operación entre montos (o cuentas) de monedas distintas."""
+    pass
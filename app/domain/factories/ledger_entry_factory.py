@@ -1,15 +1,27 @@
-import uuid
+from datetime import datetime
+from typing import Optional
 from app.domain.entities.ledger_entry import LedgerEntry
 from app.domain.enums import Direction
+from app.domain.ids import new_id
+from app.domain.money import Money
 
 
 class LedgerEntryFactory:
     @staticmethod
-    def create(account_id: str, transaction_id: str, direction: Direction, amount: float) -> LedgerEntry:
+    def create(
+        account_id: str,
+        transaction_id: str,
+        direction: Direction,
+        amount: Money,
+        created_at: Optional[datetime] = None,
+    ) -> LedgerEntry:
+        # created_at debe ser el de la transacción: el historial pagina por
+        # (created_at, transaction_id) sobre el ledger.
         return LedgerEntry(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             account_id=account_id,
             transaction_id=transaction_id,
             direction=direction,
-            amount=amount
+            amount=amount,
+            created_at=created_at or datetime.utcnow(),
         )
\ No newline at end of file
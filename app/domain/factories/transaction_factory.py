@@ -1,13 +1,14 @@
-import uuid
 from app.domain.entities.transaction import Transaction
 from app.domain.enums import TransactionType
+from app.domain.ids import new_id
+from app.domain.money import Money
 
 
 class TransactionFactory:
     @staticmethod
-    def create(transaction_type: TransactionType, amount: float, currency: str):
+    def create(transaction_type: TransactionType, amount: Money, currency: str):
         return Transaction(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             type=transaction_type,
             amount=amount,
             currency=currency,
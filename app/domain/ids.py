@@ -0,0 +1,46 @@
+"""
+Identificadores de las entidades: UUIDv7 (RFC 9562) en texto.
+
+Los primeros 48 bits son el timestamp Unix en milisegundos, así los ids
+nuevos quedan al final del índice de la PK en lugar de caer en páginas al
+azar (como con uuid4). Dentro del mismo milisegundo los 12 bits de rand_a
+funcionan como contador, por lo que los ids de un proceso son crecientes.
+"""
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def new_id() -> str:
+    global _last_ms, _sequence
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            _sequence = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            # Mismo milisegundo (o reloj que retrocede): se sigue contando
+            # sobre el último; si el contador se agota se avanza 1 ms.
+            _sequence += 1
+            if _sequence > 0xFFF:
+                _last_ms += 1
+                _sequence = 0
+        ms, sequence = _last_ms, _sequence
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | sequence << 64 | 0b10 << 62 | rand_b
+    return str(uuid.UUID(int=value))
+
+
+def is_valid_id(value: str) -> bool:
+    """True si `value` es un UUID en texto (los ids que las columnas aceptan)."""
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
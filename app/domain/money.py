@@ -0,0 +1,170 @@
+"""
+Montos exactos: enteros en unidades menores de la moneda (centavos en USD,
+yenes en JPY). Las entidades, estrategias y repositorios operan con enteros;
+Decimal solo aparece al convertir desde/hacia unidades mayores en los bordes
+(API, configuración).
+
+Money valida la moneda una vez, al entrar (Money.of). En el camino caliente
+(fee, saldo, total a debitar) se opera con `.minor` y se crea un Money solo
+para los montos que quedan (saldo nuevo, total del ledger): crear el objeto
+cuesta más que la aritmética.
+"""
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Union
+
+from app.domain.exceptions import CurrencyMismatchError, InvalidTransactionAmountError
+
+# Decimales por moneda (ISO 4217); las que no están usan DEFAULT_EXPONENT.
+CURRENCY_EXPONENTS = {
+    "CLP": 0, "ISK": 0, "JPY": 0, "KRW": 0, "PYG": 0, "VND": 0,
+    "BHD": 3, "JOD": 3, "KWD": 3, "OMR": 3, "TND": 3,
+}
+DEFAULT_EXPONENT = 2
+
+
+def exponent(currency: str) -> int:
+    return CURRENCY_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def scale_minor(minor: int, numerator: int, denominator: int) -> int:
+    """`minor * numerator / denominator` redondeado half-even, solo con enteros."""
+    quotient, remainder = divmod(minor * numerator, denominator)
+    twice = remainder + remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+class Money:
+    """
+    Monto en unidades menores. Inmutable por convención: las operaciones
+    retornan instancias nuevas. Es una clase con __slots__ y no un dataclass
+    frozen porque se crea en cada operación (el saldo nuevo) y el __init__ frozen
+    cuesta el doble.
+    """
+
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor: int, currency: str):
+        self.minor = minor
+        self.currency = currency
+
+    def __repr__(self) -> str:
+        return f"Money(minor={self.minor!r}, currency={self.currency!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __hash__(self) -> int:
+        return hash((self.minor, self.currency))
+
+    @classmethod
+    def of(cls, amount: Union["Money", Decimal, int, str, float], currency: str) -> "Money":
+        """
+        `amount` en unidades mayores (10.5 = 10,50 USD). Falla si tiene más
+        decimales de los que la moneda permite, en lugar de redondear.
+        """
+        if isinstance(amount, Money):
+            if amount.currency != currency:
+                raise CurrencyMismatchError(f"Expected {currency}, got {amount.currency}")
+            return amount
+        if isinstance(amount, int):
+            return cls(amount * 10 ** exponent(currency), currency)
+        try:
+            # repr de un float es el decimal más corto que lo representa.
+            value = Decimal(repr(amount) if isinstance(amount, float) else amount)
+            scaled = value.scaleb(exponent(currency))
+            if not scaled.is_finite() or scaled != scaled.to_integral_value():
+                raise InvalidOperation
+        except (InvalidOperation, TypeError, ValueError):
+            raise InvalidTransactionAmountError(
+                f"Invalid amount {amount} for {currency}"
+            ) from None
+        return cls(int(scaled), currency)
+
+    @classmethod
+    def zero(cls, currency: str) -> "Money":
+        return cls(0, currency)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.minor).scaleb(-exponent(self.currency))
+
+    def __float__(self) -> float:
+        return self.minor / 10 ** exponent(self.currency)
+
+    def __str__(self) -> str:
+        return f"{self.to_decimal()} {self.currency}"
+
+    def scaled(self, numerator: int, denominator: int) -> "Money":
+        """
+        `self * numerator / denominator` redondeado a la unidad menor
+        (half-even), solo con enteros.
+        """
+        return Money(scale_minor(self.minor, numerator, denominator), self.currency)
+
+    def _mismatch(self, other: "Money") -> CurrencyMismatchError:
+        return CurrencyMismatchError(f"Cannot combine {self.currency} and {other.currency}")
+
+    # La moneda se compara en línea (sin llamar a un helper): son las
+    # operaciones del camino caliente.
+    def __add__(self, other: "Money") -> "Money":
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return Money(self.minor + other.minor, self.currency)
+
+    def __sub__(self, other: "Money") -> "Money":
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return Money(self.minor - other.minor, self.currency)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.minor, self.currency)
+
+    def __lt__(self, other: "Money") -> bool:
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return self.minor < other.minor
+
+    def __le__(self, other: "Money") -> bool:
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return self.minor <= other.minor
+
+    def __gt__(self, other: "Money") -> bool:
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return self.minor > other.minor
+
+    def __ge__(self, other: "Money") -> bool:
+        if other.currency != self.currency:
+            raise self._mismatch(other)
+        return self.minor >= other.minor
+
+
+# Monto en unidades mayores tal como llega de la API o de un llamador; el
+# facade lo convierte con la moneda de la cuenta (Money.of).
+AmountInput = Union[Money, Decimal, int, str, float]
+
+
+class FixedAmount:
+    """
+    Monto de configuración en unidades mayores (fee plano, límites de
+    riesgo). Se convierte a Money una vez por moneda, no en cada operación;
+    a diferencia de Money.of se redondea (half-even) a la unidad menor, así
+    un fee de 0.5 sigue siendo válido para JPY.
+    """
+
+    def __init__(self, amount: Union[Decimal, int, str, float]):
+        self.amount = amount
+        self._value = Decimal(repr(amount) if isinstance(amount, float) else amount)
+        self._by_currency: dict[str, Money] = {}
+
+    def in_currency(self, currency: str) -> Money:
+        money = self._by_currency.get(currency)
+        if money is None:
+            minor = self._value.scaleb(exponent(currency)).to_integral_value(ROUND_HALF_EVEN)
+            money = self._by_currency[currency] = Money(int(minor), currency)
+        return money
+
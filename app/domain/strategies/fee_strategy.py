@@ -1,30 +1,50 @@
+from fractions import Fraction
 from typing import Protocol
 
+from app.domain.money import FixedAmount, Money, scale_minor
+
 
 class FeeStrategy(Protocol):
-    def calculate(self, amount: float) -> float:
+    def calculate(self, amount: Money) -> Money:
+        ...
+
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        """El mismo fee en unidades menores, sin crear Money (camino caliente)."""
         ...
 
 
 class NoFeeStrategy:
-    def calculate(self, amount: float) -> float:
-        return 0.0
+    def calculate(self, amount: Money) -> Money:
+        return Money.zero(amount.currency)
+
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        return 0
 
 
 class FlatFeeStrategy:
     def __init__(self, fee: float):
         self.fee = fee
+        self._fee = FixedAmount(fee)
 
-    def calculate(self, amount: float) -> float:
-        return self.fee
+    def calculate(self, amount: Money) -> Money:
+        return self._fee.in_currency(amount.currency)
+
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        return self._fee.in_currency(currency).minor
 
 
 class PercentFeeStrategy:
     def __init__(self, percent: float):
-        self.percent = percent  
+        self.percent = percent
+        # 0.015 -> 3/200: el fee se calcula con enteros sobre unidades menores.
+        ratio = Fraction(str(percent))
+        self._numerator, self._denominator = ratio.numerator, ratio.denominator
+
+    def calculate(self, amount: Money) -> Money:
+        return amount.scaled(self._numerator, self._denominator)
 
-    def calculate(self, amount: float) -> float:
-        return amount * self.percent
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        return scale_minor(minor, self._numerator, self._denominator)
 
 
 class TieredFeeStrategy:
@@ -32,8 +52,16 @@ class TieredFeeStrategy:
         self.threshold = threshold
         self.low_fee = low_fee
         self.high_fee = high_fee
+        self._threshold = FixedAmount(threshold)
+        self._low_fee = FixedAmount(low_fee)
+        self._high_fee = FixedAmount(high_fee)
+
+    def calculate(self, amount: Money) -> Money:
+        if amount <= self._threshold.in_currency(amount.currency):
+            return self._low_fee.in_currency(amount.currency)
+        return self._high_fee.in_currency(amount.currency)
 
-    def calculate(self, amount: float) -> float:
-        if amount <= self.threshold:
-            return self.low_fee
-        return self.high_fee
\ No newline at end of file
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        if minor <= self._threshold.in_currency(currency).minor:
+            return self._low_fee.in_currency(currency).minor
+        return self._high_fee.in_currency(currency).minor
@@ -1,36 +1,103 @@
-from typing import Protocol
+from functools import cache
+from typing import Any, Callable, Iterator, Mapping, Protocol
 from app.domain.exceptions import RiskRejectedError
+from app.domain.money import FixedAmount, Money
 
 
 class RiskStrategy(Protocol):
-    def validate(self, amount: float, context: dict) -> None:
+    # Claves del contexto que la regla lee y costo relativo de evaluarla
+    # (0: no necesita datos). Las reglas baratas se evalúan primero.
+    requires: tuple[str, ...]
+    cost: int
+
+    def validate(self, amount: Money, context: Mapping[str, Any]) -> None:
         ...
 
 
+class RiskContext(Mapping[str, Any]):
+    """
+    Contexto de riesgo perezoso: cada clave se calcula la primera vez que
+    una regla la lee y se memoriza. Las que ninguna regla lee no se calculan.
+    """
+
+    def __init__(self, loaders: dict[str, Callable[[], Any]]):
+        self._loaders = loaders
+        self._values: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    @property
+    def computed(self) -> set[str]:
+        return set(self._values)
+
+
+def account_risk_context(load_totals: Callable[[], tuple[int, int]]) -> RiskContext:
+    """
+    Contexto de VelocityRule y DailyLimitRule. Ambas claves salen de la misma
+    consulta (transacciones recientes, monto del día en unidades menores de
+    la moneda de la cuenta): se hace una sola vez.
+    """
+    totals = cache(load_totals)
+    return RiskContext({
+        "recent_transactions": lambda: totals()[0],
+        "daily_total": lambda: totals()[1],
+    })
+
+
+def order_by_cost(rules: list[RiskStrategy]) -> list[RiskStrategy]:
+    # sorted es estable: a igual costo se respeta el orden configurado.
+    return sorted(rules, key=lambda rule: getattr(rule, "cost", 1))
+
+
+def required_keys(rules: list[RiskStrategy]) -> set[str]:
+    return {key for rule in rules for key in getattr(rule, "requires", ())}
+
+
 class MaxAmountRule:
+    requires: tuple[str, ...] = ()
+    cost = 0
+
     def __init__(self, max_amount: float):
         self.max_amount = max_amount
+        self._max_amount = FixedAmount(max_amount)
 
-    def validate(self, amount: float, context: dict) -> None:
-        if amount > self.max_amount:
+    def validate(self, amount: Money, context: Mapping[str, Any]) -> None:
+        if amount > self._max_amount.in_currency(amount.currency):
             raise RiskRejectedError("Amount exceeds maximum allowed")
 
 
 class VelocityRule:
+    requires = ("recent_transactions",)
+    cost = 1
+
     def __init__(self, max_transactions: int):
         self.max_transactions = max_transactions
 
-    def validate(self, amount: float, context: dict) -> None:
+    def validate(self, amount: Money, context: Mapping[str, Any]) -> None:
         tx_count = context.get("recent_transactions", 0)
         if tx_count > self.max_transactions:
             raise RiskRejectedError("Velocity limit exceeded")
 
 
 class DailyLimitRule:
+    requires = ("daily_total",)
+    cost = 1
+
     def __init__(self, daily_limit: float):
         self.daily_limit = daily_limit
+        self._daily_limit = FixedAmount(daily_limit)
 
-    def validate(self, amount: float, context: dict) -> None:
+    def validate(self, amount: Money, context: Mapping[str, Any]) -> None:
+        # daily_total viene en unidades menores (enteros, como los contadores).
         total_today = context.get("daily_total", 0)
-        if total_today + amount > self.daily_limit:
-            raise RiskRejectedError("Daily limit exceeded")
\ No newline at end of file
+        if total_today + amount.minor > self._daily_limit.in_currency(amount.currency).minor:
+            raise RiskRejectedError("Daily limit exceeded")
@@ -96,7 +96,7 @@ with tabs[5]:
     if st.button("Consultar", type="primary"):
         code, data = get(f"/accounts/{get_account_id}")
         if code == 200:
-            st.success(f"Balance: ${data.get('balance', 0):.2f}")
+            st.success(f"Balance: {data.get('balance', '0')} {data.get('currency', '')}")
         else:
             st.error(data.get("detail", "Error"))
         st.json(data)
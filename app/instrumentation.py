@@ -0,0 +1,79 @@
+"""
+Mediciones por request: tiempo en BD, cantidad de sentencias y fases del
+facade (riesgo, fee, commit).
+
+El middleware de timing abre un RequestStats en un ContextVar; los hooks de
+SQLAlchemy y timed() suman sobre él. Fuera de un request (CLI, benchmarks,
+tests del facade) no hay RequestStats y todo esto no hace nada.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestStats:
+    db_seconds: float = 0.0
+    statements: int = 0
+    # Segundos por fase; una fase incluye el tiempo de BD que ocurra dentro.
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> tuple[RequestStats, Token]:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token: Token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[phase] = stats.phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is None or not starts:
+        return
+    stats.db_seconds += time.perf_counter() - starts.pop()
+    stats.statements += 1
+
+
+def _handle_error(exception_context):
+    # Una sentencia que falla no llega a after_cursor_execute.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_sql_hooks():
+    """Registra los hooks en todos los engines (sync y el sync interno del async)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
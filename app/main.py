@@ -1,12 +1,36 @@
+import os
 from fastapi import FastAPI
-from app.repositories.database import create_tables
-from app.application.routes import router
+from app.repositories.database import SessionLocal, create_tables
+from app.repositories.partitions import start_partition_maintenance
+from app.repositories import unit_of_work
+from app.application.metrics_routes import router as metrics_router
+from app.application.timing import timing_middleware
+from app.application.container import get_container
+from app.instrumentation import install_sql_hooks
+
+# API_MODE=async sirve los mismos endpoints con un engine async.
+API_MODE = os.getenv("API_MODE", "sync")
+
+if API_MODE == "async":
+    from app.application.async_routes import router
+else:
+    from app.application.routes import router
 
 app = FastAPI(title="Fintech Mini Bank API", version="1.0.0")
 
 app.include_router(router)
+app.include_router(metrics_router)
+
+# Tiempo total, de BD y por fase de cada request (Server-Timing y /metrics).
+install_sql_hooks()
+app.middleware("http")(timing_middleware)
 
 
 @app.on_event("startup")
 def on_startup():
-    create_tables()
\ No newline at end of file
+    if unit_of_work.REPOSITORY_BACKEND == "sql":
+        create_tables()
+        # Particiones de este mes y los siguientes (solo PostgreSQL particionado).
+        start_partition_maintenance(SessionLocal)
+    # Strategies y configuración se cargan una vez; un archivo inválido falla acá.
+    get_container()
@@ -0,0 +1,367 @@
+"""
+Archivo frío del historial: ledger y transacciones de meses viejos en
+Parquet (zstd) en disco local, un archivo por mes y rango de cuentas:
+
+    <LEDGER_ARCHIVE_DIR>/2025_01/accounts_003.parquet
+
+Cada fila es una entry del ledger con los datos de su transacción. Cada
+archivo está ordenado por (account_id, created_at) en row groups chicos
+(uno por lote del export): leer una cuenta mapea el archivo en memoria y
+solo decodifica los row groups cuyo rango de account_id la incluye.
+
+El archivo manda sobre los meses que cubre: los repositorios SQL (historial
+completo y paginado, export del ledger) leen la BD solo desde
+archived_until() y completan con el archivo, así el historial archivado no
+cuesta I/O de BD. Se llena con `python -m app.cli archive-ledger
+--keep-months N`; detach-old-partitions no desprende meses sin archivar.
+Requiere el paquete `pyarrow` (en requirements.txt).
+"""
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import Direction, TransactionStatus, TransactionType
+from app.domain.money import Money
+from app.repositories.models import LedgerEntryModel, TransactionModel
+from app.repositories.partitions import add_months, month_start
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # opcional: solo hace falta con LEDGER_ARCHIVE_DIR
+    pa = pc = pq = None
+
+LEDGER_ARCHIVE_DIR = os.getenv("LEDGER_ARCHIVE_DIR")
+# Archivos por mes. Cambiarlo solo afecta a los meses que se archiven después.
+LEDGER_ARCHIVE_RANGES = int(os.getenv("LEDGER_ARCHIVE_RANGES", "16"))
+OPEN_FILES = 256
+
+_MONTH_DIR = re.compile(r"^\d{4}_\d{2}$")
+_MANIFEST = "_manifest.json"
+
+
+def account_range(account_id: str, ranges: int) -> int:
+    # Los últimos 32 bits del UUID son aleatorios (también en v7): los rangos
+    # quedan parejos aunque las cuentas se creen en ráfagas.
+    return int(account_id.replace("-", "")[-8:], 16) * ranges >> 32
+
+
+class ParquetLedgerArchive:
+    """
+    Meses archivados en `directory`. Un mes existe cuando su directorio
+    existe: se escribe completo en uno temporal y se renombra al final.
+    """
+
+    def __init__(self, directory: str, ranges: int = LEDGER_ARCHIVE_RANGES):
+        if pa is None:
+            raise RuntimeError("LEDGER_ARCHIVE_DIR requires the 'pyarrow' package")
+        self.directory = directory
+        self.ranges = ranges
+        self._lock = threading.Lock()
+        self._listed_at: Optional[int] = None
+        # mes -> cantidad de rangos, de la más nueva a la más vieja
+        self._months: list[tuple[datetime, int]] = []
+        self._files: OrderedDict[str, Optional["pq.ParquetFile"]] = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    def archived_until(self) -> Optional[datetime]:
+        """Fin (exclusivo) del último mes archivado; None si no hay ninguno."""
+        months = self._archived()
+        return add_months(months[0][0], 1) if months else None
+
+    def transactions_for_account(self, account_id: str) -> list[Transaction]:
+        """Transacciones archivadas de la cuenta, de la más nueva a la más vieja."""
+        return list(self._transactions(account_id, newest_first=True))
+
+    def transactions_page(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        """
+        Como SqlTransactionRepository.get_page_by_account_id: misma clave
+        (created_at, id), y solo lee los meses desde/hasta el cursor. El id
+        se compara como texto, que en un UUID ordena igual que el uuid nativo.
+        """
+        newest_first = after is None
+        if after is not None:
+            transactions = self._transactions(account_id, False, since=after[0])
+        else:
+            until = before[0] if before is not None else None
+            transactions = self._transactions(account_id, True, until=until)
+        page = []
+        for transaction in transactions:
+            key = (transaction.created_at, transaction.id)
+            if after is not None and key <= after:
+                continue
+            if after is None and before is not None and key >= before:
+                continue
+            if tx_type is not None and transaction.type != tx_type:
+                continue
+            if status is not None and transaction.status != status:
+                continue
+            page.append(transaction)
+            if len(page) == limit:
+                break
+        if not newest_first:
+            page.reverse()
+        return page
+
+    def entries_for_account(self, account_id: str) -> Iterator[tuple[LedgerEntry, Transaction]]:
+        """Entries archivadas de la cuenta con su transacción, en orden cronológico."""
+        for row in self._rows(account_id, newest_first=False):
+            yield LedgerEntry(
+                id=row["entry_id"],
+                account_id=row["account_id"],
+                transaction_id=row["transaction_id"],
+                direction=Direction(row["direction"]),
+                amount=Money(row["amount"], row["currency"]),
+                created_at=row["created_at"],
+            ), _to_transaction(row)
+
+    def write_month(self, month: datetime, batches: Iterable[dict[str, list]]) -> int:
+        """
+        Escribe un mes y lo publica de forma atómica. Cada lote trae las
+        columnas de ARCHIVE_COLUMNS en orden de (account_id, created_at) y
+        va como un row group a cada archivo que toca: en memoria nunca hay
+        más de un lote. Retorna la cantidad de filas.
+        """
+        final = os.path.join(self.directory, f"{month:%Y_%m}")
+        staging = os.path.join(self.directory, f".{month:%Y_%m}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        writers: dict[int, "pq.ParquetWriter"] = {}
+        total = 0
+        try:
+            for rows in batches:
+                table = pa.table(rows, schema=_schema())
+                buckets = pa.array(
+                    [account_range(a, self.ranges) for a in rows["account_id"]], pa.int32()
+                )
+                for bucket in pc.unique(buckets).to_pylist():
+                    if bucket not in writers:
+                        writers[bucket] = pq.ParquetWriter(
+                            os.path.join(staging, f"accounts_{bucket:03d}.parquet"),
+                            _schema(), compression="zstd",
+                        )
+                    part = table.filter(pc.equal(buckets, bucket))
+                    writers[bucket].write_table(part, row_group_size=part.num_rows)
+                total += table.num_rows
+        finally:
+            for writer in writers.values():
+                writer.close()
+        with open(os.path.join(staging, _MANIFEST), "w") as f:
+            json.dump({"ranges": self.ranges, "rows": total}, f)
+        os.rename(staging, final)
+        return total
+
+    def _transactions(
+        self,
+        account_id: str,
+        newest_first: bool,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Transaction]:
+        previous = None
+        for row in self._rows(account_id, newest_first, since, until):
+            # Una transferencia entre la misma cuenta tiene dos entries, contiguas.
+            if row["transaction_id"] == previous:
+                continue
+            previous = row["transaction_id"]
+            yield _to_transaction(row)
+
+    def _rows(
+        self,
+        account_id: str,
+        newest_first: bool,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        # Mes a mes, solo los que tocan [since, until], y dentro de cada mes
+        # por (created_at, transaction_id, entry_id).
+        months = self._archived()
+        for month, ranges in (months if newest_first else reversed(months)):
+            if since is not None and add_months(month, 1) <= since:
+                continue
+            if until is not None and month > until:
+                continue
+            path = os.path.join(
+                self.directory, f"{month:%Y_%m}",
+                f"accounts_{account_range(account_id, ranges):03d}.parquet",
+            )
+            table = self._read_account(path, account_id)
+            if table is None:
+                continue
+            yield from sorted(table.to_pylist(), key=_row_key, reverse=newest_first)
+
+    def _archived(self) -> list[tuple[datetime, int]]:
+        # Se vuelve a listar solo si cambió el directorio (otro proceso archivó).
+        listed_at = os.stat(self.directory).st_mtime_ns
+        with self._lock:
+            if listed_at != self._listed_at:
+                months = []
+                for name in os.listdir(self.directory):
+                    if not _MONTH_DIR.match(name):
+                        continue
+                    with open(os.path.join(self.directory, name, _MANIFEST)) as f:
+                        ranges = json.load(f)["ranges"]
+                    months.append((datetime.strptime(name, "%Y_%m"), ranges))
+                self._months = sorted(months, reverse=True)
+                self._listed_at = listed_at
+            return self._months
+
+    def _open(self, path: str) -> Optional["pq.ParquetFile"]:
+        # Los archivos de un mes no cambian: se abren una vez (mmap y footer
+        # ya leído) y quedan en un LRU acotado.
+        with self._lock:
+            if path in self._files:
+                self._files.move_to_end(path)
+                return self._files[path]
+        parquet = pq.ParquetFile(pa.memory_map(path)) if os.path.exists(path) else None
+        with self._lock:
+            self._files[path] = parquet
+            while len(self._files) > OPEN_FILES:
+                self._files.popitem(last=False)
+        return parquet
+
+    def _read_account(self, path: str, account_id: str) -> Optional["pa.Table"]:
+        parquet = self._open(path)
+        if parquet is None:
+            return None
+        column = parquet.schema_arrow.get_field_index("account_id")
+        groups = []
+        for i in range(parquet.metadata.num_row_groups):
+            stats = parquet.metadata.row_group(i).column(column).statistics
+            if stats is None or not stats.has_min_max or stats.min <= account_id <= stats.max:
+                groups.append(i)
+        if not groups:
+            return None
+        table = parquet.read_row_groups(groups)
+        return table.filter(pc.equal(table["account_id"], account_id))
+
+
+# Columnas de cada fila archivada (una entry del ledger + su transacción).
+ARCHIVE_COLUMNS = (
+    "account_id", "created_at", "transaction_id", "entry_id", "direction",
+    "amount", "type", "transaction_amount", "currency", "status",
+)
+
+
+def _schema() -> "pa.Schema":
+    return pa.schema([
+        ("account_id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("transaction_id", pa.string()),
+        ("entry_id", pa.string()),
+        ("direction", pa.string()),
+        ("amount", pa.int64()),
+        ("type", pa.string()),
+        ("transaction_amount", pa.int64()),
+        ("currency", pa.string()),
+        ("status", pa.string()),
+    ])
+
+
+def archive_expired_months(
+    db: Session,
+    archive: ParquetLedgerArchive,
+    keep_months: int,
+    now: Optional[datetime] = None,
+    batch_size: int = 10_000,
+) -> list[datetime]:
+    """
+    Archiva, en orden, cada mes todavía no archivado anterior a los últimos
+    `keep_months` meses completos (el mismo corte que
+    detach_expired_partitions). Lee la BD en lotes de `batch_size` filas
+    (un row group cada uno); no borra filas.
+    """
+    cutoff = add_months(month_start(now or datetime.utcnow()), -keep_months)
+    start = archive.archived_until()
+    if start is None:
+        oldest = db.query(func.min(TransactionModel.created_at)).scalar()
+        if oldest is None:
+            return []
+        start = month_start(oldest)
+    archived = []
+    month = start
+    while month < cutoff:
+        end = add_months(month, 1)
+        # En el orden del índice (account_id, created_at, transaction_id):
+        # cada lote cubre un rango chico de cuentas y las estadísticas
+        # min/max de sus row groups descartan el resto al leer.
+        result = db.execute(
+            select(
+                LedgerEntryModel.account_id,
+                LedgerEntryModel.created_at,
+                LedgerEntryModel.transaction_id,
+                LedgerEntryModel.id,
+                LedgerEntryModel.direction,
+                LedgerEntryModel.amount,
+                TransactionModel.type,
+                TransactionModel.amount,
+                TransactionModel.currency,
+                TransactionModel.status,
+            ).join(TransactionModel, and_(
+                TransactionModel.id == LedgerEntryModel.transaction_id,
+                TransactionModel.created_at == LedgerEntryModel.created_at,
+            )).where(
+                LedgerEntryModel.created_at >= month,
+                LedgerEntryModel.created_at < end,
+            ).order_by(
+                LedgerEntryModel.account_id,
+                LedgerEntryModel.created_at,
+                LedgerEntryModel.transaction_id,
+            ).execution_options(yield_per=batch_size)
+        )
+        archive.write_month(month, (_columns(batch) for batch in result.partitions()))
+        archived.append(month)
+        month = end
+    return archived
+
+
+def _columns(rows) -> dict[str, list]:
+    columns = {name: [] for name in ARCHIVE_COLUMNS}
+    for row in rows:
+        for name, value in zip(ARCHIVE_COLUMNS, row):
+            columns[name].append(value.value if isinstance(value, Enum) else value)
+    return columns
+
+
+def _row_key(row: dict) -> tuple:
+    return row["created_at"], row["transaction_id"], row["entry_id"]
+
+
+def _to_transaction(row: dict) -> Transaction:
+    return Transaction(
+        id=row["transaction_id"],
+        type=TransactionType(row["type"]),
+        amount=Money(row["transaction_amount"], row["currency"]),
+        currency=row["currency"],
+        status=TransactionStatus(row["status"]),
+        created_at=row["created_at"],
+    )
+
+
+@lru_cache
+def get_ledger_archive() -> Optional[ParquetLedgerArchive]:
+    """Archivo del proceso; None si LEDGER_ARCHIVE_DIR no está configurado."""
+    if not LEDGER_ARCHIVE_DIR:
+        return None
+    return ParquetLedgerArchive(LEDGER_ARCHIVE_DIR)
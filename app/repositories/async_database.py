@@ -0,0 +1,47 @@
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.repositories.database import DATABASE_URL
+from app.repositories.pool import InstrumentedAsyncQueuePool, pool_options, register_pool_metrics
+
+# Driver async equivalente a cada driver sync soportado.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(
+        drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    ).render_as_string(hide_password=False)
+
+
+# Por defecto la misma BD que DATABASE_URL, con el driver async.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Engine async: las conexiones esperan I/O en el event loop en lugar de
+# ocupar un hilo del threadpool.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+register_pool_metrics(async_engine.sync_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autocommit=False, autoflush=False
+)
+
+#Abre una sesión async de BD, la entrega al endpoint
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+#Entrega la fábrica de sesiones async. La usan las lecturas compartidas por
+#single-flight, que no pueden depender de la sesión de un request.
+def get_async_session_factory():
+    return AsyncSessionLocal
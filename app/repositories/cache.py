@@ -0,0 +1,252 @@
+"""
+Cache de lectura de cuentas delante de AccountRepository.
+
+GET /accounts/{id} (que los dashboards consultan en loop) lee a través del
+cache; los movimientos de dinero leen siempre del repositorio real y sus
+escrituras invalidan o reemplazan la entrada después del commit. Un valor
+puede quedar viejo a lo sumo ACCOUNT_CACHE_TTL_SECONDS (ej: otro proceso
+con cache local, o una lectura que termina justo después de un commit).
+
+Backends (ACCOUNT_CACHE_BACKEND):
+- "memory" (default): LRU con TTL en el proceso.
+- "redis": compartido entre procesos (ACCOUNT_CACHE_URL, requiere `redis`).
+- "off": sin cache.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.domain.entities.account import Account
+from app.domain.enums import AccountStatus
+from app.domain.money import Money
+from app.metrics import REGISTRY
+from app.repositories.interfaces import AccountRepository, CacheBackend
+
+ACCOUNT_CACHE_BACKEND = os.getenv("ACCOUNT_CACHE_BACKEND", "memory")
+ACCOUNT_CACHE_URL = os.getenv("ACCOUNT_CACHE_URL", "redis://localhost:6379/0")
+ACCOUNT_CACHE_TTL_SECONDS = float(os.getenv("ACCOUNT_CACHE_TTL_SECONDS", "5"))
+ACCOUNT_CACHE_SIZE = int(os.getenv("ACCOUNT_CACHE_SIZE", "10000"))
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "account_cache_requests_total", "Lecturas del cache de cuentas", ("result",)
+)
+
+
+class InProcessCache:
+    """LRU acotado con TTL, compartido por los threads del proceso."""
+
+    def __init__(
+        self,
+        max_entries: int = ACCOUNT_CACHE_SIZE,
+        ttl: float = ACCOUNT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCache:
+    """
+    Cache sobre un store compartido con la interfaz de redis-py
+    (get, set(px=...), delete). Los valores viajan como JSON. El prefijo
+    lleva la versión del formato (v2: saldo en unidades menores) para no
+    leer entradas escritas por una versión anterior.
+    """
+
+    def __init__(self, client, ttl: float = ACCOUNT_CACHE_TTL_SECONDS, prefix: str = "account:v2:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[dict]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: dict) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), px=int(self.ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+class LocalSharedStore:
+    """
+    Reemplazo local de Redis para SharedCache (tests, desarrollo): mismo
+    subconjunto de la interfaz, en un dict del proceso.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._values: dict[str, tuple[Optional[float], str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            entry = self._values.get(name)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._values[name]
+                return None
+            return value
+
+    def set(self, name: str, value: str, px: Optional[int] = None) -> None:
+        expires_at = None if px is None else self._clock() + px / 1000
+        with self._lock:
+            self._values[name] = (expires_at, value)
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._values.pop(name, None) is not None for name in names)
+
+
+def _to_cache(account: Account) -> dict:
+    return {
+        "id": account.id,
+        "customer_id": account.customer_id,
+        "currency": account.currency,
+        # Unidades menores: el JSON guarda el entero exacto.
+        "balance": account.balance.minor,
+        "status": account.status.value,
+        "version": account.version,
+    }
+
+
+def _from_cache(value: dict) -> Account:
+    return Account(**{
+        **value,
+        "balance": Money(value["balance"], value["currency"]),
+        "status": AccountStatus(value["status"]),
+    })
+
+
+class CachedAccountRepository:
+    """
+    AccountRepository que resuelve get_by_id desde el cache y delega el
+    resto en `inner`. Las escrituras borran la entrada en el momento y la
+    reemplazan (save, update) o la vuelven a borrar (movimientos de saldo)
+    cuando el unit of work confirma, para que un rollback no deje en el
+    cache un estado que nunca existió.
+    """
+
+    def __init__(
+        self,
+        inner: AccountRepository,
+        cache: CacheBackend,
+        on_commit: Callable[[Callable[[], None]], None],
+    ):
+        self.inner = inner
+        self.cache = cache
+        self._on_commit = on_commit
+        # Cuentas escritas en la transacción en curso: sus lecturas ven
+        # cambios sin confirmar y no deben llegar al cache.
+        self._dirty: set[str] = set()
+
+    def get_by_id(self, account_id: str) -> Optional[Account]:
+        if account_id not in self._dirty:
+            cached = self.cache.get(account_id)
+            if cached is not None:
+                CACHE_REQUESTS.inc(result="hit")
+                return _from_cache(cached)
+            CACHE_REQUESTS.inc(result="miss")
+        account = self.inner.get_by_id(account_id)
+        if account is not None and account_id not in self._dirty:
+            self.cache.set(account_id, _to_cache(account))
+        return account
+
+    def get_by_ids(self, account_ids: list[str]) -> dict[str, Account]:
+        return self.inner.get_by_ids(account_ids)
+
+    def get_by_customer_id(self, customer_id: str) -> list[Account]:
+        return self.inner.get_by_customer_id(customer_id)
+
+    def save(self, account: Account) -> Account:
+        saved = self.inner.save(account)
+        self._written([account.id], _to_cache(account))
+        return saved
+
+    def update(self, account: Account) -> Account:
+        updated = self.inner.update(account)
+        self._written([account.id], _to_cache(account))
+        return updated
+
+    def debit(self, account_id: str, amount: Money) -> None:
+        self.inner.debit(account_id, amount)
+        self._written([account_id])
+
+    def credit(self, account_id: str, amount: Money) -> None:
+        self.inner.credit(account_id, amount)
+        self._written([account_id])
+
+    def apply_deltas(self, deltas: dict[str, int]) -> None:
+        self.inner.apply_deltas(deltas)
+        self._written(list(deltas))
+
+    def _written(self, account_ids: list[str], value: Optional[dict] = None):
+        self._dirty.update(account_ids)
+        for account_id in account_ids:
+            self.cache.delete(account_id)
+
+        def after_commit():
+            for account_id in account_ids:
+                self._dirty.discard(account_id)
+                if value is None:
+                    self.cache.delete(account_id)
+                else:
+                    self.cache.set(account_id, value)
+
+        self._on_commit(after_commit)
+
+
+def build_account_cache(backend: str = ACCOUNT_CACHE_BACKEND) -> Optional[CacheBackend]:
+    if backend == "off":
+        return None
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("ACCOUNT_CACHE_BACKEND=redis requires the 'redis' package") from e
+        return SharedCache(redis.Redis.from_url(ACCOUNT_CACHE_URL))
+    if backend == "memory":
+        return InProcessCache()
+    raise ValueError(f"Unknown ACCOUNT_CACHE_BACKEND: {backend}")
+
+
+@lru_cache
+def get_account_cache() -> Optional[CacheBackend]:
+    """Cache de cuentas del proceso, compartido por todos los requests."""
+    return build_account_cache()
@@ -1,6 +1,7 @@
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.repositories.pool import InstrumentedQueuePool, pool_options, register_pool_metrics
 
 # Lee la URL de conexión desde variables de entorno.
 # Si no existe usa una URL por defecto.
@@ -10,7 +11,12 @@ DATABASE_URL = os.getenv(
 )
 
 # Engine: conexión principal a la base de datos.
-engine = create_engine(DATABASE_URL, echo=False)
+# El pool se configura con DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+# DB_POOL_RECYCLE y DB_POOL_PRE_PING; sus métricas salen en /metrics.
+engine = create_engine(
+    DATABASE_URL, echo=False, **pool_options(DATABASE_URL, InstrumentedQueuePool)
+)
+register_pool_metrics(engine, "sync")
 
 # SessionLocal: fábrica de sesiones. 
 # Cada request de la API abrirá una sesión y la cerrará al terminar.
@@ -28,6 +34,11 @@ def get_db():
     finally:
         db.close()
 
+#Entrega la fábrica de sesiones. La usan las respuestas streaming, que siguen
+#leyendo de la BD después de que get_db ya cerró la sesión del request.
+def get_session_factory():
+    return SessionLocal
+
 #Crea todas las tablas en la BD basándose en los modelos que heredan de Base
 def create_tables():
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
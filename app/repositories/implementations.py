@@ -1,17 +1,32 @@
+import calendar
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Iterator, Optional
+from sqlalchemy import and_, case, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.domain.entities.customer import Customer
 from app.domain.entities.account import Account
 from app.domain.entities.transaction import Transaction
 from app.domain.entities.ledger_entry import LedgerEntry
-from app.domain.enums import AccountStatus, TransactionStatus, Direction
+from app.domain.entities.idempotency_record import IdempotencyRecord
+from app.domain.enums import AccountStatus, TransactionStatus, TransactionType, Direction
+from app.domain.ids import is_valid_id
+from app.domain.money import Money
+from app.domain.exceptions import (
+    AccountClosedError,
+    AccountFrozenError,
+    AccountNotFound,
+    ConcurrentUpdateError,
+    InsufficientFundsError,
+)
+from app.repositories.interfaces import LedgerArchive
 from app.repositories.models import (
     CustomerModel,
     AccountModel,
     TransactionModel,
     LedgerEntryModel,
+    AccountRiskCounterModel,
+    IdempotencyKeyModel,
 )
 
 
@@ -27,11 +42,11 @@ class SqlCustomerRepository:
             status=customer.status,
         )
         self.db.add(model)
-        self.db.commit()
-        self.db.refresh(model)
         return self._to_domain(model)
 
     def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        if not is_valid_id(customer_id):
+            return None
         model = self.db.query(CustomerModel).filter(
             CustomerModel.id == customer_id
         ).first()
@@ -65,15 +80,18 @@ class SqlAccountRepository:
             id=account.id,
             customer_id=account.customer_id,
             currency=account.currency,
-            balance=account.balance,
+            balance=account.balance.minor,
             status=account.status,
+            version=account.version,
         )
         self.db.add(model)
-        self.db.commit()
-        self.db.refresh(model)
         return self._to_domain(model)
 
     def get_by_id(self, account_id: str) -> Optional[Account]:
+        # Un id que no es UUID no puede existir; en PostgreSQL compararlo
+        # contra la columna uuid sería un error en lugar de "no encontrado".
+        if not is_valid_id(account_id):
+            return None
         model = self.db.query(AccountModel).filter(
             AccountModel.id == account_id
         ).first()
@@ -81,51 +99,150 @@ class SqlAccountRepository:
             return None
         return self._to_domain(model)
 
+    def get_by_ids(self, account_ids: list[str]) -> dict[str, Account]:
+        models = self.db.query(AccountModel).filter(
+            AccountModel.id.in_([i for i in account_ids if is_valid_id(i)])
+        ).all()
+        return {m.id: self._to_domain(m) for m in models}
+
     def get_by_customer_id(self, customer_id: str) -> list[Account]:
+        if not is_valid_id(customer_id):
+            return []
         models = self.db.query(AccountModel).filter(
             AccountModel.customer_id == customer_id
         ).all()
         return [self._to_domain(m) for m in models]
 
     def update(self, account: Account) -> Account:
-        self.db.query(AccountModel).filter(
-            AccountModel.id == account.id
-        ).update({
-            AccountModel.balance: account.balance,
-            AccountModel.status: account.status,
-        })
-        self.db.commit()
+        # Compare-and-swap: solo escribe si nadie cambió la fila desde que
+        # se leyó `account`.
+        result = self.db.execute(
+            update(AccountModel).where(
+                AccountModel.id == account.id,
+                AccountModel.version == account.version,
+            ).values(
+                balance=account.balance.minor,
+                status=account.status,
+                version=AccountModel.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise ConcurrentUpdateError(f"Account {account.id} was modified concurrently")
+        account.version += 1
         return account
 
+    def debit(self, account_id: str, amount: Money) -> None:
+        # Delta atómico y condicional: saldo y estado se validan en la BD,
+        # sin leer-modificar-escribir desde Python.
+        result = self.db.execute(
+            update(AccountModel).where(
+                AccountModel.id == account_id,
+                AccountModel.status == AccountStatus.ACTIVE,
+                AccountModel.balance >= amount.minor,
+            ).values(
+                balance=AccountModel.balance - amount.minor,
+                version=AccountModel.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self._raise_rejected(account_id)
+
+    def credit(self, account_id: str, amount: Money) -> None:
+        result = self.db.execute(
+            update(AccountModel).where(
+                AccountModel.id == account_id,
+                AccountModel.status == AccountStatus.ACTIVE,
+            ).values(
+                balance=AccountModel.balance + amount.minor,
+                version=AccountModel.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self._raise_rejected(account_id)
+
+    def apply_deltas(self, deltas: dict[str, int]) -> None:
+        """
+        Aplica un delta neto por cuenta (en orden de id). Lo usan los lotes,
+        que validan contra una lectura previa: si otra transacción cambió la
+        cuenta desde entonces y el delta ya no es válido, ConcurrentUpdateError.
+        """
+        for account_id in sorted(deltas):
+            delta = deltas[account_id]
+            result = self.db.execute(
+                update(AccountModel).where(
+                    AccountModel.id == account_id,
+                    AccountModel.status == AccountStatus.ACTIVE,
+                    AccountModel.balance + delta >= 0,
+                ).values(
+                    balance=AccountModel.balance + delta,
+                    version=AccountModel.version + 1,
+                ).execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise ConcurrentUpdateError(
+                    f"Account {account_id} changed while the batch was being applied"
+                )
+
+    def _raise_rejected(self, account_id: str):
+        # El UPDATE condicional no afectó filas: se lee la cuenta solo para
+        # informar el motivo (populate_existing: la copia del identity map
+        # puede ser anterior al UPDATE).
+        model = self.db.get(AccountModel, account_id, populate_existing=True)
+        if model is None:
+            raise AccountNotFound(f"Account {account_id} not found")
+        if model.status == AccountStatus.FROZEN:
+            raise AccountFrozenError("Account is frozen")
+        if model.status == AccountStatus.CLOSED:
+            raise AccountClosedError("Account is closed")
+        raise InsufficientFundsError("Insufficient balance")
+
     def _to_domain(self, model: AccountModel) -> Account:
         return Account(
             id=model.id,
             customer_id=model.customer_id,
             currency=model.currency,
-            balance=float(model.balance),
+            balance=Money(model.balance, model.currency),
             status=AccountStatus(model.status),
+            version=model.version,
         )
 
 
 class SqlTransactionRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, archive: Optional[LedgerArchive] = None):
         self.db = db
+        # Historial de meses viejos fuera de la BD (app.repositories.archive).
+        self.archive = archive
 
     def save(self, transaction: Transaction) -> Transaction:
         model = TransactionModel(
             id=transaction.id,
             type=transaction.type,
-            amount=transaction.amount,
+            amount=transaction.amount.minor,
             currency=transaction.currency,
             status=transaction.status,
             created_at=transaction.created_at,
         )
         self.db.add(model)
-        self.db.commit()
-        self.db.refresh(model)
         return self._to_domain(model)
 
+    def save_all(self, transactions: list[Transaction]) -> None:
+        if not transactions:
+            return
+        self.db.execute(insert(TransactionModel), [
+            {
+                "id": t.id,
+                "type": t.type,
+                "amount": t.amount.minor,
+                "currency": t.currency,
+                "status": t.status,
+                "created_at": t.created_at,
+            }
+            for t in transactions
+        ])
+
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
+        if not is_valid_id(transaction_id):
+            return None
         model = self.db.query(TransactionModel).filter(
             TransactionModel.id == transaction_id
         ).first()
@@ -134,60 +251,177 @@ class SqlTransactionRepository:
         return self._to_domain(model)
 
     def get_by_account_id(self, account_id: str) -> list[Transaction]:
-        ledger_entries = self.db.query(LedgerEntryModel).filter(
-            LedgerEntryModel.account_id == account_id
-        ).all()
-        transaction_ids = list(
-            set(entry.transaction_id for entry in ledger_entries)
+        # Con archivo, la BD solo se consulta desde el fin del último mes
+        # archivado (y con particiones solo lee esas); lo anterior sale del
+        # archivo, que ya viene ordenado de más nueva a más vieja.
+        since = self.archive.archived_until() if self.archive is not None else None
+        query = self.db.query(TransactionModel).filter(
+            self._touches_account(account_id, since=since)
         )
-        if not transaction_ids:
-            return []
-        models = self.db.query(TransactionModel).filter(
-            TransactionModel.id.in_(transaction_ids)
-        ).order_by(TransactionModel.created_at.desc()).all()
+        if since is not None:
+            query = query.filter(TransactionModel.created_at >= since)
+        models = query.order_by(TransactionModel.created_at.desc()).all()
+        transactions = [self._to_domain(m) for m in models]
+        if since is not None:
+            transactions.extend(self.archive.transactions_for_account(account_id))
+        return transactions
+
+    def get_page_by_account_id(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        # Con archivo, todo lo anterior a archived_until() sale de ahí y la
+        # BD solo se consulta desde ese corte: la página se arma con la parte
+        # de la BD y, si no alcanza, sigue en el archivo (o al revés con after).
+        since = self.archive.archived_until() if self.archive is not None else None
+        if since is None:
+            return self._page(account_id, limit, before, after, tx_type, status)
+        if after is not None:
+            older = []
+            if after[0] < since:
+                older = self.archive.transactions_page(
+                    account_id, limit, after=after, tx_type=tx_type, status=status,
+                )
+            if len(older) == limit:
+                return older
+            newer = self._page(
+                account_id, limit - len(older), None, after, tx_type, status, since=since,
+            )
+            return newer + older
+        newer = []
+        if before is None or before[0] >= since:
+            newer = self._page(account_id, limit, before, None, tx_type, status, since=since)
+        if len(newer) == limit:
+            return newer
+        return newer + self.archive.transactions_page(
+            account_id, limit - len(newer), before=before, tx_type=tx_type, status=status,
+        )
+
+    def _page(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]],
+        after: Optional[tuple[datetime, str]],
+        tx_type: Optional[TransactionType],
+        status: Optional[TransactionStatus],
+        since: Optional[datetime] = None,
+    ) -> list[Transaction]:
+        # Keyset sobre el índice (account_id, created_at, transaction_id) del
+        # ledger: el costo no depende de qué tan profunda sea la página.
+        key = tuple_(LedgerEntryModel.created_at, LedgerEntryModel.transaction_id)
+        # Los límites toman el tipo de las columnas (el id se compara como uuid).
+        key_types = (LedgerEntryModel.created_at.type, LedgerEntryModel.transaction_id.type)
+        keys = select(LedgerEntryModel.created_at, LedgerEntryModel.transaction_id).join(
+            TransactionModel, _same_transaction()
+        ).where(LedgerEntryModel.account_id == account_id)
+        if tx_type is not None:
+            keys = keys.where(TransactionModel.type == tx_type)
+        if status is not None:
+            keys = keys.where(TransactionModel.status == status)
+        if since is not None:
+            keys = keys.where(
+                LedgerEntryModel.created_at >= since, TransactionModel.created_at >= since,
+            )
+
+        # Además de la tupla, cotas simples sobre created_at en ambas tablas:
+        # con eso PostgreSQL descarta las particiones fuera del rango.
+        if after is not None:
+            keys = keys.where(
+                key > tuple_(*after, types=key_types),
+                LedgerEntryModel.created_at >= after[0],
+                TransactionModel.created_at >= after[0],
+            )
+            order = (LedgerEntryModel.created_at.asc(), LedgerEntryModel.transaction_id.asc())
+        else:
+            if before is not None:
+                keys = keys.where(
+                    key < tuple_(*before, types=key_types),
+                    LedgerEntryModel.created_at <= before[0],
+                    TransactionModel.created_at <= before[0],
+                )
+            order = (LedgerEntryModel.created_at.desc(), LedgerEntryModel.transaction_id.desc())
+
+        # Una transferencia a la misma cuenta tiene dos entries de esa cuenta:
+        # DISTINCT sobre la clave (en el orden del índice) deja una por
+        # transacción antes del LIMIT, así la página no queda corta.
+        keys = keys.distinct().order_by(*order).limit(limit).subquery()
+        query = self.db.query(TransactionModel).join(keys, and_(
+            TransactionModel.id == keys.c.transaction_id,
+            TransactionModel.created_at == keys.c.created_at,
+        ))
+        if after is not None:
+            query = query.order_by(keys.c.created_at.asc(), keys.c.transaction_id.asc())
+        else:
+            query = query.order_by(keys.c.created_at.desc(), keys.c.transaction_id.desc())
+
+        models = query.all()
+        if after is not None:
+            models.reverse()
         return [self._to_domain(m) for m in models]
 
     def count_recent_by_account(self, account_id: str, minutes: int) -> int:
         cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-        ledger_entries = self.db.query(LedgerEntryModel).filter(
-            LedgerEntryModel.account_id == account_id
-        ).all()
-        transaction_ids = list(
-            set(entry.transaction_id for entry in ledger_entries)
-        )
-        if not transaction_ids:
-            return 0
-        count = self.db.query(TransactionModel).filter(
-            TransactionModel.id.in_(transaction_ids),
+        return self.db.query(func.count(TransactionModel.id)).filter(
+            self._touches_account(account_id, since=cutoff),
             TransactionModel.created_at >= cutoff,
             TransactionModel.status == TransactionStatus.APPROVED,
-        ).count()
-        return count
+        ).scalar()
 
-    def sum_daily_by_account(self, account_id: str) -> float:
+    def sum_daily_by_account(self, account_id: str) -> int:
         today_start = datetime.utcnow().replace(
             hour=0, minute=0, second=0, microsecond=0
         )
-        ledger_entries = self.db.query(LedgerEntryModel).filter(
-            LedgerEntryModel.account_id == account_id
-        ).all()
-        transaction_ids = list(
-            set(entry.transaction_id for entry in ledger_entries)
-        )
-        if not transaction_ids:
-            return 0.0
-        transactions = self.db.query(TransactionModel).filter(
-            TransactionModel.id.in_(transaction_ids),
+        total = self.db.query(func.sum(TransactionModel.amount)).filter(
+            self._touches_account(account_id, since=today_start),
             TransactionModel.created_at >= today_start,
             TransactionModel.status == TransactionStatus.APPROVED,
-        ).all()
-        return sum(t.amount for t in transactions)
+        ).scalar()
+        return int(total or 0)
+
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int
+    ) -> tuple[int, int]:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(minutes=minutes)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Una sola agregación: se recorre una vez el rango más amplio de los
+        # dos y cada total filtra su propia ventana con CASE.
+        recent, daily = self.db.query(
+            func.count(case((TransactionModel.created_at >= cutoff, 1))),
+            func.sum(case(
+                (TransactionModel.created_at >= today_start, TransactionModel.amount),
+                else_=0,
+            )),
+        ).filter(
+            self._touches_account(account_id, since=min(cutoff, today_start)),
+            TransactionModel.created_at >= min(cutoff, today_start),
+            TransactionModel.status == TransactionStatus.APPROVED,
+        ).one()
+        return int(recent), int(daily or 0)
+
+    def _touches_account(self, account_id: str, since: Optional[datetime] = None):
+        # Semi-join resuelto en la BD (IN con subconsulta): no trae el ledger
+        # a Python y no duplica transacciones con dos entries de la misma cuenta.
+        # `since` acota también el ledger (su created_at es el de la
+        # transacción), así la subconsulta solo lee las particiones recientes.
+        entries = select(LedgerEntryModel.transaction_id).where(
+            LedgerEntryModel.account_id == account_id
+        )
+        if since is not None:
+            entries = entries.where(LedgerEntryModel.created_at >= since)
+        return TransactionModel.id.in_(entries)
 
     def _to_domain(self, model: TransactionModel) -> Transaction:
         return Transaction(
             id=model.id,
             type=model.type,
-            amount=float(model.amount),
+            amount=Money(model.amount, model.currency),
             currency=model.currency,
             status=model.status,
             created_at=model.created_at,
@@ -195,8 +429,10 @@ class SqlTransactionRepository:
 
 
 class SqlLedgerRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, archive: Optional[LedgerArchive] = None):
         self.db = db
+        # Igual que en SqlTransactionRepository.
+        self.archive = archive
 
     def save(self, entry: LedgerEntry) -> LedgerEntry:
         model = LedgerEntryModel(
@@ -204,30 +440,337 @@ class SqlLedgerRepository:
             account_id=entry.account_id,
             transaction_id=entry.transaction_id,
             direction=entry.direction,
-            amount=entry.amount,
+            amount=entry.amount.minor,
+            created_at=entry.created_at,
         )
         self.db.add(model)
-        self.db.commit()
-        self.db.refresh(model)
-        return self._to_domain(model)
+        return self._to_domain(model, entry.amount.currency)
+
+    def save_all(self, entries: list[LedgerEntry]) -> None:
+        if not entries:
+            return
+        self.db.execute(insert(LedgerEntryModel), [
+            {
+                "id": e.id,
+                "account_id": e.account_id,
+                "transaction_id": e.transaction_id,
+                "direction": e.direction,
+                "amount": e.amount.minor,
+                "created_at": e.created_at,
+            }
+            for e in entries
+        ])
 
     def get_by_account_id(self, account_id: str) -> list[LedgerEntry]:
-        models = self.db.query(LedgerEntryModel).filter(
+        rows = self._with_currency().filter(
             LedgerEntryModel.account_id == account_id
         ).all()
-        return [self._to_domain(m) for m in models]
+        return [self._to_domain(m, currency) for m, currency in rows]
+
+    def iter_by_account_id(
+        self, account_id: str, batch_size: int = 1000
+    ) -> Iterator[tuple[LedgerEntry, Transaction]]:
+        # Cursor del lado del servidor (stream_results + yield_per): se leen
+        # lotes de `batch_size` filas, nunca el ledger completo en memoria.
+        # Con archivo, primero lo archivado y la BD desde archived_until().
+        since = self.archive.archived_until() if self.archive is not None else None
+        query = select(LedgerEntryModel, TransactionModel).join(
+            TransactionModel, _same_transaction()
+        ).where(
+            LedgerEntryModel.account_id == account_id
+        )
+        if since is not None:
+            yield from self.archive.entries_for_account(account_id)
+            query = query.where(
+                LedgerEntryModel.created_at >= since, TransactionModel.created_at >= since,
+            )
+        rows = self.db.execute(
+            query.order_by(
+                LedgerEntryModel.created_at, LedgerEntryModel.transaction_id
+            ).execution_options(yield_per=batch_size)
+        )
+        transactions = SqlTransactionRepository(self.db)
+        for entry, transaction in rows:
+            yield self._to_domain(entry, transaction.currency), transactions._to_domain(transaction)
 
     def get_by_transaction_id(self, transaction_id: str) -> list[LedgerEntry]:
-        models = self.db.query(LedgerEntryModel).filter(
+        rows = self._with_currency().filter(
             LedgerEntryModel.transaction_id == transaction_id
         ).all()
-        return [self._to_domain(m) for m in models]
+        return [self._to_domain(m, currency) for m, currency in rows]
 
-    def _to_domain(self, model: LedgerEntryModel) -> LedgerEntry:
+    def _with_currency(self):
+        # La moneda de una entry es la de su transacción (el ledger no la repite).
+        return self.db.query(LedgerEntryModel, TransactionModel.currency).join(
+            TransactionModel, _same_transaction()
+        )
+
+    def _to_domain(self, model: LedgerEntryModel, currency: str) -> LedgerEntry:
         return LedgerEntry(
             id=model.id,
             account_id=model.account_id,
             transaction_id=model.transaction_id,
             direction=Direction(model.direction),
-            amount=float(model.amount),
-        )
\ No newline at end of file
+            amount=Money(model.amount, currency),
+            created_at=model.created_at,
+        )
+
+
+class SqlRiskCounterRepository:
+    """
+    Contadores de riesgo materializados por cuenta (account_risk_counters).
+    Leerlos es una búsqueda por PK; record() se llama en el mismo unit of work
+    que la transacción aprobada.
+    """
+
+    def __init__(self, db: Session, window_minutes: int = 10):
+        self.db = db
+        self.window_minutes = window_minutes
+
+    def create_for_account(self, account_id: str) -> None:
+        self.db.add(AccountRiskCounterModel(
+            account_id=account_id,
+            day=datetime.utcnow().date(),
+            daily_total=0,
+            recent_buckets=[],
+        ))
+
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int, now: Optional[datetime] = None
+    ) -> tuple[int, int]:
+        return self.risk_totals_for_accounts([account_id], minutes, now)[account_id]
+
+    def risk_totals_for_accounts(
+        self, account_ids: list[str], minutes: int, now: Optional[datetime] = None
+    ) -> dict[str, tuple[int, int]]:
+        now = now or datetime.utcnow()
+        models = {}
+        if minutes <= self.window_minutes:
+            models = self._load(account_ids)
+        totals = {}
+        for account_id in account_ids:
+            model = models.get(account_id)
+            if model is None:
+                # Ventana más larga que la materializada, o cuenta sin
+                # contadores todavía: se calcula desde el historial.
+                totals[account_id] = SqlTransactionRepository(
+                    self.db
+                ).risk_totals_by_account(account_id, minutes)
+                continue
+            cutoff = _epoch_second(now - timedelta(minutes=minutes))
+            recent = sum(
+                count for second, count in model.recent_buckets if second >= cutoff
+            )
+            daily_total = model.daily_total if model.day == now.date() else 0
+            totals[account_id] = (recent, daily_total)
+        return totals
+
+    def record(self, account_id: str, amount: int, at: datetime) -> None:
+        self.record_many([(account_id, amount, at)])
+
+    def record_many(self, records: list[tuple[str, int, datetime]]) -> None:
+        """
+        Suma varias transacciones aprobadas (account_id, monto en unidades
+        menores, fecha).
+        Bloquea los contadores en una sola consulta, ordenados por account_id
+        para que operaciones concurrentes los tomen siempre en el mismo orden.
+        """
+        if not records:
+            return
+        account_ids = sorted({account_id for account_id, _, _ in records})
+        models = self._load(account_ids, for_update=True)
+        missing = [account_id for account_id in account_ids if account_id not in models]
+        if missing:
+            built = self._build_from_ledger(missing, max(at for _, _, at in records))
+            self.db.add_all(built.values())
+            models.update(built)
+        for account_id, amount, at in records:
+            self._apply(models[account_id], amount, at)
+
+    def _apply(self, model: AccountRiskCounterModel, amount: int, at: datetime):
+        # Solo un día posterior reinicia el total (o cualquier día, si el
+        # contador todavía está vacío). Un commit con fecha del día anterior
+        # que llega tarde (cerca de medianoche) no toca el total del día
+        # nuevo: ese monto ya no cuenta para el límite diario.
+        empty = model.daily_total == 0 and not model.recent_buckets
+        if at.date() > model.day or (empty and at.date() != model.day):
+            model.day = at.date()
+            model.daily_total = 0
+        if at.date() == model.day:
+            model.daily_total += amount
+
+        # La ventana se poda desde el evento más nuevo, no desde uno atrasado.
+        newest = max([_epoch_second(at)] + [s for s, _ in model.recent_buckets])
+        cutoff = newest - self.window_minutes * 60
+        buckets = {
+            second: count
+            for second, count in model.recent_buckets if second >= cutoff
+        }
+        second = _epoch_second(at)
+        if second >= cutoff:
+            buckets[second] = buckets.get(second, 0) + 1
+        # Se asigna una lista nueva para que SQLAlchemy detecte el cambio en JSON.
+        model.recent_buckets = [[s, c] for s, c in sorted(buckets.items())]
+
+    def _load(
+        self, account_ids: list[str], for_update: bool = False
+    ) -> dict[str, AccountRiskCounterModel]:
+        # Sin autoflush las filas agregadas en este mismo unit of work (cuenta
+        # recién creada, varias operaciones antes del commit) no están en la
+        # BD todavía: se toman de session.new.
+        models = {
+            model.account_id: model
+            for model in self.db.new
+            if isinstance(model, AccountRiskCounterModel)
+            and model.account_id in account_ids
+        }
+        pending = [account_id for account_id in account_ids if account_id not in models]
+        if pending:
+            query = self.db.query(AccountRiskCounterModel).filter(
+                AccountRiskCounterModel.account_id.in_(pending)
+            )
+            if for_update:
+                query = query.order_by(
+                    AccountRiskCounterModel.account_id
+                ).with_for_update().populate_existing()
+            models.update((model.account_id, model) for model in query)
+        return models
+
+    def rebuild(
+        self, account_id: Optional[str] = None, now: Optional[datetime] = None
+    ) -> int:
+        """
+        Recalcula los contadores desde el ledger (una cuenta o todas) y
+        retorna cuántas filas escribió. El commit lo hace quien llama.
+        """
+        now = now or datetime.utcnow()
+        accounts = self.db.query(AccountModel.id)
+        counters = self.db.query(AccountRiskCounterModel)
+        if account_id is not None:
+            accounts = accounts.filter(AccountModel.id == account_id)
+            counters = counters.filter(
+                AccountRiskCounterModel.account_id == account_id
+            )
+        account_ids = [row.id for row in accounts]
+        counters.delete(synchronize_session=False)
+        # Se descartan del identity map los contadores que el DELETE quitó.
+        for model in list(self.db.identity_map.values()):
+            if isinstance(model, AccountRiskCounterModel):
+                self.db.expunge(model)
+
+        models = self._build_from_ledger(account_ids, now)
+        self.db.add_all(models.values())
+        return len(models)
+
+    def _build_from_ledger(
+        self, account_ids: list[str], now: datetime
+    ) -> dict[str, AccountRiskCounterModel]:
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = now - timedelta(minutes=self.window_minutes)
+        models = {
+            account_id: AccountRiskCounterModel(
+                account_id=account_id,
+                day=now.date(),
+                daily_total=0,
+                recent_buckets=[],
+            )
+            for account_id in account_ids
+        }
+        if not account_ids:
+            return models
+
+        # Solo se leen las transacciones de hoy / de la ventana, no todo el
+        # historial. DISTINCT evita contar dos veces una transferencia a la
+        # misma cuenta (dos entries de la misma cuenta y transacción).
+        rows = self.db.query(
+            LedgerEntryModel.account_id,
+            TransactionModel.id,
+            TransactionModel.created_at,
+            TransactionModel.amount,
+        ).join(
+            TransactionModel, _same_transaction()
+        ).filter(
+            LedgerEntryModel.account_id.in_(account_ids),
+            TransactionModel.status == TransactionStatus.APPROVED,
+            TransactionModel.created_at >= min(today_start, cutoff),
+            LedgerEntryModel.created_at >= min(today_start, cutoff),
+        ).distinct()
+
+        buckets: dict[str, dict[int, int]] = {}
+        for row in rows:
+            model = models[row.account_id]
+            if row.created_at >= today_start:
+                model.daily_total += row.amount
+            if row.created_at >= cutoff:
+                second = _epoch_second(row.created_at)
+                account_buckets = buckets.setdefault(row.account_id, {})
+                account_buckets[second] = account_buckets.get(second, 0) + 1
+        for account_id, account_buckets in buckets.items():
+            models[account_id].recent_buckets = [
+                [s, c] for s, c in sorted(account_buckets.items())
+            ]
+        return models
+
+
+class SqlIdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        model = self.db.get(IdempotencyKeyModel, key, populate_existing=True)
+        if model is None:
+            return None
+        return IdempotencyRecord(
+            key=model.key,
+            request_hash=model.request_hash,
+            expires_at=model.expires_at,
+            status_code=model.status_code,
+            response_body=model.response_body,
+        )
+
+    def add(self, record: IdempotencyRecord) -> None:
+        self.db.add(IdempotencyKeyModel(
+            key=record.key,
+            request_hash=record.request_hash,
+            expires_at=record.expires_at,
+            status_code=record.status_code,
+            response_body=record.response_body,
+        ))
+
+    def complete(
+        self, key: str, status_code: int, response_body: Any, expires_at: datetime
+    ) -> None:
+        self.db.execute(
+            update(IdempotencyKeyModel).where(
+                IdempotencyKeyModel.key == key
+            ).values(
+                status_code=status_code, response_body=response_body, expires_at=expires_at,
+            ).execution_options(synchronize_session=False)
+        )
+
+    def delete(self, key: str) -> None:
+        self.db.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.key == key)
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_expired(self, now: datetime) -> int:
+        result = self.db.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+def _same_transaction():
+    # Join del ledger con su transacción por la FK completa (id, created_at):
+    # con tablas particionadas se emparejan las particiones del mismo mes.
+    return and_(
+        TransactionModel.id == LedgerEntryModel.transaction_id,
+        TransactionModel.created_at == LedgerEntryModel.created_at,
+    )
+
+
+def _epoch_second(moment: datetime) -> int:
+    # Las fechas se guardan como UTC naive (datetime.utcnow).
+    return calendar.timegm(moment.timetuple())
@@ -1,8 +1,12 @@
-from typing import Protocol, Optional
+from datetime import datetime
+from typing import Any, Callable, Iterator, Protocol, Optional
 from app.domain.entities.customer import Customer
 from app.domain.entities.account import Account
 from app.domain.entities.transaction import Transaction
 from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.idempotency_record import IdempotencyRecord
+from app.domain.enums import TransactionStatus, TransactionType
+from app.domain.money import Money
 
 
 class CustomerRepository(Protocol):
@@ -32,12 +36,40 @@ class AccountRepository(Protocol):
         """Busca una cuenta por su ID. Retorna None si no existe."""
         ...
 
+    def get_by_ids(self, account_ids: list[str]) -> dict[str, Account]:
+        """Busca varias cuentas en una consulta. Las inexistentes no aparecen."""
+        ...
+
     def get_by_customer_id(self, customer_id: str) -> list[Account]:
         """Retorna todas las cuentas de un customer."""
         ...
 
     def update(self, account: Account) -> Account:
-        """Actualiza una cuenta existente (ej: balance, status)."""
+        """
+        Actualiza una cuenta existente (ej: balance, status) solo si su
+        versión sigue siendo la leída; si no, ConcurrentUpdateError.
+        Incrementa `account.version`.
+        """
+        ...
+
+    def debit(self, account_id: str, amount: Money) -> None:
+        """
+        Resta `amount` del saldo de forma atómica, solo si la cuenta está
+        ACTIVE y tiene saldo suficiente. Si no, lanza el error de dominio
+        correspondiente (AccountNotFound, AccountFrozenError, ...).
+        """
+        ...
+
+    def credit(self, account_id: str, amount: Money) -> None:
+        """Suma `amount` al saldo de forma atómica si la cuenta está ACTIVE."""
+        ...
+
+    def apply_deltas(self, deltas: dict[str, int]) -> None:
+        """
+        Aplica un delta neto por cuenta (en unidades menores de su moneda)
+        sin dejar saldos negativos. Lanza
+        ConcurrentUpdateError si alguna cuenta ya no admite su delta.
+        """
         ...
 
 
@@ -48,6 +80,10 @@ class TransactionRepository(Protocol):
         """Guarda una transacción."""
         ...
 
+    def save_all(self, transactions: list[Transaction]) -> None:
+        """Guarda varias transacciones con un insert masivo."""
+        ...
+
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
         """Busca una transacción por su ID."""
         ...
@@ -59,6 +95,22 @@ class TransactionRepository(Protocol):
         """
         ...
 
+    def get_page_by_account_id(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        """
+        Página del historial de una cuenta, de la más reciente a la más
+        antigua. before/after son claves (created_at, id): retorna las
+        transacciones anteriores o posteriores a esa clave.
+        """
+        ...
+
     def count_recent_by_account(
         self, account_id: str, minutes: int
     ) -> int:
@@ -68,13 +120,23 @@ class TransactionRepository(Protocol):
         """
         ...
 
-    def sum_daily_by_account(self, account_id: str) -> float:
+    def sum_daily_by_account(self, account_id: str) -> int:
         """
-        Suma el monto de transacciones de hoy para una cuenta.
+        Suma el monto de transacciones de hoy para una cuenta, en unidades
+        menores.
         Útil para DailyLimitRule (regla antifraude).
         """
         ...
 
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int
+    ) -> tuple[int, int]:
+        """
+        Retorna (transacciones en los últimos N minutos, monto de hoy en
+        unidades menores) en una sola consulta. Es el contexto de VelocityRule y DailyLimitRule.
+        """
+        ...
+
 
 class LedgerRepository(Protocol):
     """Contrato para persistencia de LedgerEntry."""
@@ -83,12 +145,174 @@ class LedgerRepository(Protocol):
         """Guarda una entrada de ledger."""
         ...
 
+    def save_all(self, entries: list[LedgerEntry]) -> None:
+        """Guarda varias entradas de ledger con un insert masivo."""
+        ...
+
     def get_by_account_id(self, account_id: str) -> list[LedgerEntry]:
         """Retorna todas las entradas de ledger de una cuenta."""
         ...
 
+    def iter_by_account_id(
+        self, account_id: str, batch_size: int = 1000
+    ) -> Iterator[tuple[LedgerEntry, Transaction]]:
+        """
+        Recorre el ledger de una cuenta (con su transacción) en orden
+        cronológico, por lotes, sin materializarlo completo.
+        """
+        ...
+
     def get_by_transaction_id(
         self, transaction_id: str
     ) -> list[LedgerEntry]:
         """Retorna las entradas de ledger de una transacción."""
-        ...
\ No newline at end of file
+        ...
+
+class RiskCounterRepository(Protocol):
+    """
+    Contrato para los contadores de riesgo materializados por cuenta
+    (transacciones de los últimos minutos y monto del día).
+    """
+
+    def create_for_account(self, account_id: str) -> None:
+        """Crea los contadores en cero para una cuenta nueva."""
+        ...
+
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int
+    ) -> tuple[int, int]:
+        """
+        Igual que TransactionRepository.risk_totals_by_account pero leyendo
+        los contadores en O(1) en lugar del historial.
+        """
+        ...
+
+    def record(self, account_id: str, amount: int, at: datetime) -> None:
+        """Suma una transacción aprobada a los contadores de la cuenta."""
+        ...
+
+    def record_many(self, records: list[tuple[str, int, datetime]]) -> None:
+        """
+        Suma varias transacciones aprobadas: (account_id, monto en unidades
+        menores, fecha).
+        """
+        ...
+
+    def risk_totals_for_accounts(
+        self, account_ids: list[str], minutes: int
+    ) -> dict[str, tuple[int, int]]:
+        """risk_totals_by_account para varias cuentas en una consulta."""
+        ...
+
+    def rebuild(self, account_id: Optional[str] = None) -> int:
+        """Recalcula los contadores desde el ledger. Retorna las filas escritas."""
+        ...
+
+
+class IdempotencyRepository(Protocol):
+    """
+    Contrato para las claves de idempotencia y la respuesta guardada de la
+    primera petición que usó cada una.
+    """
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        ...
+
+    def add(self, record: IdempotencyRecord) -> None:
+        """Reserva la clave; el commit falla si otra petición ya la reservó."""
+        ...
+
+    def complete(
+        self, key: str, status_code: int, response_body: Any, expires_at: datetime
+    ) -> None:
+        """Guarda la respuesta de la petición original y su vencimiento."""
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def delete_expired(self, now: datetime) -> int:
+        """Borra las claves vencidas. Retorna cuántas se borraron."""
+        ...
+
+
+class UnitOfWork(Protocol):
+    """
+    Contrato para confirmar en un único commit todo lo que una operación
+    escribe a través de los repositorios.
+    """
+
+    customers: CustomerRepository
+    accounts: AccountRepository
+    transactions: TransactionRepository
+    ledger: LedgerRepository
+    risk_counters: RiskCounterRepository
+    idempotency: IdempotencyRepository
+
+    def __enter__(self) -> "UnitOfWork":
+        ...
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Descarta los cambios pendientes si hubo una excepción."""
+        ...
+
+    def commit(self) -> None:
+        """Confirma todos los cambios pendientes."""
+        ...
+
+    def rollback(self) -> None:
+        """Descarta todos los cambios pendientes."""
+        ...
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Registra `callback` para después del próximo commit exitoso. Un
+        rollback descarta los registrados.
+        """
+        ...
+
+
+class CacheBackend(Protocol):
+    """
+    Contrato de un cache clave → dict serializable con TTL. Los valores
+    pueden desaparecer en cualquier momento (TTL, capacidad, otro proceso).
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        ...
+
+    def set(self, key: str, value: dict) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class LedgerArchive(Protocol):
+    """
+    Historial archivado fuera de la BD. Cubre todo lo anterior a
+    archived_until(); la BD responde desde ahí en adelante.
+    """
+
+    def archived_until(self) -> Optional[datetime]:
+        ...
+
+    def transactions_for_account(self, account_id: str) -> list[Transaction]:
+        """Transacciones archivadas de la cuenta, de la más nueva a la más vieja."""
+        ...
+
+    def transactions_page(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        """Como TransactionRepository.get_page_by_account_id, sobre lo archivado."""
+        ...
+
+    def entries_for_account(self, account_id: str) -> Iterator[tuple[LedgerEntry, Transaction]]:
+        """Entries archivadas de la cuenta con su transacción, en orden cronológico."""
+        ...
@@ -0,0 +1,467 @@
+"""
+Backend de repositorios en memoria (REPOSITORY_BACKEND=memory).
+
+Cumple los mismos Protocols que los repositorios SQL sobre diccionarios,
+con índices secundarios por cuenta y fecha, para correr la API y los
+benchmarks de BankingFacade sin I/O. Los datos viven en un InMemoryStore
+compartido por los unit of work; se pierden al terminar el proceso.
+
+Concurrencia: un unit of work toma el lock del store desde __enter__ hasta
+__exit__, así que las operaciones se serializan como transacciones. Cada
+escritura registra cómo deshacerse y rollback() aplica ese log al revés.
+"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Optional
+
+from app.domain.entities.account import Account
+from app.domain.entities.customer import Customer
+from app.domain.entities.idempotency_record import IdempotencyRecord
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
+from app.domain.exceptions import (
+    AccountClosedError,
+    AccountFrozenError,
+    AccountNotFound,
+    ConcurrentUpdateError,
+    InsufficientFundsError,
+)
+from app.domain.money import Money
+
+# Clave de orden del historial: la misma que el índice
+# (account_id, created_at, transaction_id) del ledger en SQL.
+HistoryKey = tuple[datetime, str]
+
+
+class InMemoryStore:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.customers: dict[str, Customer] = {}
+        self.customer_ids_by_email: dict[str, str] = {}
+        self.accounts: dict[str, Account] = {}
+        self.account_ids_by_customer: dict[str, list[str]] = {}
+        self.transactions: dict[str, Transaction] = {}
+        self.ledger: dict[str, LedgerEntry] = {}
+        self.entry_ids_by_transaction: dict[str, list[str]] = {}
+        # Por cuenta, claves (created_at, transaction_id) ordenadas; una por entry.
+        self.history_by_account: dict[str, list[HistoryKey]] = {}
+        self.idempotency: dict[str, IdempotencyRecord] = {}
+
+    def history(
+        self, account_id: str, since: Optional[datetime] = None
+    ) -> list[HistoryKey]:
+        keys = self.history_by_account.get(account_id, [])
+        if since is not None:
+            keys = keys[bisect_left(keys, (since, "")):]
+        return keys
+
+    def risk_totals(
+        self, account_id: str, minutes: int, now: Optional[datetime] = None
+    ) -> tuple[int, int]:
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(minutes=minutes)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        recent, daily = 0, 0
+        seen = set()
+        for created_at, transaction_id in self.history(account_id, min(cutoff, today_start)):
+            transaction = self.transactions[transaction_id]
+            if transaction_id in seen or transaction.status != TransactionStatus.APPROVED:
+                continue
+            seen.add(transaction_id)
+            if created_at >= cutoff:
+                recent += 1
+            if created_at >= today_start:
+                daily += transaction.amount.minor
+        return recent, daily
+
+
+class _InMemoryRepository:
+    def __init__(self, store: InMemoryStore, undo: list[Callable[[], None]]):
+        self.store = store
+        # Log compartido con el unit of work: cómo deshacer cada escritura.
+        self._undo = undo
+
+
+class InMemoryCustomerRepository(_InMemoryRepository):
+    def save(self, customer: Customer) -> Customer:
+        with self.store.lock:
+            owner = self.store.customer_ids_by_email.get(customer.email)
+            if owner is not None and owner != customer.id:
+                raise ValueError(f"Email {customer.email} is already registered")
+            previous = self.store.customers.get(customer.id)
+            self.store.customers[customer.id] = replace(customer)
+            self.store.customer_ids_by_email[customer.email] = customer.id
+            self._undo.append(lambda: self._restore(customer, previous))
+        return customer
+
+    def _restore(self, customer: Customer, previous: Optional[Customer]):
+        del self.store.customer_ids_by_email[customer.email]
+        if previous is None:
+            del self.store.customers[customer.id]
+        else:
+            self.store.customers[customer.id] = previous
+            self.store.customer_ids_by_email[previous.email] = previous.id
+
+    def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        with self.store.lock:
+            customer = self.store.customers.get(customer_id)
+            return replace(customer) if customer else None
+
+    def get_by_email(self, email: str) -> Optional[Customer]:
+        with self.store.lock:
+            customer_id = self.store.customer_ids_by_email.get(email)
+            return self.get_by_id(customer_id) if customer_id else None
+
+
+class InMemoryAccountRepository(_InMemoryRepository):
+    def save(self, account: Account) -> Account:
+        with self.store.lock:
+            self.store.accounts[account.id] = replace(account)
+            owned = self.store.account_ids_by_customer.setdefault(account.customer_id, [])
+            owned.append(account.id)
+
+            def undo():
+                del self.store.accounts[account.id]
+                owned.remove(account.id)
+            self._undo.append(undo)
+        return account
+
+    def get_by_id(self, account_id: str) -> Optional[Account]:
+        with self.store.lock:
+            account = self.store.accounts.get(account_id)
+            return replace(account) if account else None
+
+    def get_by_ids(self, account_ids: list[str]) -> dict[str, Account]:
+        with self.store.lock:
+            return {
+                account_id: replace(self.store.accounts[account_id])
+                for account_id in account_ids if account_id in self.store.accounts
+            }
+
+    def get_by_customer_id(self, customer_id: str) -> list[Account]:
+        with self.store.lock:
+            return [
+                replace(self.store.accounts[account_id])
+                for account_id in self.store.account_ids_by_customer.get(customer_id, [])
+            ]
+
+    def update(self, account: Account) -> Account:
+        with self.store.lock:
+            current = self.store.accounts.get(account.id)
+            if current is None or current.version != account.version:
+                raise ConcurrentUpdateError(f"Account {account.id} was modified concurrently")
+            self._write(current, balance=account.balance, status=account.status)
+        account.version += 1
+        return account
+
+    def debit(self, account_id: str, amount: Money) -> None:
+        with self.store.lock:
+            current = self._active(account_id)
+            if current.balance < amount:
+                raise InsufficientFundsError("Insufficient balance")
+            self._write(current, balance=current.balance - amount)
+
+    def credit(self, account_id: str, amount: Money) -> None:
+        with self.store.lock:
+            current = self._active(account_id)
+            self._write(current, balance=current.balance + amount)
+
+    def apply_deltas(self, deltas: dict[str, int]) -> None:
+        with self.store.lock:
+            for account_id in sorted(deltas):
+                current = self.store.accounts.get(account_id)
+                delta = deltas[account_id]
+                if (
+                    current is None
+                    or current.status != AccountStatus.ACTIVE
+                    or current.balance.minor + delta < 0
+                ):
+                    raise ConcurrentUpdateError(
+                        f"Account {account_id} changed while the batch was being applied"
+                    )
+                self._write(current, balance=Money(current.balance.minor + delta, current.currency))
+
+    def _active(self, account_id: str) -> Account:
+        current = self.store.accounts.get(account_id)
+        if current is None:
+            raise AccountNotFound(f"Account {account_id} not found")
+        if current.status == AccountStatus.FROZEN:
+            raise AccountFrozenError("Account is frozen")
+        if current.status == AccountStatus.CLOSED:
+            raise AccountClosedError("Account is closed")
+        return current
+
+    def _write(self, current: Account, **changes):
+        # Se reemplaza la instancia guardada; la anterior queda como undo.
+        self.store.accounts[current.id] = replace(current, version=current.version + 1, **changes)
+        self._undo.append(lambda: self.store.accounts.__setitem__(current.id, current))
+
+
+class InMemoryTransactionRepository(_InMemoryRepository):
+    def save(self, transaction: Transaction) -> Transaction:
+        self.save_all([transaction])
+        return transaction
+
+    def save_all(self, transactions: list[Transaction]) -> None:
+        with self.store.lock:
+            for transaction in transactions:
+                self.store.transactions[transaction.id] = replace(transaction)
+                self._undo.append(
+                    lambda transaction_id=transaction.id: self.store.transactions.pop(transaction_id)
+                )
+
+    def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
+        with self.store.lock:
+            transaction = self.store.transactions.get(transaction_id)
+            return replace(transaction) if transaction else None
+
+    def get_by_account_id(self, account_id: str) -> list[Transaction]:
+        with self.store.lock:
+            return self._distinct(reversed(self.store.history(account_id)))
+
+    def get_page_by_account_id(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        tx_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+    ) -> list[Transaction]:
+        with self.store.lock:
+            keys = self.store.history(account_id)
+            if after is not None:
+                candidates = keys[bisect_right(keys, tuple(after)):]
+            else:
+                end = bisect_left(keys, tuple(before)) if before is not None else len(keys)
+                candidates = reversed(keys[:end])
+            page = []
+            for transaction in self._distinct(candidates):
+                if tx_type is not None and transaction.type != tx_type:
+                    continue
+                if status is not None and transaction.status != status:
+                    continue
+                page.append(transaction)
+                if len(page) == limit:
+                    break
+            if after is not None:
+                page.reverse()
+            return page
+
+    def count_recent_by_account(self, account_id: str, minutes: int) -> int:
+        with self.store.lock:
+            cutoff = datetime.utcnow() - timedelta(minutes=minutes)
+            return sum(
+                1 for t in self._distinct(self.store.history(account_id, cutoff))
+                if t.status == TransactionStatus.APPROVED
+            )
+
+    def sum_daily_by_account(self, account_id: str) -> int:
+        with self.store.lock:
+            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            return int(sum(
+                t.amount.minor for t in self._distinct(self.store.history(account_id, today_start))
+                if t.status == TransactionStatus.APPROVED
+            ))
+
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int
+    ) -> tuple[int, int]:
+        with self.store.lock:
+            return self.store.risk_totals(account_id, minutes)
+
+    def _distinct(self, keys) -> list[Transaction]:
+        # Una transferencia a la misma cuenta deja dos entries con la misma clave.
+        transactions, seen = [], set()
+        for _, transaction_id in keys:
+            if transaction_id not in seen:
+                seen.add(transaction_id)
+                transactions.append(replace(self.store.transactions[transaction_id]))
+        return transactions
+
+
+class InMemoryLedgerRepository(_InMemoryRepository):
+    def save(self, entry: LedgerEntry) -> LedgerEntry:
+        self.save_all([entry])
+        return entry
+
+    def save_all(self, entries: list[LedgerEntry]) -> None:
+        with self.store.lock:
+            for entry in entries:
+                self._insert(replace(entry))
+
+    def _insert(self, entry: LedgerEntry):
+        key = (entry.created_at, entry.transaction_id)
+        self.store.ledger[entry.id] = entry
+        by_transaction = self.store.entry_ids_by_transaction.setdefault(entry.transaction_id, [])
+        by_transaction.append(entry.id)
+        history = self.store.history_by_account.setdefault(entry.account_id, [])
+        insort(history, key)
+
+        def undo():
+            del self.store.ledger[entry.id]
+            by_transaction.remove(entry.id)
+            del history[bisect_left(history, key)]
+        self._undo.append(undo)
+
+    def get_by_account_id(self, account_id: str) -> list[LedgerEntry]:
+        with self.store.lock:
+            return [entry for entry, _ in self._entries(account_id)]
+
+    def iter_by_account_id(
+        self, account_id: str, batch_size: int = 1000
+    ) -> Iterator[tuple[LedgerEntry, Transaction]]:
+        # Se copia el historial bajo el lock y se entrega fuera de él.
+        with self.store.lock:
+            rows = self._entries(account_id)
+        yield from rows
+
+    def get_by_transaction_id(self, transaction_id: str) -> list[LedgerEntry]:
+        with self.store.lock:
+            return [
+                replace(self.store.ledger[entry_id])
+                for entry_id in self.store.entry_ids_by_transaction.get(transaction_id, [])
+            ]
+
+    def _entries(self, account_id: str) -> list[tuple[LedgerEntry, Transaction]]:
+        rows, seen = [], set()
+        for _, transaction_id in self.store.history(account_id):
+            if transaction_id in seen:
+                continue
+            seen.add(transaction_id)
+            transaction = replace(self.store.transactions[transaction_id])
+            for entry_id in self.store.entry_ids_by_transaction[transaction_id]:
+                entry = self.store.ledger[entry_id]
+                if entry.account_id == account_id:
+                    rows.append((replace(entry), transaction))
+        return rows
+
+
+class InMemoryRiskCounterRepository(_InMemoryRepository):
+    """
+    En memoria el historial por cuenta ya está ordenado por fecha, así que
+    los totales se calculan recorriendo solo la ventana y no hace falta
+    materializar contadores: record() y create_for_account() no hacen nada.
+    """
+
+    def create_for_account(self, account_id: str) -> None:
+        pass
+
+    def risk_totals_by_account(
+        self, account_id: str, minutes: int, now: Optional[datetime] = None
+    ) -> tuple[int, int]:
+        with self.store.lock:
+            return self.store.risk_totals(account_id, minutes, now)
+
+    def record(self, account_id: str, amount: int, at: datetime) -> None:
+        pass
+
+    def record_many(self, records: list[tuple[str, int, datetime]]) -> None:
+        pass
+
+    def risk_totals_for_accounts(
+        self, account_ids: list[str], minutes: int, now: Optional[datetime] = None
+    ) -> dict[str, tuple[int, int]]:
+        with self.store.lock:
+            return {
+                account_id: self.store.risk_totals(account_id, minutes, now)
+                for account_id in account_ids
+            }
+
+    def rebuild(self, account_id: Optional[str] = None) -> int:
+        with self.store.lock:
+            if account_id is not None:
+                return int(account_id in self.store.accounts)
+            return len(self.store.accounts)
+
+
+class InMemoryIdempotencyRepository(_InMemoryRepository):
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        with self.store.lock:
+            record = self.store.idempotency.get(key)
+            return replace(record) if record else None
+
+    def add(self, record: IdempotencyRecord) -> None:
+        with self.store.lock:
+            if record.key in self.store.idempotency:
+                raise ValueError(f"Idempotency key {record.key} already exists")
+            self._set(record.key, replace(record))
+
+    def complete(
+        self, key: str, status_code: int, response_body: Any, expires_at: datetime
+    ) -> None:
+        with self.store.lock:
+            record = self.store.idempotency.get(key)
+            if record is not None:
+                self._set(key, replace(
+                    record, status_code=status_code, response_body=response_body,
+                    expires_at=expires_at,
+                ))
+
+    def delete(self, key: str) -> None:
+        with self.store.lock:
+            if key in self.store.idempotency:
+                self._set(key, None)
+
+    def delete_expired(self, now: datetime) -> int:
+        with self.store.lock:
+            expired = [k for k, r in self.store.idempotency.items() if r.expires_at <= now]
+            for key in expired:
+                self._set(key, None)
+            return len(expired)
+
+    def _set(self, key: str, record: Optional[IdempotencyRecord]):
+        previous = self.store.idempotency.get(key)
+        if record is None:
+            del self.store.idempotency[key]
+        else:
+            self.store.idempotency[key] = record
+
+        def undo():
+            if previous is None:
+                self.store.idempotency.pop(key, None)
+            else:
+                self.store.idempotency[key] = previous
+        self._undo.append(undo)
+
+
+class InMemoryUnitOfWork:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+        self._undo: list[Callable[[], None]] = []
+        self.customers = InMemoryCustomerRepository(store, self._undo)
+        self.accounts = InMemoryAccountRepository(store, self._undo)
+        self.transactions = InMemoryTransactionRepository(store, self._undo)
+        self.ledger = InMemoryLedgerRepository(store, self._undo)
+        self.risk_counters = InMemoryRiskCounterRepository(store, self._undo)
+        self.idempotency = InMemoryIdempotencyRepository(store, self._undo)
+        self._after_commit: list[Callable[[], None]] = []
+
+    def __enter__(self) -> "InMemoryUnitOfWork":
+        self.store.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is not None:
+                self.rollback()
+        finally:
+            self.store.lock.release()
+
+    def commit(self):
+        self._undo.clear()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self._after_commit.clear()
+        with self.store.lock:
+            while self._undo:
+                self._undo.pop()()
+
+    def on_commit(self, callback: Callable[[], None]):
+        self._after_commit.append(callback)
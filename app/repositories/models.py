@@ -2,11 +2,18 @@ from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
-    Float,
+    BigInteger,
+    Integer,
+    Date,
     DateTime,
     ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    JSON,
+    Uuid,
     Enum as SqlEnum,
 )
+from sqlalchemy.orm import relationship
 from app.repositories.database import Base
 from app.domain.enums import (
     AccountStatus,
@@ -15,12 +22,20 @@ from app.domain.enums import (
     Direction,
 )
 
+# Los ids son UUIDv7 (app.domain.ids): columna uuid nativa en PostgreSQL
+# (16 bytes) y CHAR(32) en SQLite; en Python siguen siendo str.
+ID = Uuid(as_uuid=False)
+
+# Montos en unidades menores de la moneda (app.domain.money): enteros exactos.
+MONEY = BigInteger
+
+
 #Tabla: customers
 class CustomerModel(Base):
 
     __tablename__ = "customers"
 
-    id = Column(String, primary_key=True)
+    id = Column(ID, primary_key=True)
     name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     status = Column(String, nullable=False, default="ACTIVE")
@@ -28,40 +43,120 @@ class CustomerModel(Base):
 #Tabla: accounts
 class AccountModel(Base):
     __tablename__ = "accounts"
+    __table_args__ = (
+        Index("ix_accounts_customer_id", "customer_id"),
+    )
 
-    id = Column(String, primary_key=True)
-    customer_id = Column(String, ForeignKey("customers.id"), nullable=False)
+    id = Column(ID, primary_key=True)
+    customer_id = Column(ID, ForeignKey("customers.id"), nullable=False)
     currency = Column(String, nullable=False, default="USD")
-    balance = Column(Float, nullable=False, default=0.0)
+    balance = Column(MONEY, nullable=False, default=0)
     status = Column(
         SqlEnum(AccountStatus),
         nullable=False,
         default=AccountStatus.ACTIVE,
     )
+    # Se incrementa en cada escritura de la fila (control optimista).
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # La relación no se usa para navegar; le indica al unit of work de
+    # SQLAlchemy que debe insertar el customer antes que la cuenta cuando
+    # ambos se confirman en el mismo commit.
+    customer = relationship("CustomerModel")
 
 #Tabla: transactions
+# En PostgreSQL está particionada por mes sobre created_at (migración 0009,
+# app.repositories.partitions); por eso created_at es parte de la PK.
 class TransactionModel(Base):
     __tablename__ = "transactions"
+    # Ventanas de riesgo e historial: rango por fecha filtrando APPROVED.
+    # La PK es (id, created_at) por las particiones; ux_transactions_id
+    # mantiene id único en las tablas sin particionar (SQLite,
+    # create_tables()). La migración 0009 no lo crea: PostgreSQL no admite
+    # un índice único sin la columna de partición.
+    __table_args__ = (
+        Index("ix_transactions_created_at_status", "created_at", "status"),
+        Index("ux_transactions_id", "id", unique=True),
+    )
 
-    id = Column(String, primary_key=True)
+    id = Column(ID, primary_key=True)
     type = Column(SqlEnum(TransactionType), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(MONEY, nullable=False)
     currency = Column(String, nullable=False, default="USD")
     status = Column(
         SqlEnum(TransactionStatus),
         nullable=False,
         default=TransactionStatus.PENDING,
     )
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
 #Tabla: ledger_entries
+# Particionada igual que transactions (mismos meses): la FK a transactions
+# incluye created_at porque una FK a una tabla particionada debe referir
+# una clave que contenga la columna de partición.
 class LedgerEntryModel(Base):
     __tablename__ = "ledger_entries"
-
-    id = Column(String, primary_key=True)
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
-    transaction_id = Column(
-        String, ForeignKey("transactions.id"), nullable=False
+    # (account_id, created_at, transaction_id) sirve la paginación keyset
+    # del historial y cubre el semi-join por cuenta sin leer la tabla;
+    # transaction_id solo sirve get_by_transaction_id y la FK.
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["transaction_id", "created_at"],
+            ["transactions.id", "transactions.created_at"],
+        ),
+        Index(
+            "ix_ledger_entries_account_id_created_at",
+            "account_id", "created_at", "transaction_id",
+        ),
+        Index("ix_ledger_entries_transaction_id", "transaction_id"),
+        # Como ux_transactions_id.
+        Index("ux_ledger_entries_id", "id", unique=True),
     )
+
+    id = Column(ID, primary_key=True)
+    account_id = Column(ID, ForeignKey("accounts.id"), nullable=False)
+    transaction_id = Column(ID, nullable=False)
     direction = Column(SqlEnum(Direction), nullable=False)
-    amount = Column(Float, nullable=False)
\ No newline at end of file
+    amount = Column(MONEY, nullable=False)
+    # Copia de transactions.created_at: ordena el historial por cuenta y es
+    # la columna de partición.
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+
+    # Igual que en AccountModel: ordenan los INSERT dentro de un único flush
+    # (transaction antes que sus ledger entries).
+    account = relationship("AccountModel")
+    transaction = relationship("TransactionModel")
+
+#Tabla: account_risk_counters
+# Contadores materializados de riesgo por cuenta. Se actualizan en el mismo
+# commit que cada transacción aprobada y se reconstruyen desde el ledger con
+# `python -m app.cli rebuild-risk-counters`.
+class AccountRiskCounterModel(Base):
+    __tablename__ = "account_risk_counters"
+
+    account_id = Column(ID, ForeignKey("accounts.id"), primary_key=True)
+    # Día (UTC) al que corresponde daily_total; si no es hoy, el total es 0.
+    day = Column(Date, nullable=False)
+    daily_total = Column(MONEY, nullable=False, default=0)
+    # Ventana deslizante de velocidad: pares [epoch_segundo, cantidad]
+    # solo de los últimos minutos (se podan al escribir y al leer).
+    recent_buckets = Column(JSON, nullable=False, default=list)
+
+    account = relationship("AccountModel")
+
+
+#Tabla: idempotency_keys
+class IdempotencyKeyModel(Base):
+    __tablename__ = "idempotency_keys"
+    # La limpieza por TTL borra por rango de expiración.
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    # NULL mientras la petición original está en curso.
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,232 @@
+"""
+Particiones mensuales por created_at de transactions y ledger_entries.
+
+Solo aplica en PostgreSQL con las tablas particionadas por la migración
+0009; en otros motores (o si la BD la creó create_tables()) las tablas son
+comunes y estas funciones no hacen nada. Cada partición cubre
+[mes, mes siguiente) y se llama `<tabla>_AAAA_MM`; `<tabla>_default`
+recibe las filas de meses sin partición (migración 0010). Las dos tablas
+usan los mismos límites porque ledger_entries.created_at es el de su
+transacción.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.repositories.interfaces import LedgerArchive
+
+# ledger_entries referencia a transactions por (transaction_id, created_at):
+# se crean en este orden y se desprenden en el inverso.
+PARTITIONED_TABLES = ("transactions", "ledger_entries")
+
+_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+# Serializa ensure_partitions entre procesos (workers de la API y el CLI).
+_LOCK_KEY = 0x7061727469
+
+# La API corre ensure_partitions al arrancar y cada PARTITIONS_CHECK_SECONDS
+# (0 lo apaga y queda solo el comando create-partitions).
+PARTITIONS_CHECK_SECONDS = float(os.getenv("PARTITIONS_CHECK_SECONDS", "3600"))
+PARTITIONS_MONTHS_AHEAD = int(os.getenv("PARTITIONS_MONTHS_AHEAD", "3"))
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Mes que cubre una partición según su nombre; None si no sigue el formato."""
+    match = _SUFFIX.search(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p"
+        " JOIN pg_class c ON c.oid = p.partrelid"
+        " WHERE c.relname = 'transactions'"
+    )).scalar())
+
+
+def list_partitions(db: Session, table: str) -> list[str]:
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits i"
+        " JOIN pg_class parent ON parent.oid = i.inhparent"
+        " JOIN pg_class child ON child.oid = i.inhrelid"
+        " WHERE parent.relname = :table ORDER BY child.relname"
+    ), {"table": table})
+    return [row[0] for row in rows]
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def ensure_partitions(
+    db: Session, months_ahead: int = 3, now: Optional[datetime] = None
+) -> list[str]:
+    """
+    Crea la partición DEFAULT si falta y las mensuales del mes actual y de
+    los `months_ahead` siguientes. Si el cron no corrió a tiempo, las filas
+    sin partición cayeron en DEFAULT en lugar de fallar: se crean también
+    las particiones de esos meses y las filas se mueven ahí. Retorna los
+    nombres creados. El commit lo hace quien llama.
+    """
+    if not is_partitioned(db):
+        return []
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    existing = {table: set(list_partitions(db, table)) for table in PARTITIONED_TABLES}
+    created = []
+    for table in PARTITIONED_TABLES:
+        default = default_partition_name(table)
+        if default not in existing[table]:
+            db.execute(text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT"))
+            created.append(default)
+
+    current = month_start(now or datetime.utcnow())
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    # El ledger cae en los mismos meses que sus transacciones.
+    months.update(row[0] for row in db.execute(text(
+        "SELECT DISTINCT date_trunc('month', created_at)"
+        f" FROM {default_partition_name('transactions')}"
+    )))
+    for month in sorted(months):
+        missing = [
+            table for table in PARTITIONED_TABLES
+            if partition_name(table, month) not in existing[table]
+        ]
+        if missing:
+            created.extend(_create_month(db, month, missing))
+    return created
+
+
+def start_partition_maintenance(
+    session_factory: Callable[[], Session],
+    interval: float = PARTITIONS_CHECK_SECONDS,
+    months_ahead: int = PARTITIONS_MONTHS_AHEAD,
+) -> Optional[threading.Thread]:
+    """
+    Hilo que corre ensure_partitions al arrancar y cada `interval` segundos,
+    así las particiones de los meses siguientes existen sin depender de un
+    cron y DEFAULT solo recibe filas si la API estuvo caída meses.
+    """
+    if interval <= 0:
+        return None
+
+    def _run():
+        while True:
+            try:
+                with session_factory() as db:
+                    created = ensure_partitions(db, months_ahead=months_ahead)
+                    db.commit()
+                if created:
+                    logger.info("Created partitions: %s", ", ".join(created))
+            except Exception:
+                # Un error (BD caída) no frena el hilo: se reintenta en la
+                # próxima vuelta.
+                logger.exception("Could not create partitions")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_run, name="partitions", daemon=True)
+    thread.start()
+    return thread
+
+
+def _create_month(db: Session, month: datetime, tables: list[str]) -> list[str]:
+    # PostgreSQL no crea una partición si DEFAULT tiene filas de su rango:
+    # se pasan a una tabla temporal (el ledger primero, por la FK), se crea
+    # la partición y se vuelven a insertar, que ahora caen en ella.
+    bounds = {"start": month, "end": add_months(month, 1)}
+    for table in reversed(tables):
+        db.execute(text(f"CREATE TEMP TABLE {table}_moving (LIKE {table})"))
+        db.execute(text(
+            f"WITH moved AS (DELETE FROM {default_partition_name(table)}"
+            " WHERE created_at >= :start AND created_at < :end RETURNING *)"
+            f" INSERT INTO {table}_moving SELECT * FROM moved"
+        ), bounds)
+    names = []
+    for table in tables:
+        name = partition_name(table, month)
+        db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {table}"
+            f" FOR VALUES FROM ('{month:%Y-%m-%d}')"
+            f" TO ('{add_months(month, 1):%Y-%m-%d}')"
+        ))
+        db.execute(text(f"INSERT INTO {table} SELECT * FROM {table}_moving"))
+        db.execute(text(f"DROP TABLE {table}_moving"))
+        names.append(name)
+    return names
+
+
+class UnarchivedPartitions(ValueError):
+    """Hay particiones por desprender cuyos meses todavía no se archivaron."""
+
+
+def detach_expired_partitions(
+    db: Session,
+    keep_months: int,
+    archive: Optional[LedgerArchive] = None,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """
+    Desprende las particiones anteriores a los últimos `keep_months` meses
+    completos (más el actual). Quedan como tablas sueltas con el mismo
+    nombre, para borrarlas aparte. Con `archive` el historial de esos meses
+    sale de ahí, así que ninguna se desprende si alguno de sus meses no está
+    archivado (UnarchivedPartitions); sin archivo esos meses simplemente
+    dejan de verse. Retorna los nombres desprendidos. El commit lo hace
+    quien llama.
+    """
+    if not is_partitioned(db):
+        return []
+    cutoff = add_months(month_start(now or datetime.utcnow()), -keep_months)
+    expired = []
+    for table in reversed(PARTITIONED_TABLES):
+        for name in list_partitions(db, table):
+            month = partition_month(name)
+            if month is not None and month < cutoff:
+                expired.append((table, name, month))
+    archived_until = archive.archived_until() if archive is not None else None
+    pending = sorted({
+        month for _, _, month in expired
+        if archive is not None
+        and (archived_until is None or add_months(month, 1) > archived_until)
+    })
+    if pending:
+        raise UnarchivedPartitions(
+            "months not archived yet: " + ", ".join(f"{m:%Y-%m}" for m in pending)
+        )
+    detached = []
+    for table, name, _ in expired:
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        # La FK heredada queda en la tabla desprendida y apuntaría a
+        # transactions: se suelta para poder desprender esa partición.
+        for (constraint,) in db.execute(text(
+            "SELECT conname FROM pg_constraint"
+            " WHERE conrelid = CAST(:name AS regclass) AND contype = 'f'"
+            " AND confrelid = CAST('transactions' AS regclass)"
+        ), {"name": name}).all():
+            db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+        detached.append(name)
+    return detached
@@ -0,0 +1,95 @@
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics import REGISTRY
+
+POOL_CHECKOUTS = REGISTRY.counter(
+    "db_pool_checkouts_total", "Conexiones entregadas por el pool", ("pool",)
+)
+POOL_TIMEOUTS = REGISTRY.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts que superaron DB_POOL_TIMEOUT esperando una conexión", ("pool",)
+)
+POOL_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tiempo esperando una conexión del pool (incluye abrirla o el pre-ping)", ("pool",)
+)
+POOL_SIZE = REGISTRY.gauge("db_pool_size", "Tamaño configurado del pool", ("pool",))
+POOL_CHECKED_OUT = REGISTRY.gauge(
+    "db_pool_checked_out", "Conexiones en uso en este momento", ("pool",)
+)
+POOL_OVERFLOW = REGISTRY.gauge(
+    "db_pool_overflow", "Conexiones abiertas por encima de pool_size", ("pool",)
+)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def pool_options(url: str, poolclass) -> dict:
+    """
+    Opciones del pool leídas de variables de entorno. SQLite usa los pools
+    propios de su dialecto, así que ahí no se aplica nada.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", False),
+    }
+
+
+class _CheckoutTimingMixin:
+    # SQLAlchemy no tiene un evento de pool antes de empezar un checkout:
+    # la espera y los timeouts solo se pueden medir envolviendo connect(),
+    # que es la API pública por la que pasa Engine.raw_connection(). El
+    # resto de las métricas sale de eventos (register_pool_metrics).
+    # Etiqueta de las métricas. Es atributo de clase porque el pool se
+    # recrea (engine.dispose) con la misma clase y sin argumentos extra.
+    metrics_label = "sync"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        POOL_WAIT.observe(time.perf_counter() - start, pool=self.metrics_label)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def register_pool_metrics(engine, label: str):
+    # Los listeners sobre el engine pasan al pool nuevo en cada dispose().
+    @event.listens_for(engine, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc(pool=label)
+
+    def _read(fn):
+        def _value():
+            # Se lee engine.pool en cada exportación porque dispose() lo reemplaza.
+            pool = engine.pool
+            return fn(pool) if isinstance(pool, QueuePool) else 0
+        return _value
+
+    POOL_SIZE.set_function(_read(lambda pool: pool.size()), pool=label)
+    POOL_CHECKED_OUT.set_function(_read(lambda pool: pool.checkedout()), pool=label)
+    POOL_OVERFLOW.set_function(_read(lambda pool: max(pool.overflow(), 0)), pool=label)
@@ -0,0 +1,83 @@
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.instrumentation import timed
+
+from app.repositories.archive import get_ledger_archive
+from app.repositories.implementations import (
+    SqlAccountRepository,
+    SqlCustomerRepository,
+    SqlIdempotencyRepository,
+    SqlLedgerRepository,
+    SqlRiskCounterRepository,
+    SqlTransactionRepository,
+)
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+
+# "sql" (default) o "memory": repositorios en memoria, sin BD, para
+# benchmarks de la lógica del facade y tests rápidos.
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "sql")
+MEMORY_STORE = InMemoryStore()
+
+
+class SqlUnitOfWork:
+    """
+    Agrupa los repositorios SQL sobre una misma sesión.
+    Los repositorios solo agregan/actualizan filas; el commit lo hace el
+    unit of work una sola vez por operación (depósito, retiro, transferencia).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.customers = SqlCustomerRepository(db)
+        self.accounts = SqlAccountRepository(db)
+        self.transactions = SqlTransactionRepository(db, archive=get_ledger_archive())
+        self.ledger = SqlLedgerRepository(db, archive=get_ledger_archive())
+        self.risk_counters = SqlRiskCounterRepository(db)
+        self.idempotency = SqlIdempotencyRepository(db)
+        self._after_commit: list[Callable[[], None]] = []
+
+    def __enter__(self) -> "SqlUnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Si la operación falló antes del commit se descarta todo lo pendiente.
+        if exc_type is not None:
+            self.rollback()
+
+    def commit(self):
+        with timed("commit"):
+            self.db.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self._after_commit.clear()
+        self.db.rollback()
+
+    def on_commit(self, callback: Callable[[], None]):
+        self._after_commit.append(callback)
+
+
+def make_unit_of_work(db: Session):
+    """Unit of work del backend configurado; `db` solo se usa con "sql"."""
+    if REPOSITORY_BACKEND == "memory":
+        return InMemoryUnitOfWork(MEMORY_STORE)
+    return SqlUnitOfWork(db)
+
+
+def unit_of_work_scope(session_factory):
+    """
+    Fábrica de unit of work con sesión propia, para lo que corre fuera de la
+    sesión del request (ej: idempotencia).
+    """
+    @contextmanager
+    def scope() -> Iterator[SqlUnitOfWork]:
+        with session_factory() as db:
+            with make_unit_of_work(db) as uow:
+                yield uow
+    return scope
@@ -0,0 +1,51 @@
+"""
+Latencia del historial de una cuenta según el tamaño de su ledger.
+
+Compara la consulta anterior (traer el ledger a Python y luego un IN con
+todos los ids) contra SqlTransactionRepository.get_by_account_id (semi-join en la BD).
+
+    python -m benchmarks.bench_account_history --sizes 1000 10000 50000
+"""
+import argparse
+
+from app.repositories.implementations import SqlTransactionRepository
+from app.repositories.models import LedgerEntryModel, TransactionModel
+from app.domain.ids import new_id
+from benchmarks.common import make_session_factory, seed_account, time_call
+
+
+def legacy_get_by_account_id(db, account_id: str):
+    ledger_entries = db.query(LedgerEntryModel).filter(
+        LedgerEntryModel.account_id == account_id
+    ).all()
+    transaction_ids = list(set(entry.transaction_id for entry in ledger_entries))
+    if not transaction_ids:
+        return []
+    return db.query(TransactionModel).filter(
+        TransactionModel.id.in_(transaction_ids)
+    ).order_by(TransactionModel.created_at.desc()).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 30_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine, session_factory = make_session_factory(args.database_url)
+    print(f"{'ledger rows':>12} {'legacy ms':>12} {'semi-join ms':>12}")
+    for size in args.sizes:
+        account_id = new_id()
+        with session_factory() as db:
+            seed_account(db, account_id, size)
+        with session_factory() as db:
+            repo = SqlTransactionRepository(db)
+            legacy = time_call(lambda: (legacy_get_by_account_id(db, account_id), db.expunge_all()), args.repeat)
+            current = time_call(lambda: (repo.get_by_account_id(account_id), db.expunge_all()), args.repeat)
+        print(f"{size:>12} {legacy['median_ms']:>12.1f} {current['median_ms']:>12.1f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput de retiros concurrentes sobre una misma cuenta ("hot account").
+
+Cada hilo abre su propia sesión y hace retiros de 1.0 hasta agotar su cuota.
+Al final se verifica que el saldo coincida con lo retirado: con el UPDATE
+condicional no hay actualizaciones perdidas aunque compitan todos los hilos.
+
+    python -m benchmarks.bench_concurrent_withdrawals --threads 16 --per-thread 200
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_concurrent_withdrawals
+"""
+import argparse
+import threading
+import time
+
+from app.application.banking_facade import BankingFacade
+from app.domain.exceptions import InsufficientFundsError
+from app.domain.strategies.fee_strategy import NoFeeStrategy
+from app.repositories.unit_of_work import SqlUnitOfWork
+from benchmarks.common import make_session_factory
+
+
+def facade_for(session) -> BankingFacade:
+    return BankingFacade(
+        unit_of_work=SqlUnitOfWork(session),
+        fee_strategy=NoFeeStrategy(),
+        risk_rules=[],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine, session_factory = make_session_factory(args.database_url)
+    initial = float(args.threads * args.per_thread)
+    with session_factory() as db:
+        facade = facade_for(db)
+        customer = facade.create_customer("Bench", "hot@bench.local")
+        account = facade.create_account(customer.id)
+        facade.deposit(account.id, initial)
+
+    rejected = []
+    start = threading.Barrier(args.threads + 1)
+
+    def worker():
+        start.wait()
+        with session_factory() as db:
+            facade = facade_for(db)
+            for _ in range(args.per_thread):
+                try:
+                    facade.withdraw(account.id, 1.0)
+                except InsufficientFundsError:
+                    rejected.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for t in threads:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    total = args.threads * args.per_thread
+    with session_factory() as db:
+        balance = facade_for(db).get_account(account.id).balance
+    print(f"{total} retiros en {elapsed:.2f} s -> {total / elapsed:,.0f} ops/s")
+    print(f"rechazados: {len(rejected)}, saldo final: {float(balance):.2f} (esperado {len(rejected):.2f})")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
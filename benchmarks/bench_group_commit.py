@@ -0,0 +1,104 @@
+"""
+Throughput y latencia de depósitos concurrentes con y sin group commit.
+
+Para cada ventana (0 = sin group commit: cada depósito hace su commit) los
+hilos depositan sobre un pool de cuentas y se reporta ops/s, p50/p95/p99
+por operación y el tamaño promedio de lote. Ventanas más largas juntan
+lotes más grandes (menos commits) a cambio de más espera por operación.
+
+    python -m benchmarks.bench_group_commit --threads 32 --per-thread 50 --windows 0 1 2 5 10
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_group_commit
+"""
+import argparse
+import threading
+import time
+from contextlib import contextmanager
+
+from app.application.banking_facade import BatchOperation
+from app.application.group_commit import GroupCommitter
+from app.domain.enums import TransactionType
+from app.repositories.unit_of_work import SqlUnitOfWork
+from benchmarks.common import make_session_factory, percentiles
+from benchmarks.suite import bench_facade
+
+
+def run_window(session_factory, accounts: list[str], window_ms: float, threads: int,
+               per_thread: int, max_items: int) -> dict:
+    flushes = []
+
+    @contextmanager
+    def facade_scope():
+        flushes.append(1)
+        with session_factory() as db:
+            with SqlUnitOfWork(db) as uow:
+                yield bench_facade(uow)
+
+    committer = GroupCommitter(facade_scope, window=window_ms / 1000, max_items=max_items)
+    samples: list[float] = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads + 1)
+
+    def worker(n: int):
+        local = []
+        start.wait()
+        for i in range(per_thread):
+            account_id = accounts[(n + i) % len(accounts)]
+            began = time.perf_counter()
+            if window_ms > 0:
+                committer.submit(BatchOperation(TransactionType.DEPOSIT, 1.0, account_id))
+            else:
+                with session_factory() as db:
+                    bench_facade(SqlUnitOfWork(db)).deposit(account_id, 1.0)
+            local.append((time.perf_counter() - began) * 1000)
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    total = threads * per_thread
+    return {
+        "window_ms": window_ms,
+        "ops_per_sec": total / elapsed,
+        **percentiles(samples),
+        "avg_batch": total / len(flushes) if flushes else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--per-thread", type=int, default=50)
+    parser.add_argument("--accounts", type=int, default=64)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10],
+                        help="Ventanas en ms; 0 = commit por operación")
+    parser.add_argument("--max-items", type=int, default=64)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine, session_factory = make_session_factory(args.database_url)
+    accounts = []
+    with session_factory() as db:
+        facade = bench_facade(SqlUnitOfWork(db))
+        for i in range(args.accounts):
+            customer = facade.create_customer("Bench", f"group-{i}@bench.local")
+            accounts.append(facade.create_account(customer.id).id)
+
+    print(f"{'ventana':>8} {'ops/s':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'lote':>6}")
+    for window_ms in args.windows:
+        r = run_window(session_factory, accounts, window_ms, args.threads, args.per_thread, args.max_items)
+        print(
+            f"{window_ms:>6.1f}ms {r['ops_per_sec']:>10,.0f} {r['p50_ms']:>8.2f} "
+            f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['avg_batch']:>6.1f}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
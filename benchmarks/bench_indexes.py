@@ -0,0 +1,98 @@
+"""
+Planes de ejecución y tiempos de las consultas de historial y riesgo con y
+sin los índices secundarios (migración 0002).
+
+Siembra `--accounts` cuentas con `--depth` entries cada una (por defecto un
+millón de filas de ledger) y mide cada consulta sin índices y con índices.
+
+    python -m benchmarks.bench_indexes --accounts 1000 --depth 1000
+"""
+import argparse
+
+from sqlalchemy import event
+
+from app.repositories.implementations import SqlLedgerRepository, SqlTransactionRepository
+from app.repositories.models import AccountModel, LedgerEntryModel, TransactionModel
+from app.domain.ids import new_id
+from benchmarks.common import make_session_factory, seed_account, time_call
+
+INDEXES = [
+    index
+    for model in (AccountModel, TransactionModel, LedgerEntryModel)
+    for index in model.__table__.indexes
+]
+
+
+def capture_sql(engine, fn):
+    """Ejecuta `fn` y retorna la última sentencia SQL (con parámetros) que emitió."""
+    captured = []
+
+    def _listener(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _listener)
+    return captured[-1]
+
+
+def explain(engine, statement, parameters) -> list[str]:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    return [" ".join(str(col) for col in row) for row in rows]
+
+
+def set_indexes(engine, enabled: bool):
+    for index in INDEXES:
+        if enabled:
+            index.create(bind=engine, checkfirst=True)
+        else:
+            index.drop(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--depth", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine, session_factory = make_session_factory(args.database_url)
+    set_indexes(engine, False)
+    print(f"Sembrando {args.accounts * args.depth:,} filas de ledger...")
+    with session_factory() as db:
+        for n in range(args.accounts):
+            account_id = new_id()
+            transaction_ids = seed_account(db, account_id, args.depth)
+            if n == args.accounts // 2:
+                target, target_tx = account_id, transaction_ids[0]
+
+    queries = {
+        "history": lambda repos: repos[0].get_by_account_id(target),
+        "risk_totals": lambda repos: repos[0].risk_totals_by_account(target, minutes=10),
+        "ledger_by_tx": lambda repos: repos[1].get_by_transaction_id(target_tx),
+    }
+
+    for enabled in (False, True):
+        set_indexes(engine, enabled)
+        print(f"\n=== índices {'ON' if enabled else 'OFF'} ===")
+        with session_factory() as db:
+            repos = (SqlTransactionRepository(db), SqlLedgerRepository(db))
+            for name, query in queries.items():
+                run = lambda: (query(repos), db.expunge_all())
+                statement, parameters = capture_sql(engine, run)
+                timing = time_call(run, args.repeat)
+                print(f"\n{name}: mediana {timing['median_ms']:.1f} ms, mínimo {timing['min_ms']:.1f} ms")
+                for line in explain(engine, statement, parameters):
+                    print(f"    {line}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
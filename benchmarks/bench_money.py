@@ -0,0 +1,99 @@
+"""
+Costo de la aritmética de montos: Money (enteros en unidades menores)
+frente a Decimal cuantizado a centavos y a float (el esquema anterior).
+
+Mide el camino caliente de un retiro (fee porcentual, total a debitar,
+comparación con el saldo) y una agregación masiva (suma de N montos, como
+los totales diarios). "money" sigue el camino del dominio: el fee sale de
+`PercentFeeStrategy.calculate_minor` sobre `.minor` y se crea un solo Money,
+el saldo nuevo, como hacen `Account.withdraw` y la fachada. "int" es la
+misma aritmética sin ningún objeto; "decimal" busca el cuanto de la moneda
+como lo haría un dominio multi-moneda. Reporta ns por operación.
+
+    python -m benchmarks.bench_money --ops 200000
+"""
+import argparse
+import random
+import time
+from decimal import ROUND_HALF_EVEN, Decimal
+from fractions import Fraction
+
+from app.domain.money import Money
+from app.domain.strategies.fee_strategy import PercentFeeStrategy
+
+QUANTUM = {"USD": Decimal("0.01"), "EUR": Decimal("0.01"), "JPY": Decimal("1")}
+PERCENT = 0.015
+
+
+def _per_op(fn, items) -> float:
+    began = time.perf_counter()
+    fn(items)
+    return (time.perf_counter() - began) / len(items) * 1e9
+
+
+def withdraw_money(amounts: list[Money]):
+    fee = PercentFeeStrategy(PERCENT).calculate_minor
+    balance = Money.of(10**9, "USD")
+    for amount in amounts:
+        minor = amount.minor
+        total = minor + fee(minor, amount.currency)
+        if balance.minor >= total:
+            balance = Money(balance.minor - total, balance.currency)
+
+
+def withdraw_int(amounts: list[int]):
+    # La misma cuenta que Money sin el objeto: lo que cuesta la aritmética sola.
+    ratio = Fraction(str(PERCENT))
+    numerator, denominator = ratio.numerator, ratio.denominator
+    balance = 10**11
+    for amount in amounts:
+        fee, remainder = divmod(amount * numerator, denominator)
+        if 2 * remainder > denominator or (2 * remainder == denominator and fee & 1):
+            fee += 1
+        total = amount + fee
+        if balance >= total:
+            balance -= total
+
+
+def withdraw_decimal(amounts: list[Decimal]):
+    percent = Decimal(str(PERCENT))
+    balance = Decimal(10**9)
+    for amount in amounts:
+        quantum = QUANTUM["USD"]
+        total = amount + (amount * percent).quantize(quantum, rounding=ROUND_HALF_EVEN)
+        if balance >= total:
+            balance -= total
+
+
+def withdraw_float(amounts: list[float]):
+    balance = float(10**9)
+    for amount in amounts:
+        total = amount + amount * PERCENT
+        if balance >= total:
+            balance -= total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    cents = [rng.randint(1, 1_000_000) for _ in range(args.ops)]
+    moneys = [Money(c, "USD") for c in cents]
+    decimals = [Decimal(c).scaleb(-2) for c in cents]
+    floats = [c / 100 for c in cents]
+
+    print(f"{'esquema':<10} {'retiro ns/op':>14} {'suma ns/op':>12}")
+    rows = [
+        ("money", withdraw_money, moneys, lambda items: sum(m.minor for m in items)),
+        ("int", withdraw_int, cents, sum),
+        ("decimal", withdraw_decimal, decimals, lambda items: sum(items, Decimal(0))),
+        ("float", withdraw_float, floats, sum),
+    ]
+    for name, withdraw, items, total in rows:
+        print(f"{name:<10} {_per_op(withdraw, items):>14.1f} {_per_op(total, items):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Ids de texto uuid4 (esquema anterior) frente a uuid nativo con uuid4 y con
+UUIDv7 (app.domain.ids), sobre una tabla con la forma del ledger: PK e
+índice secundario por cuenta.
+
+Inserta las mismas filas en lotes chicos con un commit por lote (como el
+tráfico real) y reporta filas/s y el tamaño de la PK y del índice por
+cuenta. Con uuid4 cada insert cae en una hoja al azar del B-tree (páginas
+partidas a medias); con UUIDv7 se agrega al final.
+
+    python -m benchmarks.bench_uuid_keys --rows 200000 --batch 100
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_uuid_keys
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+
+from sqlalchemy import BigInteger, Column, Index, MetaData, String, Table, Uuid, create_engine, insert, text
+
+from app.domain.ids import new_id
+from benchmarks.common import DEFAULT_URL
+
+# nombre -> (tabla, tipo de columna, generador de ids)
+SCHEMES = {
+    "text + uuid4": ("bench_ids_text_v4", String, lambda: str(uuid.uuid4())),
+    "uuid + uuid4": ("bench_ids_uuid_v4", Uuid(as_uuid=False), lambda: str(uuid.uuid4())),
+    "uuid + uuid7": ("bench_ids_uuid_v7", Uuid(as_uuid=False), new_id),
+}
+
+
+def make_table(metadata: MetaData, name: str, id_type) -> Table:
+    return Table(
+        name, metadata,
+        Column("id", id_type, primary_key=True),
+        Column("account_id", id_type, nullable=False),
+        Column("amount", BigInteger, nullable=False),
+        Index(f"ix_{name}_account_id", "account_id"),
+    )
+
+
+def index_sizes(engine, table: Table) -> tuple[int | None, int | None]:
+    """Bytes de (PK, índice por cuenta); None si el motor no lo expone."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            query = text("SELECT pg_relation_size(:name)")
+            return (
+                conn.execute(query, {"name": f"{table.name}_pkey"}).scalar(),
+                conn.execute(query, {"name": f"ix_{table.name}_account_id"}).scalar(),
+            )
+        if engine.dialect.name == "sqlite":
+            query = text("SELECT SUM(pgsize) FROM dbstat WHERE name = :name")
+            try:
+                return (
+                    conn.execute(query, {"name": f"sqlite_autoindex_{table.name}_1"}).scalar(),
+                    conn.execute(query, {"name": f"ix_{table.name}_account_id"}).scalar(),
+                )
+            except Exception:
+                return None, None
+    return None, None
+
+
+def run_scheme(engine, name: str, rows: int, batch: int, accounts: int) -> dict:
+    table_name, id_type, make_id = SCHEMES[name]
+    metadata = MetaData()
+    table = make_table(metadata, table_name, id_type)
+    # Las cuentas usan el mismo esquema de ids que las filas.
+    account_ids = [make_id() for _ in range(accounts)]
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    rng = random.Random(42)
+
+    began = time.perf_counter()
+    for offset in range(0, rows, batch):
+        values = [
+            {"id": make_id(), "account_id": rng.choice(account_ids), "amount": 1_000}
+            for _ in range(min(batch, rows - offset))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(table), values)
+    elapsed = time.perf_counter() - began
+
+    pk_bytes, account_index_bytes = index_sizes(engine, table)
+    metadata.drop_all(engine)
+    return {
+        "scheme": name,
+        "rows_per_sec": rows / elapsed,
+        "pk_bytes": pk_bytes,
+        "account_index_bytes": account_index_bytes,
+    }
+
+
+def _size(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / 1024 / 1024:,.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url or os.getenv("BENCH_DATABASE_URL", DEFAULT_URL))
+    print(f"{'esquema':<14} {'filas/s':>10} {'PK':>10} {'ix cuenta':>10}")
+    for name in SCHEMES:
+        r = run_scheme(engine, name, args.rows, args.batch, args.accounts)
+        print(
+            f"{r['scheme']:<14} {r['rows_per_sec']:>10,.0f} "
+            f"{_size(r['pk_bytes']):>10} {_size(r['account_index_bytes']):>10}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.account import Account
+from app.domain.entities.customer import Customer
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import AccountStatus, Direction, TransactionStatus, TransactionType
+from app.domain.ids import new_id
+from app.domain.money import Money
+from app.repositories.database import Base
+from app.repositories.models import (
+    AccountModel,
+    CustomerModel,
+    LedgerEntryModel,
+    TransactionModel,
+)
+
+# Por defecto los benchmarks corren sobre un SQLite temporal; para medir
+# contra Postgres basta con exportar BENCH_DATABASE_URL.
+DEFAULT_URL = "sqlite:///./bench.db"
+
+
+def make_session_factory(url: str | None = None, reset: bool = True):
+    url = url or os.getenv("BENCH_DATABASE_URL", DEFAULT_URL)
+    engine = create_engine(url, echo=False)
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def seed_account(db, account_id: str, ledger_depth: int, chunk: int = 10_000) -> list[str]:
+    """
+    Crea una cuenta con `ledger_depth` depósitos aprobados de 10 USD (1000 en
+    unidades menores, como se guardan) en su ledger. Retorna los ids de esas
+    transacciones, de la más antigua a la más nueva.
+    """
+    customer_id = new_id()
+    transaction_ids = []
+    db.execute(insert(CustomerModel), [{
+        "id": customer_id, "name": "Bench", "email": f"{account_id}@bench.local",
+        "status": "ACTIVE",
+    }])
+    db.execute(insert(AccountModel), [{
+        "id": account_id, "customer_id": customer_id, "currency": "USD",
+        "balance": 0, "status": AccountStatus.ACTIVE,
+    }])
+    start = datetime.utcnow() - timedelta(minutes=ledger_depth)
+    for offset in range(0, ledger_depth, chunk):
+        size = min(chunk, ledger_depth - offset)
+        transactions, entries = [], []
+        for i in range(offset, offset + size):
+            tx_id = new_id()
+            transaction_ids.append(tx_id)
+            transactions.append({
+                "id": tx_id, "type": TransactionType.DEPOSIT, "amount": 1_000,
+                "currency": "USD", "status": TransactionStatus.APPROVED,
+                "created_at": start + timedelta(minutes=i),
+            })
+            entries.append({
+                "id": new_id(), "account_id": account_id,
+                "transaction_id": tx_id, "direction": Direction.CREDIT,
+                "amount": 1_000, "created_at": transactions[-1]["created_at"],
+            })
+        db.execute(insert(TransactionModel), transactions)
+        db.execute(insert(LedgerEntryModel), entries)
+    db.commit()
+    return transaction_ids
+
+
+def time_call(fn, repeat: int = 5) -> dict:
+    """Ejecuta `fn` varias veces y retorna mediana y mínimo en milisegundos."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def seed_volume(
+    uow_factory,
+    customers: int,
+    accounts_per_customer: int,
+    ledger_depth: int,
+    chunk: int = 10_000,
+) -> list[str]:
+    """
+    Siembra clientes, cuentas y `ledger_depth` depósitos históricos por cuenta
+    a través de los repositorios, así sirve para cualquier backend.
+    `uow_factory()` debe retornar un unit of work nuevo. Retorna los ids de
+    las cuentas.
+    """
+    account_ids = []
+    start = datetime.utcnow() - timedelta(minutes=ledger_depth + 1)
+    deposit = Money.of(10, "USD")
+    for c in range(customers):
+        with uow_factory() as uow:
+            customer = Customer(id=new_id(), name="Bench", email=f"cust-{c}@bench.local")
+            uow.customers.save(customer)
+            for a in range(accounts_per_customer):
+                account_id = new_id()
+                # Saldo holgado para que los retiros del benchmark no se rechacen.
+                uow.accounts.save(Account(
+                    id=account_id, customer_id=customer.id, currency="USD",
+                    balance=Money.of(10 * ledger_depth + 1_000_000, "USD"),
+                ))
+                account_ids.append(account_id)
+            uow.commit()
+
+    for account_id in account_ids:
+        for offset in range(0, ledger_depth, chunk):
+            transactions, entries = [], []
+            for i in range(offset, min(offset + chunk, ledger_depth)):
+                created_at = start + timedelta(minutes=i)
+                transactions.append(Transaction(
+                    id=new_id(), type=TransactionType.DEPOSIT,
+                    amount=deposit, currency="USD", status=TransactionStatus.APPROVED,
+                    created_at=created_at,
+                ))
+                entries.append(LedgerEntry(
+                    id=new_id(), account_id=account_id,
+                    transaction_id=transactions[-1].id, direction=Direction.CREDIT,
+                    amount=deposit, created_at=created_at,
+                ))
+            with uow_factory() as uow:
+                uow.transactions.save_all(transactions)
+                uow.ledger.save_all(entries)
+                uow.commit()
+
+    with uow_factory() as uow:
+        uow.risk_counters.rebuild()
+        uow.commit()
+    return account_ids
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99 y media de una lista de latencias en milisegundos."""
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49],
+        "p95_ms": cuts[94],
+        "p99_ms": cuts[98],
+        "mean_ms": statistics.fmean(samples),
+    }
@@ -0,0 +1,92 @@
+"""
+Prueba de carga HTTP para comparar la API sync contra la async.
+
+Levantar ambas variantes sobre la misma BD, por ejemplo:
+
+    API_MODE=sync  uvicorn app.main:app --port 8000 --workers 1
+    API_MODE=async uvicorn app.main:app --port 8001 --workers 1
+
+y luego:
+
+    python -m benchmarks.load_test http://localhost:8000 http://localhost:8001 \
+        --concurrency 200 --duration 20
+
+Cada worker alterna lecturas de saldo/historial con depósitos sobre un
+conjunto de cuentas sembrado al inicio. Se reporta throughput y latencias.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def seed(client: httpx.AsyncClient, accounts: int) -> list[str]:
+    ids = []
+    for _ in range(accounts):
+        res = await client.post("/customers", json={
+            "name": "Load", "email": f"load-{uuid.uuid4().hex}@bench.local",
+        })
+        customer_id = res.json()["id"]
+        res = await client.post("/accounts", json={"customer_id": customer_id})
+        ids.append(res.json()["id"])
+    return ids
+
+
+async def worker(client, account_ids, deadline, latencies, errors, write_ratio):
+    while time.perf_counter() < deadline:
+        account_id = random.choice(account_ids)
+        start = time.perf_counter()
+        if random.random() < write_ratio:
+            res = await client.post("/transactions/deposit", json={"account_id": account_id, "amount": 1.0})
+        elif random.random() < 0.5:
+            res = await client.get(f"/accounts/{account_id}")
+        else:
+            res = await client.get(f"/accounts/{account_id}/transactions", params={"limit": 20})
+        latencies.append((time.perf_counter() - start) * 1000)
+        if res.status_code >= 500:
+            errors.append(res.status_code)
+
+
+async def run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        account_ids = await seed(client, args.accounts)
+        latencies, errors = [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            worker(client, account_ids, deadline, latencies, errors, args.write_ratio)
+            for _ in range(args.concurrency)
+        ))
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "url": base_url,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / args.duration,
+        "p50_ms": quantiles[49],
+        "p95_ms": quantiles[94],
+        "p99_ms": quantiles[98],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"{'url':<28} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'5xx':>6}")
+    for url in args.urls:
+        r = asyncio.run(run(url, args))
+        print(f"{r['url']:<28} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""initial schema
+
+Esquema que hasta ahora creaba create_tables(). En una BD ya creada de esa
+forma basta con `alembic stamp 0001` antes de `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+account_status = sa.Enum("ACTIVE", "FROZEN", "CLOSED", name="accountstatus")
+transaction_type = sa.Enum("DEPOSIT", "WITHDRAW", "TRANSFER", name="transactiontype")
+transaction_status = sa.Enum("PENDING", "APPROVED", "REJECTED", name="transactionstatus")
+direction = sa.Enum("DEBIT", "CREDIT", name="direction")
+
+
+def upgrade():
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "accounts",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("customer_id", sa.String(), sa.ForeignKey("customers.id"), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("balance", sa.Float(), nullable=False),
+        sa.Column("status", account_status, nullable=False),
+    )
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("status", transaction_status, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "ledger_entries",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("account_id", sa.String(), sa.ForeignKey("accounts.id"), nullable=False),
+        sa.Column("transaction_id", sa.String(), sa.ForeignKey("transactions.id"), nullable=False),
+        sa.Column("direction", direction, nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("ledger_entries")
+    op.drop_table("transactions")
+    op.drop_table("accounts")
+    op.drop_table("customers")
+    bind = op.get_bind()
+    for enum in (direction, transaction_status, transaction_type, account_status):
+        enum.drop(bind, checkfirst=True)
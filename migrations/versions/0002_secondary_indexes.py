@@ -0,0 +1,37 @@
+"""secondary indexes for ledger_entries, transactions and accounts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_ledger_entries_account_id_transaction_id", "ledger_entries", ["account_id", "transaction_id"]),
+    ("ix_ledger_entries_transaction_id", "ledger_entries", ["transaction_id"]),
+    ("ix_transactions_created_at_status", "transactions", ["created_at", "status"]),
+    ("ix_accounts_customer_id", "accounts", ["customer_id"]),
+]
+
+
+def upgrade():
+    # En Postgres se crean CONCURRENTLY para no bloquear escrituras sobre
+    # tablas ya grandes; eso exige salir del bloque transaccional.
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=concurrently,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""account_risk_counters table
+
+Después de aplicarla, poblar los contadores de las cuentas existentes con
+`python -m app.cli rebuild-risk-counters`. Mientras tanto las cuentas sin
+fila se calculan desde el historial.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "account_risk_counters",
+        sa.Column("account_id", sa.String(), sa.ForeignKey("accounts.id"), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("daily_total", sa.Float(), nullable=False),
+        sa.Column("recent_buckets", sa.JSON(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("account_risk_counters")
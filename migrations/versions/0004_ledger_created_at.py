@@ -0,0 +1,45 @@
+"""ledger_entries.created_at for keyset pagination of account history
+
+Copia created_at de la transacción a cada entry y reemplaza el índice
+(account_id, transaction_id) por (account_id, created_at, transaction_id),
+que sirve tanto la paginación como el semi-join por cuenta.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("ledger_entries", sa.Column("created_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE ledger_entries SET created_at = ("
+        " SELECT transactions.created_at FROM transactions"
+        " WHERE transactions.id = ledger_entries.transaction_id)"
+    )
+    with op.batch_alter_table("ledger_entries") as batch:
+        batch.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+    op.create_index(
+        "ix_ledger_entries_account_id_created_at",
+        "ledger_entries",
+        ["account_id", "created_at", "transaction_id"],
+    )
+    op.drop_index("ix_ledger_entries_account_id_transaction_id", table_name="ledger_entries")
+
+
+def downgrade():
+    op.create_index(
+        "ix_ledger_entries_account_id_transaction_id",
+        "ledger_entries",
+        ["account_id", "transaction_id"],
+    )
+    op.drop_index("ix_ledger_entries_account_id_created_at", table_name="ledger_entries")
+    with op.batch_alter_table("ledger_entries") as batch:
+        batch.drop_column("created_at")
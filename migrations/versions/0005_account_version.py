@@ -0,0 +1,28 @@
+"""accounts.version for optimistic concurrency control
+
+Cada escritura de la cuenta incrementa la versión; las actualizaciones por
+entidad (cambios de estado) la comparan antes de escribir.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "accounts",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("accounts") as batch:
+        batch.drop_column("version")
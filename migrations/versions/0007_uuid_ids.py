@@ -0,0 +1,75 @@
+"""native uuid columns for entity ids
+
+Los ids pasan de VARCHAR a uuid nativo en PostgreSQL (16 bytes en lugar de
+~37, índices de PK y FK más chicos). Los ids existentes (uuid4 en texto) se
+convierten tal cual; los nuevos son UUIDv7. En otros motores la columna es
+CHAR(32) con el hex sin guiones, que es como SQLAlchemy guarda Uuid allí.
+
+Falla si alguna fila tiene un id que no es UUID (ej: datos sembrados a mano).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+ID_COLUMNS = [
+    ("customers", "id"),
+    ("accounts", "id"),
+    ("accounts", "customer_id"),
+    ("transactions", "id"),
+    ("ledger_entries", "id"),
+    ("ledger_entries", "account_id"),
+    ("ledger_entries", "transaction_id"),
+    ("account_risk_counters", "account_id"),
+]
+
+# (tabla, columna, tabla referida); nombres por defecto de PostgreSQL.
+FOREIGN_KEYS = [
+    ("accounts", "customer_id", "customers"),
+    ("ledger_entries", "account_id", "accounts"),
+    ("ledger_entries", "transaction_id", "transactions"),
+    ("account_risk_counters", "account_id", "accounts"),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _alter_postgresql(type_, using: str):
+    # Las FKs exigen el mismo tipo en ambos lados: se sueltan, se cambian
+    # todas las columnas y se vuelven a crear.
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+    for table, column in ID_COLUMNS:
+        op.alter_column(table, column, type_=type_, postgresql_using=using.format(column=column))
+    for table, column, referred in FOREIGN_KEYS:
+        op.create_foreign_key(f"{table}_{column}_fkey", table, referred, [column], ["id"])
+
+
+def upgrade():
+    if _is_postgresql():
+        _alter_postgresql(postgresql.UUID(as_uuid=False), "{column}::uuid")
+        return
+    for table, column in ID_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = lower(replace({column}, '-', ''))")
+
+
+def downgrade():
+    if _is_postgresql():
+        _alter_postgresql(sa.String(), "{column}::text")
+        return
+    for table, column in ID_COLUMNS:
+        op.execute(
+            f"UPDATE {table} SET {column} = substr({column}, 1, 8) || '-' || substr({column}, 9, 4)"
+            f" || '-' || substr({column}, 13, 4) || '-' || substr({column}, 17, 4)"
+            f" || '-' || substr({column}, 21, 12)"
+        )
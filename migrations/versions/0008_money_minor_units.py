@@ -0,0 +1,75 @@
+"""money columns as BIGINT minor units
+
+Saldos, montos y el total diario de riesgo pasan de FLOAT a BIGINT en
+unidades menores de la moneda (centavos en USD), que es lo que usa
+app.domain.money. Cada valor se escala según la moneda de su cuenta o
+transacción y se redondea al entero más cercano.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# Copia de app.domain.money.CURRENCY_EXPONENTS al momento de la migración.
+CURRENCY_EXPONENTS = {
+    "CLP": 0, "ISK": 0, "JPY": 0, "KRW": 0, "PYG": 0, "VND": 0,
+    "BHD": 3, "JOD": 3, "KWD": 3, "OMR": 3, "TND": 3,
+}
+DEFAULT_EXPONENT = 2
+
+# (tabla, columna, expresión SQL con la moneda de cada fila)
+MONEY_COLUMNS = [
+    ("accounts", "balance", "currency"),
+    ("transactions", "amount", "currency"),
+    (
+        "ledger_entries", "amount",
+        "(SELECT transactions.currency FROM transactions"
+        " WHERE transactions.id = ledger_entries.transaction_id)",
+    ),
+    (
+        "account_risk_counters", "daily_total",
+        "(SELECT accounts.currency FROM accounts"
+        " WHERE accounts.id = account_risk_counters.account_id)",
+    ),
+]
+
+
+def _factor(currency_sql: str) -> str:
+    cases = " ".join(
+        f"WHEN '{currency}' THEN {10 ** exponent}"
+        for currency, exponent in CURRENCY_EXPONENTS.items()
+    )
+    return f"CASE {currency_sql} {cases} ELSE {10 ** DEFAULT_EXPONENT} END"
+
+
+def upgrade():
+    for table, column, currency_sql in MONEY_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = round({column} * {_factor(currency_sql)})")
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                column,
+                existing_type=sa.Float(),
+                type_=sa.BigInteger(),
+                existing_nullable=False,
+                postgresql_using=f"round({column})::bigint",
+            )
+
+
+def downgrade():
+    for table, column, currency_sql in MONEY_COLUMNS:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                column,
+                existing_type=sa.BigInteger(),
+                type_=sa.Float(),
+                existing_nullable=False,
+                postgresql_using=f"{column}::double precision",
+            )
+        op.execute(f"UPDATE {table} SET {column} = {column} * 1.0 / {_factor(currency_sql)}")
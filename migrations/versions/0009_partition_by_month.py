@@ -0,0 +1,111 @@
+"""monthly range partitions for transactions and ledger_entries
+
+Solo PostgreSQL: transactions y ledger_entries pasan a estar particionadas
+por RANGE (created_at), una partición por mes (`<tabla>_AAAA_MM`), desde el
+mes de la transacción más antigua hasta MONTHS_AHEAD meses adelante. Las
+PK pasan a (id, created_at) y la FK del ledger a (transaction_id,
+created_at), como exige PostgreSQL. Los datos se copian a las tablas
+nuevas, así que toma tiempo proporcional al historial y bloquea ambas
+tablas mientras corre.
+
+Después hay que crear las particiones de los meses siguientes con
+`python -m app.cli create-partitions` (cron). En otros motores no cambia
+nada: las tablas siguen sin particionar.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+# Orden de creación; se borran en el inverso (el ledger referencia a transactions).
+TABLES = ("transactions", "ledger_entries")
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_new(table: str, partitioned: bool):
+    # La tabla nueva se arma al lado con LIKE (mismas columnas y orden);
+    # _swap_tables la llena y la pone en lugar de la original. Índices y
+    # restricciones se crean al final con los nombres de siempre.
+    suffix = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(f"CREATE TABLE {table}_new (LIKE {table} INCLUDING DEFAULTS){suffix}")
+
+
+def _create_constraints(partitioned: bool):
+    key = ["id", "created_at"] if partitioned else ["id"]
+    op.create_primary_key("transactions_pkey", "transactions", key)
+    op.create_index("ix_transactions_created_at_status", "transactions", ["created_at", "status"])
+    op.create_primary_key("ledger_entries_pkey", "ledger_entries", key)
+    op.create_foreign_key(
+        "ledger_entries_transaction_id_fkey", "ledger_entries", "transactions",
+        ["transaction_id", "created_at"] if partitioned else ["transaction_id"], key,
+    )
+    op.create_foreign_key(
+        "ledger_entries_account_id_fkey", "ledger_entries", "accounts", ["account_id"], ["id"],
+    )
+    op.create_index(
+        "ix_ledger_entries_account_id_created_at", "ledger_entries",
+        ["account_id", "created_at", "transaction_id"],
+    )
+    op.create_index("ix_ledger_entries_transaction_id", "ledger_entries", ["transaction_id"])
+
+
+def _swap_tables():
+    for table in TABLES:
+        op.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+    for table in reversed(TABLES):
+        op.drop_table(table)
+    for table in TABLES:
+        op.rename_table(f"{table}_new", table)
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM transactions")).scalar()
+    now = datetime.utcnow()
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = _add_months(month, 1)
+
+    for table in TABLES:
+        _create_new(table, partitioned=True)
+        for month in months:
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table}_new"
+                f" FOR VALUES FROM ('{month:%Y-%m-%d}')"
+                f" TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+    _swap_tables()
+    _create_constraints(partitioned=True)
+
+
+def downgrade():
+    # Las particiones ya desprendidas por detach-old-partitions no vuelven:
+    # se reincorporan a mano (INSERT ... SELECT) si hace falta.
+    if not _is_postgresql():
+        return
+    for table in TABLES:
+        _create_new(table, partitioned=False)
+    _swap_tables()
+    _create_constraints(partitioned=False)
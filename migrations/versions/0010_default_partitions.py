@@ -0,0 +1,53 @@
+"""default partitions for transactions and ledger_entries
+
+Solo PostgreSQL con las tablas particionadas por 0009: agrega
+`<tabla>_default`, que recibe las filas de meses sin partición. Así un
+INSERT no falla si `python -m app.cli create-partitions` no corrió a
+tiempo; la siguiente corrida crea la partición del mes y mueve esas filas.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+TABLES = ("transactions", "ledger_entries")
+
+
+def _is_partitioned() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bool(bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table p"
+        " JOIN pg_class c ON c.oid = p.partrelid"
+        " WHERE c.relname = 'transactions'"
+    )).scalar())
+
+
+def upgrade():
+    if not _is_partitioned():
+        return
+    for table in TABLES:
+        op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def downgrade():
+    if not _is_partitioned():
+        return
+    bind = op.get_bind()
+    for table in reversed(TABLES):
+        if bind.execute(sa.text(f"SELECT EXISTS (SELECT 1 FROM {table}_default)")).scalar():
+            raise RuntimeError(
+                f"{table}_default has rows; run create-partitions before downgrading"
+            )
+        # La FK del ledger depende de cada partición de transactions: se
+        # desprende antes de borrarla.
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_default")
+        op.drop_table(f"{table}_default")
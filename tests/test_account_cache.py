@@ -0,0 +1,122 @@
+import pytest
+
+from app.application.banking_facade import BankingFacade
+from app.domain.enums import AccountStatus
+from app.domain.strategies.fee_strategy import NoFeeStrategy
+from app.domain.money import Money
+from app.repositories.cache import (
+    CACHE_REQUESTS,
+    InProcessCache,
+    LocalSharedStore,
+    SharedCache,
+    _to_cache,
+)
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["in-process", "shared"])
+def cache(request):
+    if request.param == "in-process":
+        return InProcessCache(max_entries=100, ttl=60)
+    return SharedCache(LocalSharedStore(), ttl=60)
+
+
+@pytest.fixture(params=["sql", "memory"])
+def make_facade(request, db_session, cache):
+    store = InMemoryStore()
+
+    def _make():
+        uow = SqlUnitOfWork(db_session) if request.param == "sql" else InMemoryUnitOfWork(store)
+        return BankingFacade(
+            unit_of_work=uow, fee_strategy=NoFeeStrategy(), risk_rules=[], account_cache=cache
+        )
+    return _make
+
+
+def _funded_account(facade, amount):
+    customer = facade.create_customer("Cache", "cache@example.com")
+    account = facade.create_account(customer.id)
+    facade.deposit(account.id, amount)
+    return account.id
+
+
+def test_in_process_cache_evicts_lru_and_expires():
+    clock = FakeClock()
+    cache = InProcessCache(max_entries=2, ttl=5, clock=clock)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+    clock.now = 5
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_shared_cache_entries_expire():
+    clock = FakeClock()
+    cache = SharedCache(LocalSharedStore(clock=clock), ttl=2)
+    cache.set("a", {"v": 1})
+    assert cache.get("a") == {"v": 1}
+    clock.now = 2
+    assert cache.get("a") is None
+
+
+def test_reads_hit_cache_until_a_write_commits(make_facade, cache):
+    account_id = _funded_account(make_facade(), 100.0)
+    hits = CACHE_REQUESTS.value(result="hit")
+    misses = CACHE_REQUESTS.value(result="miss")
+
+    assert make_facade().get_account(account_id).balance == Money.of(100, "USD")
+    assert make_facade().get_account(account_id).balance == Money.of(100, "USD")
+    assert CACHE_REQUESTS.value(result="hit") == hits + 1
+    assert CACHE_REQUESTS.value(result="miss") == misses + 1
+
+    make_facade().withdraw(account_id, 30.0)
+    assert make_facade().get_account(account_id).balance == Money.of(70, "USD")
+
+    # update() deja el estado nuevo en el cache en lugar de borrarlo.
+    make_facade().freeze_account(account_id)
+    hits = CACHE_REQUESTS.value(result="hit")
+    assert make_facade().get_account(account_id).status == AccountStatus.FROZEN
+    assert CACHE_REQUESTS.value(result="hit") == hits + 1
+
+
+def test_money_movements_ignore_stale_cache(make_facade, cache):
+    facade = make_facade()
+    account_id = _funded_account(facade, 100.0)
+    stale = facade.get_account(account_id)
+    stale.balance = Money.zero("USD")
+    cache.set(account_id, _to_cache(stale))
+
+    # Con el saldo cacheado (0) el retiro se rechazaría; se valida contra el real.
+    make_facade().withdraw(account_id, 60.0)
+    assert make_facade().get_account(account_id).balance == Money.of(40, "USD")
+
+
+def test_rollback_does_not_cache_uncommitted_state(make_facade, cache):
+    account_id = _funded_account(make_facade(), 100.0)
+    facade = make_facade()
+    facade.get_account(account_id)
+
+    with pytest.raises(RuntimeError):
+        with facade.uow:
+            facade.account_repo.credit(account_id, Money.of(500, "USD"))
+            # Lee su propio crédito sin confirmar: no debe llegar al cache.
+            assert facade.get_account(account_id).balance == Money.of(600, "USD")
+            raise RuntimeError("boom")
+
+    assert cache.get(account_id) is None
+    assert make_facade().get_account(account_id).balance == Money.of(100, "USD")
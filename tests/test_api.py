@@ -1,10 +1,19 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.repositories import unit_of_work
+from app.repositories.memory import InMemoryStore
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def memory_backend(monkeypatch):
+    # La API completa sobre el backend en memoria: no necesita Postgres.
+    monkeypatch.setattr(unit_of_work, "REPOSITORY_BACKEND", "memory")
+    monkeypatch.setattr(unit_of_work, "MEMORY_STORE", InMemoryStore())
+
+
 def test_deposit_happy_path():
     # Crear cliente
     res = client.post("/customers", json={"name": "Test User", "email": "test_deposit@example.com"})
@@ -22,12 +31,12 @@ def test_deposit_happy_path():
     data = res.json()
     assert data["type"] == "DEPOSIT"
     assert data["status"] == "APPROVED"
-    assert data["amount"] == 500.0
+    assert data["amount"] == "500.00"
 
     # Verificar saldo (500 - 1.5% fee = 492.50)
     res = client.get(f"/accounts/{account_id}")
     assert res.status_code == 200
-    assert res.json()["balance"] == 492.5
+    assert res.json()["balance"] == "492.50"
 
 
 def test_transfer_happy_path():
@@ -61,4 +70,14 @@ def test_transfer_happy_path():
 
     # Verificar que el receptor recibió 200
     res = client.get(f"/accounts/{to_account}")
-    assert res.json()["balance"] == 200.0
\ No newline at end of file
+    assert res.json()["balance"] == "200.00"
+
+def test_amount_with_more_decimals_than_currency_is_rejected():
+    customer_id = client.post("/customers", json={"name": "Cents", "email": "cents@example.com"}).json()["id"]
+    account_id = client.post("/accounts", json={"customer_id": customer_id, "currency": "USD"}).json()["id"]
+
+    res = client.post("/transactions/deposit", json={"account_id": account_id, "amount": 10.005})
+    assert res.status_code == 400
+    res = client.post("/transactions/deposit", json={"account_id": account_id, "amount": 10.05})
+    assert res.status_code == 200
+    assert res.json()["amount"] == "10.05"
@@ -0,0 +1,137 @@
+from datetime import datetime
+
+import pytest
+
+from app.domain.entities.account import Account
+from app.domain.entities.customer import Customer
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import Direction, TransactionStatus, TransactionType
+from app.domain.factories.ledger_entry_factory import LedgerEntryFactory
+from app.domain.ids import new_id
+from app.domain.money import Money
+from app.repositories.implementations import SqlLedgerRepository, SqlTransactionRepository
+from app.repositories.models import LedgerEntryModel, TransactionModel
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.repositories.archive import ParquetLedgerArchive, archive_expired_months  # noqa: E402
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def _seed(uow, account_ids, created_ats):
+    customer_id = new_id()
+    uow.customers.save(Customer(id=customer_id, name="Test", email="archive@example.com"))
+    for account_id in set(account_ids):
+        uow.accounts.save(Account(id=account_id, customer_id=customer_id, currency="USD"))
+    for i, created_at in enumerate(created_ats):
+        tx = Transaction(
+            id=new_id(), type=TransactionType.TRANSFER, amount=Money.of(i + 1, "USD"),
+            currency="USD", status=TransactionStatus.APPROVED, created_at=created_at,
+        )
+        uow.transactions.save(tx)
+        for account_id, direction in zip(account_ids, (Direction.DEBIT, Direction.CREDIT)):
+            uow.ledger.save(LedgerEntryFactory.create(
+                account_id=account_id, transaction_id=tx.id, direction=direction,
+                amount=tx.amount, created_at=tx.created_at,
+            ))
+    uow.commit()
+
+
+def _drop_archived(db, archive):
+    # Como después de desprender las particiones: lo archivado ya no está en la BD.
+    until = archive.archived_until()
+    db.query(LedgerEntryModel).filter(LedgerEntryModel.created_at < until).delete()
+    db.query(TransactionModel).filter(TransactionModel.created_at < until).delete()
+    db.commit()
+
+
+def test_archived_history_is_read_from_files(db_session, tmp_path):
+    uow = SqlUnitOfWork(db_session)
+    source, target = new_id(), new_id()
+    _seed(uow, [source, target], [
+        datetime(2026, 5, 3), datetime(2026, 5, 20), datetime(2026, 7, 1),
+        datetime(2026, 9, 30), datetime(2026, 10, 2),
+    ])
+    expected = uow.transactions.get_by_account_id(target)
+
+    archive = ParquetLedgerArchive(str(tmp_path), ranges=4)
+    archived = archive_expired_months(db_session, archive, keep_months=1, now=NOW)
+    assert archived == [datetime(2026, m, 1) for m in (5, 6, 7, 8)]
+    assert archive.archived_until() == datetime(2026, 9, 1)
+    # Idempotente: los meses ya archivados no se vuelven a exportar.
+    assert archive_expired_months(db_session, archive, keep_months=1, now=NOW) == []
+
+    _drop_archived(db_session, archive)
+
+    transactions = SqlTransactionRepository(db_session, archive=archive)
+    assert transactions.get_by_account_id(target) == expected
+    assert len(transactions.get_by_account_id(source)) == 5
+    assert transactions.get_by_account_id(new_id()) == []
+
+
+def test_same_account_transfer_is_listed_once(db_session, tmp_path):
+    uow = SqlUnitOfWork(db_session)
+    account_id = new_id()
+    _seed(uow, [account_id, account_id], [datetime(2026, 1, 15)])
+
+    archive = ParquetLedgerArchive(str(tmp_path), ranges=2)
+    archive_expired_months(db_session, archive, keep_months=3, now=NOW)
+    assert len(archive.transactions_for_account(account_id)) == 1
+
+
+def test_pages_and_export_continue_into_the_archive(db_session, tmp_path):
+    uow = SqlUnitOfWork(db_session)
+    source, target = new_id(), new_id()
+    _seed(uow, [source, target], [
+        datetime(2026, 5, 3), datetime(2026, 5, 3), datetime(2026, 6, 20),
+        datetime(2026, 8, 1), datetime(2026, 9, 30), datetime(2026, 10, 2),
+    ])
+    # Dos transacciones en el mismo instante: las páginas desempatan por id.
+    expected = sorted(
+        uow.transactions.get_by_account_id(target), key=lambda t: (t.created_at, t.id), reverse=True,
+    )
+    entries = list(uow.ledger.iter_by_account_id(target))
+
+    archive = ParquetLedgerArchive(str(tmp_path), ranges=2)
+    archive_expired_months(db_session, archive, keep_months=1, now=NOW, batch_size=2)
+    _drop_archived(db_session, archive)
+    transactions = SqlTransactionRepository(db_session, archive=archive)
+
+    # Hacia atrás: las páginas cruzan de la BD al archivo sin saltear ni repetir.
+    pages, before = [], None
+    while True:
+        page = transactions.get_page_by_account_id(target, limit=4, before=before)
+        if not page:
+            break
+        pages.append(page)
+        before = (page[-1].created_at, page[-1].id)
+    assert [len(p) for p in pages] == [4, 2]
+    assert [t for p in pages for t in p] == expected
+
+    # Hacia adelante desde la más vieja: del archivo a la BD.
+    oldest = expected[-1]
+    page = transactions.get_page_by_account_id(
+        target, limit=4, after=(oldest.created_at, oldest.id),
+    )
+    assert page == expected[1:5]
+    assert transactions.get_page_by_account_id(
+        target, limit=10, tx_type=TransactionType.DEPOSIT,
+    ) == []
+
+    ledger = SqlLedgerRepository(db_session, archive=archive)
+    assert list(ledger.iter_by_account_id(target)) == entries
+
+
+def test_each_batch_is_one_row_group(db_session, tmp_path):
+    uow = SqlUnitOfWork(db_session)
+    account_id = new_id()
+    _seed(uow, [account_id], [datetime(2026, 3, d) for d in range(1, 6)])
+
+    archive = ParquetLedgerArchive(str(tmp_path), ranges=1)
+    archive_expired_months(db_session, archive, keep_months=3, now=NOW, batch_size=2)
+    parquet = pq.ParquetFile(str(tmp_path / "2026_03" / "accounts_000.parquet"))
+    assert [parquet.metadata.row_group(i).num_rows for i in range(parquet.metadata.num_row_groups)] == [2, 2, 1]
+    assert len(archive.transactions_for_account(account_id)) == 5
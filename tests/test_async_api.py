@@ -0,0 +1,94 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.application import async_routes
+from app.application.async_routes import router
+from app.repositories.async_database import get_async_db, get_async_session_factory, to_async_url
+from app.repositories.database import Base, get_session_factory
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    session_factory = async_sessionmaker(create_async_engine(to_async_url(url)), autoflush=False)
+
+    async def _get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = _get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    # Exports e idempotencia usan sesiones sync sobre la misma BD.
+    sync_factory = sessionmaker(autoflush=False, bind=sync_engine)
+    app.dependency_overrides[get_session_factory] = lambda: sync_factory
+    return TestClient(app)
+
+
+def test_async_deposit_and_history(async_client):
+    customer_id = async_client.post("/customers", json={"name": "Async", "email": "async@example.com"}).json()["id"]
+    account_id = async_client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+
+    res = async_client.post("/transactions/deposit", json={"account_id": account_id, "amount": 500.0})
+
+    assert res.status_code == 200
+    assert async_client.get(f"/accounts/{account_id}").json()["balance"] == "492.50"
+    history = async_client.get(f"/accounts/{account_id}/transactions").json()
+    assert history["total_count"] == 1
+
+
+def test_async_errors_map_to_http_status(async_client):
+    assert async_client.get("/accounts/missing").status_code == 404
+    res = async_client.post("/transactions/withdraw", json={"account_id": "missing", "amount": 1.0})
+    assert res.status_code == 404
+
+
+def test_async_deposit_is_idempotent(async_client):
+    customer_id = async_client.post("/customers", json={"name": "Async", "email": "idem@example.com"}).json()["id"]
+    account_id = async_client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+    headers = {"Idempotency-Key": "async-dep-1"}
+
+    first = async_client.post("/transactions/deposit", json={"account_id": account_id, "amount": 100.0}, headers=headers)
+    again = async_client.post("/transactions/deposit", json={"account_id": account_id, "amount": 100.0}, headers=headers)
+
+    assert again.json()["id"] == first.json()["id"]
+    assert async_client.get(f"/accounts/{account_id}").json()["balance"] == "98.50"
+
+
+def test_shared_read_uses_its_own_session(async_client, tmp_path):
+    customer_id = async_client.post("/customers", json={"name": "Async", "email": "flight@example.com"}).json()["id"]
+    account_id = async_client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+    engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'async.db'}"))
+    factory = async_sessionmaker(engine, autoflush=False)
+    opened = []
+
+    @asynccontextmanager
+    async def tracked_factory():
+        async with factory() as db:
+            opened.append(db)
+            yield db
+            # Más lento que el request que la inició, que se cancela antes.
+            await asyncio.sleep(0.02)
+
+    async def scenario():
+        leader = asyncio.ensure_future(async_routes.get_account(account_id, tracked_factory))
+        follower = asyncio.ensure_future(async_routes.get_account(account_id, tracked_factory))
+        await asyncio.sleep(0)
+        leader.cancel()
+        response = await follower
+        await engine.dispose()
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.id == account_id
+    assert len(opened) == 1
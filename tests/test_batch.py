@@ -0,0 +1,41 @@
+from sqlalchemy import event
+
+
+def _new_account(client, email):
+    customer_id = client.post("/customers", json={"name": "Payroll", "email": email}).json()["id"]
+    return client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+
+
+def test_batch_applies_items_in_order_with_per_item_results(client, engine):
+    payer = _new_account(client, "payer@example.com")
+    payee = _new_account(client, "payee@example.com")
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    res = client.post("/transactions/batch", json={"items": [
+        {"type": "DEPOSIT", "account_id": payer, "amount": 1000.0},
+        {"type": "TRANSFER", "from_account_id": payer, "to_account_id": payee, "amount": 300.0},
+        {"type": "WITHDRAW", "account_id": payee, "amount": 5000.0},
+        {"type": "DEPOSIT", "account_id": "missing", "amount": 10.0},
+        {"type": "WITHDRAW", "account_id": payee, "amount": 100.0},
+    ]})
+
+    assert res.status_code == 200
+    body = res.json()
+    assert [r["success"] for r in body["results"]] == [True, True, False, False, True]
+    assert body["results"][2]["error"] == "Insufficient balance"
+    assert (body["approved_count"], body["rejected_count"]) == (3, 2)
+    assert len(commits) == 1
+
+    # 1000 - 15 de fee, menos 300 + 4.5 de la transferencia
+    assert client.get(f"/accounts/{payer}").json()["balance"] == "680.50"
+    assert client.get(f"/accounts/{payee}").json()["balance"] == "198.50"
+    history = client.get(f"/accounts/{payee}/transactions").json()
+    assert [tx["type"] for tx in history["transactions"]] == ["WITHDRAW", "TRANSFER"]
+
+
+def test_batch_item_validation(client):
+    res = client.post("/transactions/batch", json={"items": [
+        {"type": "TRANSFER", "account_id": "a", "amount": 10.0},
+    ]})
+    assert res.status_code == 422
@@ -0,0 +1,28 @@
+import json
+
+from benchmarks.suite import compare, main
+
+
+def test_suite_runs_on_memory_backend_and_writes_json(tmp_path):
+    output = tmp_path / "results.json"
+
+    code = main([
+        "--backend", "memory", "--customers", "2", "--ledger-depth", "5",
+        "--ops", "5", "--warmup", "1", "--output", str(output),
+    ])
+
+    assert code == 0
+    report = json.loads(output.read_text())
+    scenarios = {r["scenario"] for r in report["results"]}
+    assert {"facade.deposit", "facade.transfer", "http.list_transactions"} <= scenarios
+    assert all(r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"] for r in report["results"])
+
+
+def test_compare_flags_more_statements_and_slower_p95():
+    baseline = {"results": [{"scenario": "facade.deposit", "statements_per_op": 7.0, "p95_ms": 10.0}]}
+
+    same = [{"scenario": "facade.deposit", "statements_per_op": 7.0, "p95_ms": 11.0}]
+    worse = [{"scenario": "facade.deposit", "statements_per_op": 8.0, "p95_ms": 20.0}]
+
+    assert compare(same, baseline, tolerance=0.25) == []
+    assert len(compare(worse, baseline, tolerance=0.25)) == 2
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.application.banking_facade import BankingFacade
+from app.application.retry import RETRIES, RETRIES_EXHAUSTED, RetryPolicy
+from app.domain.enums import AccountStatus
+from app.domain.exceptions import ConcurrentUpdateError, InsufficientFundsError
+from app.domain.strategies.fee_strategy import NoFeeStrategy
+from app.domain.money import Money
+from app.repositories.database import Base
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # SQLite en archivo: cada hilo abre su propia conexión y las escrituras
+    # compiten de verdad por el lock de la BD.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _enable_fks(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _facade(session):
+    return BankingFacade(
+        unit_of_work=SqlUnitOfWork(session),
+        fee_strategy=NoFeeStrategy(),
+        risk_rules=[],
+    )
+
+
+def _funded_account(session_factory, balance):
+    with session_factory() as session:
+        facade = _facade(session)
+        customer = facade.create_customer("Race", "race@example.com")
+        account = facade.create_account(customer.id)
+        facade.deposit(account.id, balance)
+    return account.id
+
+
+def _run_threads(session_factory, workers, job):
+    outcomes = []
+    lock = threading.Lock()
+    start = threading.Barrier(workers)
+
+    def run():
+        start.wait()
+        with session_factory() as session:
+            result = job(_facade(session))
+        with lock:
+            outcomes.extend(result)
+
+    threads = [threading.Thread(target=run) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return outcomes
+
+
+def test_concurrent_withdrawals_do_not_lose_updates(session_factory):
+    account_id = _funded_account(session_factory, 1000.0)
+
+    def job(facade):
+        for _ in range(25):
+            facade.withdraw(account_id, 1.0)
+        return []
+
+    _run_threads(session_factory, 8, job)
+
+    with session_factory() as session:
+        assert _facade(session).get_account(account_id).balance == Money.of(800, "USD")
+
+
+def test_concurrent_overdraw_never_goes_negative(session_factory):
+    account_id = _funded_account(session_factory, 1000.0)
+
+    def job(facade):
+        try:
+            facade.withdraw(account_id, 150.0)
+            return ["ok"]
+        except InsufficientFundsError:
+            return ["rejected"]
+
+    outcomes = _run_threads(session_factory, 10, job)
+
+    assert outcomes.count("ok") == 6
+    assert outcomes.count("rejected") == 4
+    with session_factory() as session:
+        assert _facade(session).get_account(account_id).balance == Money.of(100, "USD")
+
+
+def test_stale_account_update_is_rejected(session_factory):
+    account_id = _funded_account(session_factory, 100.0)
+    with session_factory() as first, session_factory() as second:
+        stale = SqlUnitOfWork(first).accounts.get_by_id(account_id)
+        _facade(second).withdraw(account_id, 40.0)
+
+        stale.freeze()
+        with pytest.raises(ConcurrentUpdateError):
+            SqlUnitOfWork(first).accounts.update(stale)
+        first.rollback()
+
+    with session_factory() as session:
+        account = _facade(session).get_account(account_id)
+    assert (account.balance, account.status) == (Money.of(60, "USD"), AccountStatus.ACTIVE)
+
+
+def test_freeze_retries_after_concurrent_withdrawal(session_factory):
+    account_id = _funded_account(session_factory, 100.0)
+    retries_before = RETRIES.value(operation="freeze_account")
+
+    with session_factory() as session:
+        facade = _facade(session)
+        facade.retry_policy = RetryPolicy(sleep=lambda _: None)
+        read_account = facade._load_account
+        interleaved = []
+
+        def load_account_then_race(account_id):
+            account = read_account(account_id)
+            if not interleaved:
+                # Un retiro concurrente entre la lectura y el CAS del freeze.
+                interleaved.append(True)
+                with session_factory() as other:
+                    _facade(other).withdraw(account_id, 30.0)
+            return account
+
+        facade._load_account = load_account_then_race
+        frozen = facade.freeze_account(account_id)
+
+    assert frozen.status == AccountStatus.FROZEN
+    assert RETRIES.value(operation="freeze_account") == retries_before + 1
+    with session_factory() as session:
+        account = _facade(session).get_account(account_id)
+    # El freeze no pisó el saldo del retiro concurrente.
+    assert (account.balance, account.status) == (Money.of(70, "USD"), AccountStatus.FROZEN)
+
+
+def test_retry_policy_gives_up_after_max_attempts():
+    calls = []
+    exhausted_before = RETRIES_EXHAUSTED.value(operation="test")
+
+    def always_conflicts():
+        calls.append(1)
+        raise ConcurrentUpdateError("conflict")
+
+    with pytest.raises(ConcurrentUpdateError):
+        RetryPolicy(max_attempts=4, sleep=lambda _: None).run("test", always_conflicts)
+    assert len(calls) == 4
+    assert RETRIES_EXHAUSTED.value(operation="test") == exhausted_before + 1
+
+
+def test_retry_backoff_yields_event_loop_inside_run_sync():
+    # Con API_MODE=async el facade corre en AsyncSession.run_sync: la espera
+    # entre intentos no debe bloquear el event loop.
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    ticks = []
+
+    def conflicts_once(_session):
+        def attempt():
+            if not ticks:
+                ticks.append("attempt")
+                raise ConcurrentUpdateError("conflict")
+            ticks.append("retry")
+            return "ok"
+        return RetryPolicy(base_delay=0.05, max_delay=0.05).run("test", attempt)
+
+    async def ticker():
+        for _ in range(3):
+            await asyncio.sleep(0.005)
+            ticks.append("tick")
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with AsyncSession(engine) as session:
+            # El jitter puede elegir 0; se fija el delay para que la espera exista.
+            with patch("app.application.retry.random.uniform", return_value=0.05):
+                result, _ = await asyncio.gather(session.run_sync(conflicts_once), ticker())
+        await engine.dispose()
+        return result
+
+    assert asyncio.run(main()) == "ok"
+    # El ticker corrió mientras el reintento esperaba.
+    assert ticks == ["attempt", "tick", "tick", "tick", "retry"]
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from app.application.container import AppContainer, BankSettings, InvalidBankSettings
+from app.domain.exceptions import RiskRejectedError
+from app.domain.money import Money
+from app.domain.strategies.risk_strategy import MaxAmountRule
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+
+USD_100 = Money.of(100, "USD")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write(path, settings: dict, mtime: float):
+    path.write_text(json.dumps(settings))
+    os.utime(path, (mtime, mtime))
+
+
+def test_facades_share_process_wide_strategies():
+    container = AppContainer(config_file=None)
+    store = InMemoryStore()
+    first = container.facade(InMemoryUnitOfWork(store))
+    second = container.facade(InMemoryUnitOfWork(store))
+
+    assert first.uow is not second.uow
+    assert first.fee_strategy is second.fee_strategy
+    assert first.retry_policy is second.retry_policy
+    assert [type(rule) for rule in first.risk_rules][0] is MaxAmountRule
+    assert container.strategies.settings == BankSettings()
+
+
+def test_config_file_changes_are_reloaded(tmp_path):
+    config = tmp_path / "bank.json"
+    _write(config, {"fee_percent": 0.01, "max_amount": 500}, mtime=1000)
+    clock = FakeClock()
+    container = AppContainer(config_file=str(config), check_interval=5, clock=clock)
+    store = InMemoryStore()
+    facade = container.facade(InMemoryUnitOfWork(store))
+    assert facade.fee_strategy.calculate(USD_100) == Money.of(1, "USD")
+
+    _write(config, {"fee_percent": 0.02, "max_amount": 50}, mtime=2000)
+    # Antes del intervalo no se mira el archivo.
+    assert container.facade(InMemoryUnitOfWork(store)).fee_strategy.calculate(USD_100) == Money.of(1, "USD")
+
+    clock.now = 5
+    reloaded = container.facade(InMemoryUnitOfWork(store))
+    assert reloaded.fee_strategy.calculate(USD_100) == Money.of(2, "USD")
+    with pytest.raises(RiskRejectedError):
+        reloaded._run_risk_checks(USD_100, "any-account")
+    # Un facade ya construido sigue con la versión con la que empezó.
+    assert facade.fee_strategy.calculate(USD_100) == Money.of(1, "USD")
+
+
+def test_invalid_reload_keeps_current_settings(tmp_path):
+    config = tmp_path / "bank.json"
+    _write(config, {"fee_percent": 0.01}, mtime=1000)
+    container = AppContainer(config_file=str(config))
+    current = container.strategies
+
+    _write(config, {"fee_percent": 1.5}, mtime=2000)
+    assert container.reload() is False
+    assert container.strategies is current
+
+    config.write_text("{not json")
+    assert container.reload() is False
+    assert container.strategies is current
+
+
+def test_invalid_config_fails_at_startup(tmp_path):
+    config = tmp_path / "bank.json"
+    config.write_text(json.dumps({"max_amount": 100, "typo_limit": 1}))
+    with pytest.raises(InvalidBankSettings):
+        AppContainer(config_file=str(config))
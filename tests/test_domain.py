@@ -1,6 +1,12 @@
+import uuid
+from types import SimpleNamespace
+
 import pytest
+
 from app.domain.entities.account import Account
 from app.domain.enums import AccountStatus
+from app.domain.ids import is_valid_id, new_id
+from app.domain.money import Money
 from app.domain.exceptions import (
     InsufficientFundsError,
     AccountFrozenError,
@@ -12,12 +18,12 @@ def test_withdraw_insufficient_funds():
         id="1",
         customer_id="cust1",
         currency="USD",
-        balance=100.0,
+        balance=Money.of(100, "USD"),
         status=AccountStatus.ACTIVE,
     )
 
     with pytest.raises(InsufficientFundsError):
-        account.withdraw(200.0)
+        account.withdraw(Money.of(200, "USD"))
 
 
 def test_account_frozen_cannot_withdraw():
@@ -25,9 +31,35 @@ def test_account_frozen_cannot_withdraw():
         id="1",
         customer_id="cust1",
         currency="USD",
-        balance=100.0,
+        balance=Money.of(100, "USD"),
         status=AccountStatus.FROZEN,
     )
 
     with pytest.raises(AccountFrozenError):
-        account.withdraw(50.0)
\ No newline at end of file
+        account.withdraw(Money.of(50, "USD"))
+
+def test_new_id_is_uuid7_and_increasing():
+    ids = [new_id() for _ in range(1000)]
+
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(uuid.UUID(i).version == 7 for i in ids)
+    assert is_valid_id(ids[0])
+    assert not is_valid_id("a1")
+
+
+def test_new_id_never_repeats_across_a_month_boundary(monkeypatch):
+    # En PostgreSQL particionado la PK es (id, created_at) y nada impide el
+    # mismo id en dos meses: la unicidad depende de new_id. Un reloj que
+    # vuelve atrás cruzando el cambio de mes no debe repetir ids.
+    from app.domain import ids
+
+    month_end = 1_793_491_200_000  # 2026-11-01T00:00:00Z en ms
+    clock = iter([month_end - 1, month_end, month_end + 1, month_end - 5, month_end - 1])
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids, "_sequence", 0)
+    monkeypatch.setattr(ids, "time", SimpleNamespace(time_ns=lambda: next(clock) * 1_000_000))
+
+    generated = [new_id() for _ in range(5)]
+    assert len(set(generated)) == 5
+    assert generated == sorted(generated)
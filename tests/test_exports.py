@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+from app.application.exports import ledger_ndjson
+from app.domain.entities.ledger_entry import LedgerEntry
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import Direction, TransactionType
+from app.domain.ids import new_id
+from app.domain.money import Money
+
+
+def _account_with_history(client):
+    customer_id = client.post("/customers", json={"name": "Recon", "email": "recon@example.com"}).json()["id"]
+    account_id = client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+    client.post("/transactions/deposit", json={"account_id": account_id, "amount": 100.0})
+    client.post("/transactions/withdraw", json={"account_id": account_id, "amount": 20.0})
+    return account_id
+
+
+def test_export_ledger_ndjson(client):
+    account_id = _account_with_history(client)
+
+    res = client.get(f"/accounts/{account_id}/ledger/export", params={"format": "ndjson"})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [(r["type"], r["direction"]) for r in rows] == [
+        ("DEPOSIT", "CREDIT"), ("WITHDRAW", "DEBIT"),
+    ]
+
+
+def test_export_ledger_csv(client):
+    account_id = _account_with_history(client)
+
+    res = client.get(f"/accounts/{account_id}/ledger/export", params={"format": "csv"})
+
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert [r["direction"] for r in rows] == ["CREDIT", "DEBIT"]
+    assert rows[0]["amount"] == "98.50"
+
+
+def test_export_unknown_account(client):
+    assert client.get("/accounts/missing/ledger/export").status_code == 404
+
+
+def test_export_keeps_every_cent_of_large_amounts():
+    # 2**53 + 1 centavos no tiene representación exacta como float.
+    amount = Money(2**53 + 1, "USD")
+    entry = LedgerEntry(
+        id=new_id(), account_id=new_id(), transaction_id=new_id(),
+        direction=Direction.CREDIT, amount=amount,
+    )
+    transaction = Transaction(
+        id=entry.transaction_id, type=TransactionType.DEPOSIT, amount=amount, currency="USD",
+    )
+
+    row = json.loads(next(ledger_ndjson([(entry, transaction)])))
+
+    assert row["amount"] == "90071992547409.93"
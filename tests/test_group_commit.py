@@ -0,0 +1,135 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from app.application import group_commit
+from app.application.banking_facade import BankingFacade, BatchOperation
+from app.application.group_commit import GroupCommitter
+from app.domain.enums import TransactionStatus, TransactionType
+from app.domain.exceptions import ConcurrentUpdateError, InsufficientFundsError
+from app.domain.strategies.fee_strategy import NoFeeStrategy
+from app.domain.money import Money
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+
+
+@pytest.fixture
+def store():
+    return InMemoryStore()
+
+
+@pytest.fixture
+def commits():
+    return []
+
+
+class PoisonFee(NoFeeStrategy):
+    # Falla con un error que no es de dominio: rompe el lote completo.
+    def calculate_minor(self, minor: int, currency: str) -> int:
+        if Money(minor, currency) == Money.of(13, "USD"):
+            raise RuntimeError("fee backend down")
+        return super().calculate_minor(minor, currency)
+
+
+@pytest.fixture
+def committer(store, commits):
+    @contextmanager
+    def facade_scope():
+        commits.append(1)
+        yield BankingFacade(
+            unit_of_work=InMemoryUnitOfWork(store), fee_strategy=PoisonFee(), risk_rules=[]
+        )
+    return GroupCommitter(facade_scope, window=0.05, max_items=64)
+
+
+def _account(store, balance=0.0):
+    facade = BankingFacade(
+        unit_of_work=InMemoryUnitOfWork(store), fee_strategy=NoFeeStrategy(), risk_rules=[]
+    )
+    customer = facade.create_customer("Group", f"group-{len(store.customers)}@example.com")
+    account = facade.create_account(customer.id)
+    if balance:
+        facade.deposit(account.id, balance)
+    return account.id, facade
+
+
+def _submit_concurrently(committer, operations):
+    results = [None] * len(operations)
+
+    def submit(i, op):
+        try:
+            results[i] = committer.submit(op)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=submit, args=(i, op)) for i, op in enumerate(operations)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_deposits_share_commits(store, committer, commits):
+    account_id, facade = _account(store)
+    results = _submit_concurrently(
+        committer, [BatchOperation(TransactionType.DEPOSIT, 10.0, account_id)] * 20
+    )
+
+    assert all(tx.status == TransactionStatus.APPROVED for tx in results)
+    assert len({tx.id for tx in results}) == 20
+    assert len(commits) < 20
+    assert facade.get_account(account_id).balance == Money.of(200, "USD")
+
+
+def test_failed_item_does_not_affect_the_batch(store, committer):
+    rich, facade = _account(store, balance=100.0)
+    poor, _ = _account(store)
+    results = _submit_concurrently(committer, [
+        BatchOperation(TransactionType.WITHDRAW, 30.0, rich),
+        BatchOperation(TransactionType.WITHDRAW, 30.0, poor),
+        # Rompe el lote completo: se reintenta ítem por ítem y solo falla ese.
+        BatchOperation(TransactionType.DEPOSIT, 13.0, rich),
+        BatchOperation(TransactionType.TRANSFER, 20.0, rich, poor),
+    ])
+
+    assert results[0].status == TransactionStatus.APPROVED
+    assert isinstance(results[1], InsufficientFundsError)
+    assert isinstance(results[2], RuntimeError)
+    assert results[3].status == TransactionStatus.APPROVED
+    assert facade.get_account(rich).balance == Money.of(50, "USD")
+    assert facade.get_account(poor).balance == Money.of(20, "USD")
+
+
+def test_api_movements_go_through_group_commit(client, monkeypatch):
+    monkeypatch.setattr(group_commit, "GROUP_COMMIT_WINDOW_MS", 1.0)
+    group_commit._committer_for.cache_clear()
+
+    customer = client.post("/customers", json={"name": "GC", "email": "gc@example.com"}).json()
+    account = client.post("/accounts", json={"customer_id": customer["id"]}).json()
+    res = client.post("/transactions/deposit", json={"account_id": account["id"], "amount": 100.0})
+    assert res.status_code == 200
+    assert res.json()["type"] == "DEPOSIT"
+
+    res = client.post("/transactions/withdraw", json={"account_id": account["id"], "amount": 500.0})
+    assert res.status_code == 400
+
+    assert client.get(f"/accounts/{account['id']}").json()["balance"] == "98.50"
+    assert group_commit._committer_for.cache_info().currsize == 1
+    group_commit._committer_for.cache_clear()
+
+
+def test_api_maps_exhausted_conflict_to_409(client, monkeypatch):
+    monkeypatch.setattr(group_commit, "GROUP_COMMIT_WINDOW_MS", 1.0)
+    group_commit._committer_for.cache_clear()
+
+    def conflict(self, operation):
+        raise ConcurrentUpdateError("conflict")
+
+    monkeypatch.setattr(GroupCommitter, "submit", conflict)
+    customer = client.post("/customers", json={"name": "GC", "email": "gc409@example.com"}).json()
+    account = client.post("/accounts", json={"customer_id": customer["id"]}).json()
+
+    res = client.post("/transactions/deposit", json={"account_id": account["id"], "amount": 100.0})
+    assert res.status_code == 409
+    group_commit._committer_for.cache_clear()
@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.application.dtos import AccountDeposit, TransactionResponse
+from app.application.idempotency import (
+    IdempotencyStore,
+    KeyReusedError,
+    request_fingerprint,
+    run_idempotent,
+)
+from app.domain.entities.idempotency_record import IdempotencyRecord
+from app.repositories.database import Base
+from app.repositories.implementations import SqlIdempotencyRepository
+
+
+def _new_account(client, email):
+    customer_id = client.post("/customers", json={"name": "Retry", "email": email}).json()["id"]
+    return client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+
+
+def test_repeated_deposit_is_replayed_not_applied_twice(client, engine):
+    account_id = _new_account(client, "retry@example.com")
+    body = {"account_id": account_id, "amount": 100.0}
+    headers = {"Idempotency-Key": "dep-1"}
+
+    first = client.post("/transactions/deposit", json=body, headers=headers)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    again = client.post("/transactions/deposit", json=body, headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers["Idempotent-Replayed"] == "true"
+    # El reintento se respondió desde el LRU, sin tocar la BD.
+    assert statements == []
+    assert client.get(f"/accounts/{account_id}").json()["balance"] == "98.50"
+
+
+def test_key_reused_with_other_body_is_rejected(client):
+    account_id = _new_account(client, "reuse@example.com")
+    headers = {"Idempotency-Key": "dep-2"}
+    client.post("/transactions/deposit", json={"account_id": account_id, "amount": 100.0}, headers=headers)
+
+    res = client.post("/transactions/deposit", json={"account_id": account_id, "amount": 200.0}, headers=headers)
+
+    assert res.status_code == 422
+
+
+def test_business_rejection_is_replayed(client):
+    account_id = _new_account(client, "broke@example.com")
+    headers = {"Idempotency-Key": "wd-1"}
+    body = {"account_id": account_id, "amount": 50.0}
+
+    first = client.post("/transactions/withdraw", json=body, headers=headers)
+    client.post("/transactions/deposit", json={"account_id": account_id, "amount": 500.0})
+    again = client.post("/transactions/withdraw", json=body, headers=headers)
+
+    assert first.status_code == again.status_code == 400
+    assert again.json() == first.json()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'idempotency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("same_process", [True, False])
+def test_concurrent_duplicates_execute_once(session_factory, same_process):
+    # Mismo proceso: comparten store (espera por Event). Procesos distintos:
+    # cada uno con su store y su LRU (espera encuestando la fila reservada).
+    first = IdempotencyStore(session_factory, poll_interval=0.01)
+    second = first if same_process else IdempotencyStore(session_factory, poll_interval=0.01)
+    dto = AccountDeposit(account_id="acc", amount=10.0)
+    executions, responses = [], []
+    start = threading.Barrier(2)
+
+    def execute():
+        executions.append(1)
+        time.sleep(0.2)
+        return TransactionResponse(
+            id="tx-1", type="DEPOSIT", amount=10.0, currency="USD", status="APPROVED",
+        )
+
+    def request(store):
+        start.wait()
+        responses.append(run_idempotent(store, "dup-1", request_fingerprint("deposit", dto), execute))
+
+    threads = [threading.Thread(target=request, args=(store,)) for store in (first, second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(executions) == 1
+    original = next(r for r in responses if isinstance(r, TransactionResponse))
+    replayed = next(r for r in responses if not isinstance(r, TransactionResponse))
+    assert json.loads(replayed.body)["id"] == original.id
+
+
+def test_expired_keys_are_purged(session_factory):
+    now = datetime.utcnow()
+    with session_factory() as db:
+        repo = SqlIdempotencyRepository(db)
+        repo.add(IdempotencyRecord(key="old", request_hash="h", expires_at=now - timedelta(seconds=1)))
+        repo.add(IdempotencyRecord(key="new", request_hash="h", expires_at=now + timedelta(hours=1)))
+        db.commit()
+
+        assert repo.delete_expired(now) == 1
+        db.commit()
+        assert repo.get("old") is None and repo.get("new") is not None
+
+
+def test_store_rejects_reused_key(session_factory):
+    store = IdempotencyStore(session_factory)
+    assert store.begin("k", "hash-a") is None
+    store.finish("k", 200, {"ok": True})
+
+    assert store.begin("k", "hash-a").response_body == {"ok": True}
+    with pytest.raises(KeyReusedError):
+        store.begin("k", "hash-b")
+
+
+def test_reformatted_amount_is_the_same_request():
+    fingerprints = {
+        request_fingerprint("deposit", AccountDeposit(account_id="acc", amount=amount))
+        for amount in ("10", "10.0", 10.00, "10.000")
+    }
+    assert len(fingerprints) == 1
+    assert request_fingerprint(
+        "deposit", AccountDeposit(account_id="acc", amount="10.01")
+    ) not in fingerprints
+
+
+def test_stale_claim_is_taken_over_after_the_lease(session_factory):
+    # El proceso que reservó la clave murió antes de guardar la respuesta.
+    crashed = IdempotencyStore(session_factory, lease=timedelta(milliseconds=100))
+    assert crashed.begin("lease-1", "h") is None
+
+    retry = IdempotencyStore(session_factory, poll_interval=0.01, wait_timeout=5)
+    assert retry.begin("lease-1", "h") is None
+    retry.finish("lease-1", 200, {"ok": True})
+
+    with session_factory() as db:
+        record = SqlIdempotencyRepository(db).get("lease-1")
+    assert record.response_body == {"ok": True}
+    # Completa, la clave vive el TTL y no el lease.
+    assert record.expires_at > datetime.utcnow() + timedelta(hours=23)
+
+
+def test_finish_retries_database_errors(session_factory):
+    store = IdempotencyStore(session_factory, poll_interval=0.001)
+    assert store.begin("retry-1", "h") is None
+    scope, failures = store._unit_of_work, []
+
+    def flaky_scope():
+        if len(failures) < 2:
+            failures.append(1)
+            raise OperationalError("UPDATE idempotency_keys", {}, Exception("connection lost"))
+        return scope()
+
+    store._unit_of_work = flaky_scope
+    store.finish("retry-1", 200, {"ok": True})
+
+    assert len(failures) == 2
+    again = IdempotencyStore(session_factory)
+    assert again.begin("retry-1", "h").response_body == {"ok": True}
@@ -0,0 +1,119 @@
+import threading
+import pytest
+
+from app.application.banking_facade import BankingFacade
+from app.domain.enums import TransactionType
+from app.domain.exceptions import InsufficientFundsError, RiskRejectedError
+from app.domain.factories.transaction_factory import TransactionFactory
+from app.domain.strategies.fee_strategy import NoFeeStrategy, PercentFeeStrategy
+from app.domain.strategies.risk_strategy import VelocityRule
+from app.domain.money import Money
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+@pytest.fixture(params=["sql", "memory"])
+def make_facade(request, db_session):
+    # Los mismos escenarios contra ambos backends: deben comportarse igual.
+    store = InMemoryStore()
+
+    def _make(fee_strategy=None, risk_rules=()):
+        uow = SqlUnitOfWork(db_session) if request.param == "sql" else InMemoryUnitOfWork(store)
+        return BankingFacade(
+            unit_of_work=uow,
+            fee_strategy=fee_strategy or PercentFeeStrategy(0.015),
+            risk_rules=list(risk_rules),
+        )
+    return _make
+
+
+def _account(facade, email):
+    customer = facade.create_customer("Mem", email)
+    return facade.create_account(customer.id).id
+
+
+def test_money_flow_and_history(make_facade):
+    facade = make_facade()
+    a, b = _account(facade, "a@example.com"), _account(facade, "b@example.com")
+
+    facade.deposit(a, 1000.0)
+    facade.transfer(a, b, 200.0)
+    facade.withdraw(b, 50.0)
+    with pytest.raises(InsufficientFundsError):
+        facade.withdraw(b, 10_000.0)
+
+    assert facade.get_account(a).balance == Money.of(782, "USD")
+    assert facade.get_account(b).balance == Money.of("149.25", "USD")
+    assert [t.type for t in facade.list_transactions(b)] == ["WITHDRAW", "TRANSFER"]
+    assert facade.risk_counter_repo.risk_totals_by_account(a, minutes=10) == (2, 120_000)
+
+
+def test_keyset_pages(make_facade):
+    facade = make_facade(fee_strategy=NoFeeStrategy())
+    account_id = _account(facade, "pages@example.com")
+    for i in range(5):
+        facade.deposit(account_id, 10.0 + i)
+    ids = [t.id for t in facade.list_transactions(account_id)]
+
+    first = facade.list_transactions_page(account_id, limit=2)
+    second = facade.list_transactions_page(
+        account_id, limit=2, before=(first[-1].created_at, first[-1].id)
+    )
+    back = facade.list_transactions_page(
+        account_id, limit=2, after=(second[0].created_at, second[0].id)
+    )
+
+    assert [t.id for t in first + second] == ids[:4]
+    assert [t.id for t in back] == ids[:2]
+
+
+def test_rejected_operation_leaves_no_trace(make_facade):
+    facade = make_facade(risk_rules=[VelocityRule(max_transactions=1)])
+    account_id = _account(facade, "velocity@example.com")
+    facade.deposit(account_id, 100.0)
+    facade.deposit(account_id, 100.0)
+
+    with pytest.raises(RiskRejectedError):
+        facade.deposit(account_id, 100.0)
+
+    assert facade.get_account(account_id).balance == Money.of(197, "USD")
+    assert len(facade.list_transactions(account_id)) == 2
+
+
+def test_memory_rollback_restores_every_write():
+    store = InMemoryStore()
+    facade = BankingFacade(InMemoryUnitOfWork(store), NoFeeStrategy(), [])
+    account_id = _account(facade, "undo@example.com")
+    facade.deposit(account_id, 100.0)
+
+    uow = InMemoryUnitOfWork(store)
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.accounts.debit(account_id, Money.of(60, "USD"))
+            uow.transactions.save(TransactionFactory.create(TransactionType.WITHDRAW, Money.of(60, "USD"), "USD"))
+            raise RuntimeError("boom")
+
+    account = facade.get_account(account_id)
+    assert (account.balance, account.version) == (Money.of(100, "USD"), 1)
+    assert len(store.transactions) == 1
+
+
+def test_memory_concurrent_withdrawals_do_not_lose_updates():
+    store = InMemoryStore()
+    facade = BankingFacade(InMemoryUnitOfWork(store), NoFeeStrategy(), [])
+    account_id = _account(facade, "threads@example.com")
+    facade.deposit(account_id, 1000.0)
+
+    def worker():
+        own = BankingFacade(InMemoryUnitOfWork(store), NoFeeStrategy(), [])
+        for _ in range(50):
+            own.withdraw(account_id, 1.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert facade.get_account(account_id).balance == Money.of(600, "USD")
+    assert len(facade.list_transactions(account_id)) == 401
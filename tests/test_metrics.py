@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.repositories.pool import (
+    POOL_CHECKOUTS,
+    POOL_TIMEOUTS,
+    POOL_WAIT,
+    InstrumentedQueuePool,
+    register_pool_metrics,
+)
+from app.metrics import REGISTRY, MetricsRegistry
+
+
+class _TestPool(InstrumentedQueuePool):
+    metrics_label = "test"
+
+
+def test_pool_checkout_metrics(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=_TestPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    register_pool_metrics(engine, "test")
+    checkouts = POOL_CHECKOUTS.value(pool="test")
+    timeouts = POOL_TIMEOUTS.value(pool="test")
+    waits = POOL_WAIT.count(pool="test")
+
+    held = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    assert POOL_CHECKOUTS.value(pool="test") == checkouts + 1
+    assert POOL_TIMEOUTS.value(pool="test") == timeouts + 1
+    assert POOL_WAIT.count(pool="test") == waits + 1
+    assert 'db_pool_checked_out{pool="test"} 1' in REGISTRY.render()
+    held.close()
+    engine.dispose()
+
+
+def test_render_keeps_large_values_exact_and_escapes_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("big_total", "Grande", ("path",))
+    counter.inc(1234567, path='a"b\\c\nd')
+    counter.inc(0.25, path="x")
+
+    body = registry.render()
+    assert 'big_total{path="a\\"b\\\\c\\nd"} 1234567\n' in body
+    assert 'big_total{path="x"} 0.25\n' in body
+
+
+def test_metrics_endpoint_is_prometheus_text(client):
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_checkouts_total counter" in res.text
+
+
+def test_request_timing_header_and_histograms(client):
+    from app.application.timing import REQUEST_DURATION, REQUEST_STATEMENTS
+
+    labels = {"method": "POST", "route": "/transactions/deposit"}
+    requests_before = REQUEST_DURATION.count(**labels)
+    customer_id = client.post("/customers", json={"name": "Timing", "email": "timing@example.com"}).json()["id"]
+    account_id = client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+
+    res = client.post("/transactions/deposit", json={"account_id": account_id, "amount": 100.0})
+
+    timing = dict(
+        (part.split(";")[0], part) for part in res.headers["Server-Timing"].split(", ")
+    )
+    assert {"total", "db", "risk", "fee", "commit"} <= set(timing)
+    assert 'desc="7 queries"' in timing["db"]
+    assert REQUEST_DURATION.count(**labels) == requests_before + 1
+    assert REQUEST_STATEMENTS.count(**labels) == requests_before + 1
+    body = client.get("/metrics").text
+    assert 'http_request_db_statements_bucket{method="POST",route="/transactions/deposit",le="8"}' in body
+    assert 'http_request_phase_seconds_count{method="POST",route="/transactions/deposit",phase="risk"}' in body
@@ -0,0 +1,59 @@
+import pytest
+
+from app.application.banking_facade import BankingFacade
+from app.domain.exceptions import CurrencyMismatchError, InvalidTransactionAmountError
+from app.domain.money import FixedAmount, Money
+from app.domain.strategies.fee_strategy import NoFeeStrategy, PercentFeeStrategy
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+
+
+def test_money_of_uses_currency_exponent():
+    assert Money.of("10.50", "USD") == Money(1050, "USD")
+    assert Money.of(0.1, "USD") == Money(10, "USD")
+    assert Money.of(500, "JPY") == Money(500, "JPY")
+    assert Money.of("1.234", "KWD") == Money(1234, "KWD")
+    assert Money(1050, "USD").to_decimal() == Money.of("10.5", "USD").to_decimal()
+
+
+def test_money_of_rejects_extra_decimals():
+    with pytest.raises(InvalidTransactionAmountError):
+        Money.of("10.001", "USD")
+    with pytest.raises(InvalidTransactionAmountError):
+        Money.of(0.1 + 0.2, "USD")
+    with pytest.raises(InvalidTransactionAmountError):
+        Money.of("1.5", "JPY")
+
+
+def test_money_does_not_mix_currencies():
+    with pytest.raises(CurrencyMismatchError):
+        Money.of(1, "USD") + Money.of(1, "EUR")
+
+
+def test_percent_rounds_half_even_in_minor_units():
+    assert Money(50, "USD").scaled(1, 100) == Money(0, "USD")
+    assert Money(150, "USD").scaled(1, 100) == Money(2, "USD")
+    assert PercentFeeStrategy(0.015).calculate(Money.of("33.33", "USD")) == Money(50, "USD")
+    # Los montos de configuración se redondean a la moneda en lugar de fallar.
+    assert FixedAmount(0.5).in_currency("JPY") == Money(0, "JPY")
+
+
+def test_repeated_small_deposits_are_exact():
+    facade = BankingFacade(InMemoryUnitOfWork(InMemoryStore()), NoFeeStrategy(), [])
+    customer = facade.create_customer("Cents", "cents@example.com")
+    account = facade.create_account(customer.id)
+    for _ in range(10):
+        facade.deposit(account.id, 0.1)
+
+    assert facade.get_account(account.id).balance == Money.of(1, "USD")
+
+
+def test_transfer_between_currencies_is_rejected():
+    facade = BankingFacade(InMemoryUnitOfWork(InMemoryStore()), NoFeeStrategy(), [])
+    customer = facade.create_customer("Fx", "fx@example.com")
+    usd = facade.create_account(customer.id, "USD")
+    jpy = facade.create_account(customer.id, "JPY")
+    facade.deposit(usd.id, 100)
+
+    with pytest.raises(CurrencyMismatchError):
+        facade.transfer(usd.id, jpy.id, 10)
+    assert facade.get_account(usd.id).balance == Money.of(100, "USD")
@@ -0,0 +1,62 @@
+def _account_with_deposits(client, email, count):
+    customer_id = client.post("/customers", json={"name": "Pager", "email": email}).json()["id"]
+    account_id = client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+    for i in range(count):
+        res = client.post("/transactions/deposit", json={"account_id": account_id, "amount": 10.0 + i})
+        assert res.status_code == 200
+    return account_id
+
+
+def test_keyset_pages_walk_history_both_ways(client):
+    account_id = _account_with_deposits(client, "pager@example.com", 5)
+    url = f"/accounts/{account_id}/transactions"
+
+    full = client.get(url).json()
+    assert full["total_count"] == 5
+    assert full["next_cursor"] is None
+
+    first = client.get(url, params={"limit": 2}).json()
+    second = client.get(url, params={"limit": 2, "before": first["next_cursor"]}).json()
+    third = client.get(url, params={"limit": 2, "before": second["next_cursor"]}).json()
+    walked = [tx["id"] for page in (first, second, third) for tx in page["transactions"]]
+
+    assert walked == [tx["id"] for tx in full["transactions"]]
+    assert first["prev_cursor"] is None
+    assert third["next_cursor"] is None
+
+    back = client.get(url, params={"limit": 2, "after": third["prev_cursor"]}).json()
+    assert back["transactions"] == second["transactions"]
+
+
+def test_history_filters_by_type(client):
+    account_id = _account_with_deposits(client, "filter@example.com", 2)
+    client.post("/transactions/withdraw", json={"account_id": account_id, "amount": 5.0})
+
+    res = client.get(f"/accounts/{account_id}/transactions", params={"type": "WITHDRAW"})
+
+    assert [tx["type"] for tx in res.json()["transactions"]] == ["WITHDRAW"]
+
+
+def test_history_rejects_invalid_cursor(client):
+    account_id = _account_with_deposits(client, "cursor@example.com", 1)
+    res = client.get(f"/accounts/{account_id}/transactions", params={"before": "not-a-cursor"})
+    assert res.status_code == 400
+
+
+def test_self_transfer_counts_once_per_page(client):
+    # Una transferencia a la misma cuenta deja dos entries de esa cuenta.
+    account_id = _account_with_deposits(client, "self@example.com", 3)
+    res = client.post("/transactions/transfer", json={
+        "from_account_id": account_id, "to_account_id": account_id, "amount": 1.0,
+    })
+    assert res.status_code == 200
+    url = f"/accounts/{account_id}/transactions"
+
+    first = client.get(url, params={"limit": 3}).json()
+    second = client.get(url, params={"limit": 3, "before": first["next_cursor"]}).json()
+
+    assert len(first["transactions"]) == 3
+    assert first["next_cursor"] is not None
+    walked = [tx["id"] for page in (first, second) for tx in page["transactions"]]
+    assert walked == [tx["id"] for tx in client.get(url).json()["transactions"]]
+    assert len(walked) == 4
@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.account import Account
+from app.domain.entities.customer import Customer
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import Direction, TransactionStatus, TransactionType
+from app.domain.factories.ledger_entry_factory import LedgerEntryFactory
+from app.domain.ids import new_id
+from app.domain.money import Money
+from app.repositories import partitions
+from app.repositories.models import TransactionModel
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TX_ID = "0192f0c4-0000-7000-8000-000000000001"
+
+
+def test_month_helpers_roll_over_year():
+    moment = datetime(2026, 11, 17, 15, 30)
+    month = partitions.month_start(moment)
+    assert month == datetime(2026, 11, 1)
+    assert partitions.add_months(month, 2) == datetime(2027, 1, 1)
+    assert partitions.add_months(month, -11) == datetime(2025, 12, 1)
+
+    name = partitions.partition_name("transactions", partitions.add_months(month, 2))
+    assert name == "transactions_2027_01"
+    assert partitions.partition_month(name) == datetime(2027, 1, 1)
+    assert partitions.partition_month("transactions_default") is None
+
+
+def test_partition_jobs_are_noop_without_partitioned_tables(db_session):
+    # SQLite (y una BD creada por create_tables()) no tiene particiones.
+    assert not partitions.is_partitioned(db_session)
+    assert partitions.ensure_partitions(db_session, months_ahead=3) == []
+    assert partitions.detach_expired_partitions(
+        db_session, keep_months=12,
+    ) == []
+
+
+def test_transaction_id_stays_unique_without_partitions(db_session):
+    # La PK es (id, created_at); sin particiones el índice único cubre id.
+    for day in (1, 2):
+        db_session.add(TransactionModel(
+            id=TX_ID, type=TransactionType.DEPOSIT, amount=100, currency="USD",
+            status=TransactionStatus.APPROVED, created_at=datetime(2026, 10, day),
+        ))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+
+
+class _ArchivedUntil:
+    def __init__(self, until):
+        self.until = until
+
+    def archived_until(self):
+        return self.until
+
+
+@pytest.fixture
+def pg_session():
+    # Corre solo con un PostgreSQL descartable: el esquema se recrea con
+    # las migraciones. TEST_POSTGRES_URL=postgresql+psycopg2://...
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL no configurado")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        check=True, cwd=ROOT, env={**os.environ, "DATABASE_URL": url},
+    )
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_rows_without_partition_are_moved_and_detached(pg_session):
+    db = pg_session
+    assert partitions.is_partitioned(db)
+    # Un mes sin partición (el cron no corrió): el INSERT cae en DEFAULT.
+    month = partitions.add_months(partitions.month_start(datetime.utcnow()), 6)
+    uow = SqlUnitOfWork(db)
+    customer_id, source, target = new_id(), new_id(), new_id()
+    uow.customers.save(Customer(id=customer_id, name="Test", email="pg@example.com"))
+    for account_id in (source, target):
+        uow.accounts.save(Account(id=account_id, customer_id=customer_id, currency="USD"))
+    tx = Transaction(
+        id=new_id(), type=TransactionType.TRANSFER, amount=Money.of(5, "USD"),
+        currency="USD", status=TransactionStatus.APPROVED,
+        created_at=month.replace(day=10),
+    )
+    uow.transactions.save(tx)
+    for account_id, direction in ((source, Direction.DEBIT), (target, Direction.CREDIT)):
+        uow.ledger.save(LedgerEntryFactory.create(
+            account_id=account_id, transaction_id=tx.id, direction=direction,
+            amount=tx.amount, created_at=tx.created_at,
+        ))
+    uow.commit()
+    assert db.execute(text("SELECT count(*) FROM ledger_entries_default")).scalar() == 2
+
+    created = partitions.ensure_partitions(db, months_ahead=0)
+    db.commit()
+    assert created == [
+        partitions.partition_name(table, month) for table in partitions.PARTITIONED_TABLES
+    ]
+    assert db.execute(text("SELECT count(*) FROM ledger_entries_default")).scalar() == 0
+    ledger = partitions.partition_name("ledger_entries", month)
+    assert db.execute(text(f"SELECT count(*) FROM {ledger}")).scalar() == 2
+    assert [t.id for t in uow.transactions.get_by_account_id(target)] == [tx.id]
+    # Ya no falta nada: otra corrida no crea particiones.
+    assert partitions.ensure_partitions(db, months_ahead=0) == []
+
+    # Con archivo solo se desprenden meses archivados: los anteriores a `month`.
+    detached = partitions.detach_expired_partitions(
+        db, keep_months=0, archive=_ArchivedUntil(month), now=month,
+    )
+    assert detached and ledger not in detached
+    later = partitions.add_months(month, 2)
+    with pytest.raises(partitions.UnarchivedPartitions):
+        partitions.detach_expired_partitions(
+            db, keep_months=1, archive=_ArchivedUntil(month), now=later,
+        )
+    # Sin archivo configurado la retención no depende de archivar.
+    detached = partitions.detach_expired_partitions(db, keep_months=1, now=later)
+    db.commit()
+    assert ledger in detached
+    assert "ledger_entries_default" not in detached
+    assert uow.transactions.get_by_account_id(target) == []
+    assert db.execute(text(f"SELECT count(*) FROM {ledger}")).scalar() == 2
+
+
+def test_api_creates_upcoming_partitions_in_the_background(pg_session):
+    month = partitions.add_months(partitions.month_start(datetime.utcnow()), 5)
+    name = partitions.partition_name("transactions", month)
+    assert name not in partitions.list_partitions(pg_session, "transactions")
+
+    factory = sessionmaker(bind=pg_session.get_bind())
+    thread = partitions.start_partition_maintenance(factory, interval=3600, months_ahead=5)
+    assert thread is not None and thread.daemon
+    deadline = time.monotonic() + 10
+    while name not in partitions.list_partitions(pg_session, "transactions"):
+        assert time.monotonic() < deadline
+        pg_session.rollback()
+        time.sleep(0.05)
+    assert partitions.start_partition_maintenance(factory, interval=0) is None
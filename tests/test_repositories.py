@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+from app.domain.entities.account import Account
+from app.domain.entities.customer import Customer
+from app.domain.entities.transaction import Transaction
+from app.domain.enums import Direction, TransactionStatus, TransactionType
+from app.domain.factories.ledger_entry_factory import LedgerEntryFactory
+from app.domain.ids import new_id
+from app.domain.money import Money
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+CUSTOMER_ID, ACCOUNT_ID = new_id(), new_id()
+TX_IDS = [new_id() for _ in range(4)]
+
+
+def _seed(uow, account_id, created_ats):
+    uow.customers.save(Customer(id=CUSTOMER_ID, name="Test", email="repo@example.com"))
+    uow.accounts.save(Account(id=account_id, customer_id=CUSTOMER_ID, currency="USD"))
+    for i, created_at in enumerate(created_ats):
+        tx = Transaction(
+            id=TX_IDS[i], type=TransactionType.DEPOSIT, amount=Money.of(10 * (i + 1), "USD"),
+            currency="USD", status=TransactionStatus.APPROVED, created_at=created_at,
+        )
+        uow.transactions.save(tx)
+        uow.ledger.save(LedgerEntryFactory.create(
+            account_id=account_id, transaction_id=tx.id,
+            direction=Direction.CREDIT, amount=tx.amount, created_at=tx.created_at,
+        ))
+    uow.commit()
+
+
+def test_risk_totals_match_individual_queries(db_session):
+    uow = SqlUnitOfWork(db_session)
+    now = datetime.utcnow()
+    _seed(uow, ACCOUNT_ID, [
+        now - timedelta(days=3),       # fuera de ambas ventanas
+        now - timedelta(minutes=30),   # hoy, fuera de la ventana de 10 min
+        now - timedelta(minutes=2),
+        now,
+    ])
+
+    recent, daily_total = uow.transactions.risk_totals_by_account(ACCOUNT_ID, minutes=10)
+
+    assert recent == uow.transactions.count_recent_by_account(ACCOUNT_ID, minutes=10)
+    assert daily_total == uow.transactions.sum_daily_by_account(ACCOUNT_ID)
+    assert [tx.id for tx in uow.transactions.get_by_account_id(ACCOUNT_ID)] == TX_IDS[::-1]
+
+
+def test_risk_totals_for_account_without_history(db_session):
+    uow = SqlUnitOfWork(db_session)
+    assert uow.transactions.risk_totals_by_account(new_id(), minutes=10) == (0, 0)
+
+
+def test_risk_counters_expire_window_and_roll_over_day(db_session):
+    uow = SqlUnitOfWork(db_session)
+    _seed(uow, ACCOUNT_ID, [])
+    uow.risk_counters.create_for_account(ACCOUNT_ID)
+    noon = datetime(2026, 1, 10, 12, 0, 0)
+    uow.risk_counters.record(ACCOUNT_ID, 10_000, noon)
+    uow.risk_counters.record(ACCOUNT_ID, 5_000, noon + timedelta(minutes=5))
+    uow.commit()
+
+    counters = uow.risk_counters
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=noon + timedelta(minutes=6)) == (2, 15_000)
+    # La primera sale de la ventana de 10 minutos; el total del día se mantiene.
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=noon + timedelta(minutes=11)) == (1, 15_000)
+    # Al día siguiente el total diario vuelve a cero.
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=noon + timedelta(hours=12)) == (0, 0)
+
+    counters.record(ACCOUNT_ID, 3_000, noon + timedelta(hours=12))
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=noon + timedelta(hours=12)) == (1, 3_000)
+
+
+def test_rebuild_risk_counters_matches_history(db_session):
+    uow = SqlUnitOfWork(db_session)
+    now = datetime.utcnow()
+    _seed(uow, ACCOUNT_ID, [now - timedelta(days=2), now - timedelta(minutes=1), now])
+
+    assert uow.risk_counters.rebuild() == 1
+    uow.commit()
+
+    assert uow.risk_counters.risk_totals_by_account(ACCOUNT_ID, minutes=10) == (
+        uow.transactions.risk_totals_by_account(ACCOUNT_ID, minutes=10)
+    )
+
+
+def test_late_commit_from_previous_day_keeps_new_day_total(db_session):
+    uow = SqlUnitOfWork(db_session)
+    _seed(uow, ACCOUNT_ID, [])
+    uow.risk_counters.create_for_account(ACCOUNT_ID)
+    midnight = datetime(2026, 1, 11)
+    counters = uow.risk_counters
+    counters.record(ACCOUNT_ID, 4_000, midnight + timedelta(seconds=2))
+    # Llega después pero con fecha del día anterior (commit fuera de orden).
+    counters.record(ACCOUNT_ID, 7_000, midnight - timedelta(seconds=1))
+    uow.commit()
+
+    now = midnight + timedelta(minutes=1)
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=now) == (2, 4_000)
+    counters.record(ACCOUNT_ID, 1_000, now)
+    assert counters.risk_totals_by_account(ACCOUNT_ID, 10, now=now) == (3, 5_000)
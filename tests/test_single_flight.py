@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.application.single_flight import COALESCED, SingleFlight
+
+
+def test_concurrent_sync_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    followers_before = COALESCED.value(operation="test_sync", role="follower")
+
+    def slow_read():
+        calls.append(1)
+        release.wait(5)
+        return {"balance": 100.0}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.run("test_sync", "acc-1", slow_read)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Todos menos el leader quedan esperando antes de liberar la lectura.
+    while COALESCED.value(operation="test_sync", role="follower") < followers_before + 7:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"balance": 100.0}] * 8
+
+    # Terminada la lectura, la siguiente vuelve a ejecutar.
+    flight.run("test_sync", "acc-1", slow_read)
+    assert len(calls) == 2
+
+
+def test_sync_error_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def failing_read():
+        release.wait(5)
+        raise LookupError("not found")
+
+    def call():
+        try:
+            flight.run("test_error", "acc-1", failing_read)
+        except LookupError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    threading.Event().wait(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+
+
+def test_async_calls_share_one_execution_and_survive_cancellation():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.run_async("test_async", "acc-1", slow_read))
+        others = [asyncio.ensure_future(flight.run_async("test_async", "acc-1", slow_read)) for _ in range(4)]
+        await asyncio.sleep(0)
+        # El cliente del leader se desconecta: los demás igual reciben el resultado.
+        first.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return results
+
+    assert asyncio.run(scenario()) == ["result"] * 4
+    assert len(calls) == 1
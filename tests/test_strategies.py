@@ -1,18 +1,79 @@
 import pytest
 from app.domain.strategies.fee_strategy import PercentFeeStrategy
-from app.domain.strategies.risk_strategy import MaxAmountRule
+from app.application.banking_facade import BankingFacade
+from app.domain.strategies.fee_strategy import FlatFeeStrategy, NoFeeStrategy, TieredFeeStrategy
+from app.domain.strategies.risk_strategy import (
+    DailyLimitRule,
+    MaxAmountRule,
+    VelocityRule,
+    account_risk_context,
+    order_by_cost,
+)
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
 from app.domain.exceptions import RiskRejectedError
+from app.domain.money import Money
 
 
 def test_percent_fee_calculation():
     strategy = PercentFeeStrategy(0.10)  # 10%
-    fee = strategy.calculate(100.0)
+    fee = strategy.calculate(Money.of(100, "USD"))
 
-    assert fee == 10.0
+    assert fee == Money.of(10, "USD")
+
+
+@pytest.mark.parametrize("strategy", [
+    NoFeeStrategy(), FlatFeeStrategy(1.5), PercentFeeStrategy(0.015),
+    TieredFeeStrategy(threshold=100, low_fee=0.5, high_fee=2),
+])
+def test_fee_in_minor_units_matches_money(strategy):
+    for amount in (Money.of("0.01", "USD"), Money.of("33.33", "USD"), Money.of(100, "USD"), Money.of(5000, "JPY")):
+        assert strategy.calculate_minor(amount.minor, amount.currency) == strategy.calculate(amount).minor
 
 
 def test_max_amount_rule_rejects():
     rule = MaxAmountRule(max_amount=100.0)
 
     with pytest.raises(RiskRejectedError):
-        rule.validate(amount=150.0, context={})
\ No newline at end of file
+        rule.validate(amount=Money.of(150, "USD"), context={})
+
+
+def test_risk_context_loads_lazily_and_once():
+    loads = []
+
+    def load_totals():
+        loads.append(1)
+        return 3, 25_000
+
+    context = account_risk_context(load_totals)
+    MaxAmountRule(max_amount=100.0).validate(Money.of(50, "USD"), context)
+    assert loads == []
+
+    VelocityRule(max_transactions=10).validate(Money.of(50, "USD"), context)
+    DailyLimitRule(daily_limit=1000.0).validate(Money.of(50, "USD"), context)
+    assert loads == [1]
+    assert context.computed == {"recent_transactions", "daily_total"}
+
+
+def test_rules_run_cheapest_first():
+    velocity, daily, max_amount = VelocityRule(10), DailyLimitRule(1000.0), MaxAmountRule(100.0)
+    assert order_by_cost([velocity, daily, max_amount]) == [max_amount, velocity, daily]
+
+
+def test_max_amount_rejection_skips_risk_counters():
+    facade = BankingFacade(
+        unit_of_work=InMemoryUnitOfWork(InMemoryStore()),
+        fee_strategy=NoFeeStrategy(),
+        risk_rules=[VelocityRule(max_transactions=10), MaxAmountRule(max_amount=100.0)],
+    )
+    customer = facade.create_customer("Risk", "risk@example.com")
+    account = facade.create_account(customer.id)
+    lookups = []
+    totals = facade.risk_counter_repo.risk_totals_by_account
+    facade.risk_counter_repo.risk_totals_by_account = lambda *a, **kw: lookups.append(1) or totals(*a, **kw)
+
+    with pytest.raises(RiskRejectedError):
+        facade.deposit(account.id, 500.0)
+    assert lookups == []
+
+    facade.deposit(account.id, 50.0)
+    assert lookups == [1]
@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy import event
+
+from app.application.banking_facade import BankingFacade
+from app.domain.strategies.fee_strategy import PercentFeeStrategy
+from app.domain.strategies.risk_strategy import MaxAmountRule, VelocityRule, DailyLimitRule
+from app.domain.exceptions import InsufficientFundsError
+from app.domain.money import Money
+from app.repositories.unit_of_work import SqlUnitOfWork
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = []
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement.split()[0].upper())
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = []
+        self.commits = 0
+
+    def count(self, verb: str) -> int:
+        return self.statements.count(verb)
+
+
+@pytest.fixture
+def setup(engine, db_session):
+    facade = BankingFacade(
+        unit_of_work=SqlUnitOfWork(db_session),
+        fee_strategy=PercentFeeStrategy(0.015),
+        risk_rules=[
+            MaxAmountRule(max_amount=10000),
+            VelocityRule(max_transactions=10),
+            DailyLimitRule(daily_limit=50000),
+        ],
+    )
+    counter = StatementCounter(engine)
+    return facade, counter
+
+
+def _new_account(facade, email):
+    customer = facade.create_customer(name="Test", email=email)
+    return facade.create_account(customer_id=customer.id)
+
+
+def test_deposit_commits_once(setup):
+    facade, counter = setup
+    account = _new_account(facade, "uow_deposit@example.com")
+
+    counter.reset()
+    facade.deposit(account.id, 100.0)
+
+    assert counter.commits == 1
+    assert counter.count("INSERT") == 2   # transaction + ledger entry
+    assert counter.count("UPDATE") == 2   # balance + contadores de riesgo
+    assert counter.count("SELECT") == 3   # account + contadores + FOR UPDATE
+    assert facade.get_account(account.id).balance == Money.of("98.5", "USD")
+
+
+def test_withdraw_commits_once(setup):
+    facade, counter = setup
+    account = _new_account(facade, "uow_withdraw@example.com")
+    facade.deposit(account.id, 500.0)
+
+    counter.reset()
+    facade.withdraw(account.id, 100.0)
+
+    assert counter.commits == 1
+    assert counter.count("INSERT") == 2
+    assert counter.count("UPDATE") == 2
+    assert counter.count("SELECT") == 3
+
+
+def test_transfer_commits_once(setup):
+    facade, counter = setup
+    source = _new_account(facade, "uow_from@example.com")
+    target = _new_account(facade, "uow_to@example.com")
+    facade.deposit(source.id, 1000.0)
+
+    counter.reset()
+    facade.transfer(source.id, target.id, 200.0)
+
+    assert counter.commits == 1
+    # transaction + las 2 ledger entries, que el flush agrupa en un executemany
+    assert counter.count("INSERT") == 2
+    assert counter.count("UPDATE") == 3   # 2 balances + contadores (executemany)
+    assert counter.count("SELECT") == 4   # + un solo FOR UPDATE para ambos contadores
+    assert facade.get_account(target.id).balance == Money.of(200, "USD")
+
+
+def test_failed_transfer_leaves_nothing_pending(setup):
+    facade, counter = setup
+    source = _new_account(facade, "uow_poor@example.com")
+    target = _new_account(facade, "uow_rich@example.com")
+    facade.deposit(source.id, 100.0)
+    deposits = facade.list_transactions(source.id)
+    balance = facade.get_account(source.id).balance
+
+    counter.reset()
+    with pytest.raises(InsufficientFundsError):
+        facade.transfer(source.id, target.id, 200.0)
+
+    assert counter.commits == 0
+    assert counter.count("INSERT") == 0
+    assert facade.list_transactions(source.id) == deposits
+    # Nada quedó aplicado: los saldos son los de antes de la transferencia.
+    assert facade.get_account(source.id).balance == balance
+    assert facade.get_account(target.id).balance == Money.of(0, "USD")